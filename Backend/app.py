@@ -1,8 +1,17 @@
-from flask import Flask, send_from_directory, render_template, request
+from flask import Flask, Response, g, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from dotenv import load_dotenv
 from flask_jwt_extended import JWTManager
-from datetime import timedelta
+from utils.jwt_tokens import ACCESS_TOKEN_EXPIRES
+from psycopg_pool import PoolTimeout, TooManyRequests
+from utils.compression import compress_response
+from utils.cors import ALLOWED_ORIGINS
+from utils.json_codec import FastJSONMixin
+from utils.login_throttle import Throttled
+from utils.password_hasher import PASSWORD_HASH_RETRY_AFTER, HasherBusy
+from utils.static_assets import AssetManifest
+from utils.tracing import TracedJSONMixin, finish_trace, span, start_trace, traced
 import os
 
 load_dotenv()
@@ -11,33 +20,34 @@ from blueprints.students import students_bp
 from blueprints.programs import programs_bp
 from blueprints.colleges import colleges_bp
 from blueprints.auth import auth_bp
+from blueprints.metrics import metrics_bp
+from blueprints.stats import stats_bp
+from blueprints.images import images_bp
+from blueprints.changes import changes_bp
+
+class JSONProvider(TracedJSONMixin, FastJSONMixin, DefaultJSONProvider):
+    pass
 
 def create_app():
     BASE_DIR = os.path.abspath(os.path.dirname(__file__))
     DIST_DIR = os.path.join(BASE_DIR, 'dist')
 
-    app = Flask(
-        __name__, 
-        static_folder=DIST_DIR, 
-        template_folder=DIST_DIR
-    )
+    # The SPA is served from an in-memory manifest of dist built here, so
+    # Flask's own static route is not needed.
+    app = Flask(__name__, static_folder=None)
+    assets = AssetManifest(DIST_DIR)
     
     app.config["SECRET_KEY"] = os.getenv("SECRET_KEY")
     app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY")
-    app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(hours=2)
+    app.config["JWT_ACCESS_TOKEN_EXPIRES"] = ACCESS_TOKEN_EXPIRES
+    app.json = JSONProvider(app)
     
 
-    allowed_origins = [
-        "http://localhost:5173",
-        "http://127.0.0.1:5000",
-        "http://localhost:5000"
-    ]
-
     CORS(
         app,
         resources={
             r"/api/*": {
-                "origins": allowed_origins,
+                "origins": ALLOWED_ORIGINS,
                 "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
                 "allow_headers": ["Content-Type", "Authorization"],
                 "supports_credentials": True
@@ -51,6 +61,48 @@ def create_app():
     app.register_blueprint(students_bp, url_prefix="/api/students")
     app.register_blueprint(programs_bp, url_prefix="/api/programs")
     app.register_blueprint(colleges_bp, url_prefix="/api/colleges")
+    app.register_blueprint(metrics_bp, url_prefix="/api/metrics")
+    app.register_blueprint(stats_bp, url_prefix="/api/stats")
+    app.register_blueprint(images_bp, url_prefix="/api/images")
+    app.register_blueprint(changes_bp, url_prefix="/api/changes")
+
+    @app.errorhandler(PoolTimeout)
+    @app.errorhandler(TooManyRequests)
+    def database_busy(error):
+        return jsonify({"error": "Database is busy, please retry"}), 503
+
+    @app.errorhandler(HasherBusy)
+    def hasher_busy(error):
+        return jsonify({"error": "Server is busy, please retry"}), 503, {"Retry-After": str(PASSWORD_HASH_RETRY_AFTER)}
+
+    @app.errorhandler(Throttled)
+    def throttled(error):
+        return jsonify({"error": "Too many attempts, please try again later"}), 429, {"Retry-After": str(error.retry_after)}
+
+    @app.before_request
+    def begin_trace():
+        g.trace_token = start_trace()
+
+    @app.after_request
+    def add_server_timing(response):
+        token = g.pop("trace_token", None)
+        if token is not None:
+            response.headers["Server-Timing"] = finish_trace(token).server_timing()
+        return response
+
+    # Registered after add_server_timing so it runs first and is timed.
+    @app.after_request
+    def compress(response):
+        if not request.path.startswith("/api/"):
+            return response
+        with span("compress"):
+            return compress_response(response, request.accept_encodings)
+
+    @app.teardown_request
+    def end_trace(error):
+        token = g.pop("trace_token", None)
+        if token is not None:
+            finish_trace(token)
 
     @app.before_request
     def spa_history_mode_fallback():
@@ -65,17 +117,28 @@ def create_app():
         if request.path.startswith("/api/"):
             return None
         
-        return render_template("index.html")
+        return serve_index()
+
+    def asset_response(asset):
+        body, status, headers = assets.response(asset, request.accept_encodings, request.if_none_match)
+        return Response(body, status, headers)
+
+    def serve_index():
+        if assets.index is None:
+            return "Frontend build not found", 404
+        return asset_response(assets.index)
     
     @app.route("/", defaults={"path": ""})
     @app.route("/<path:path>")
     def serve_vue(path):
-        if path != "":
-            file_path = os.path.join(app.root_path, app.static_folder, path)
-            if os.path.exists(file_path) and not os.path.isdir(file_path):
-                return send_from_directory(app.static_folder, path)
+        asset = assets.get(path)
+        if asset is not None:
+            return asset_response(asset)
+
+        return serve_index()
 
-        return render_template("index.html")
+    for endpoint, view in app.view_functions.items():
+        app.view_functions[endpoint] = traced("controller")(view)
 
     return app
 
@@ -0,0 +1,153 @@
+from quart import Quart, Response, g, request, jsonify
+from quart.json.provider import DefaultJSONProvider
+from dotenv import load_dotenv
+from psycopg_pool import PoolTimeout, TooManyRequests
+from utils.async_compression import compress_response
+from utils.cors import ALLOWED_ORIGINS
+from utils.json_codec import FastJSONMixin
+from utils.login_throttle import Throttled
+from utils.password_hasher import PASSWORD_HASH_RETRY_AFTER, HasherBusy
+from utils.static_assets import AssetManifest
+from utils.tracing import TracedJSONMixin, finish_trace, span, start_trace, traced
+import os
+
+load_dotenv()
+
+from db import get_async_pool
+from blueprints.async_students import students_bp
+from blueprints.async_programs import programs_bp
+from blueprints.async_colleges import colleges_bp
+from blueprints.async_auth import auth_bp
+from blueprints.async_metrics import metrics_bp
+from blueprints.async_stats import stats_bp
+from blueprints.async_images import images_bp
+from blueprints.async_changes import changes_bp
+
+class JSONProvider(TracedJSONMixin, FastJSONMixin, DefaultJSONProvider):
+    pass
+
+CORS_METHODS = "GET, POST, PUT, PATCH, DELETE, OPTIONS"
+CORS_HEADERS = "Content-Type, Authorization"
+
+def create_app():
+    BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+    DIST_DIR = os.path.join(BASE_DIR, 'dist')
+
+    app = Quart(__name__, static_folder=None)
+    assets = AssetManifest(DIST_DIR)
+
+    app.config["SECRET_KEY"] = os.getenv("SECRET_KEY")
+    # Match Flask: no body size cap, since bulk imports can be large.
+    app.config["MAX_CONTENT_LENGTH"] = None
+    app.json = JSONProvider(app)
+
+    app.register_blueprint(auth_bp, url_prefix="/api/auth")
+    app.register_blueprint(students_bp, url_prefix="/api/students")
+    app.register_blueprint(programs_bp, url_prefix="/api/programs")
+    app.register_blueprint(colleges_bp, url_prefix="/api/colleges")
+    app.register_blueprint(metrics_bp, url_prefix="/api/metrics")
+    app.register_blueprint(stats_bp, url_prefix="/api/stats")
+    app.register_blueprint(images_bp, url_prefix="/api/images")
+    app.register_blueprint(changes_bp, url_prefix="/api/changes")
+
+    pool = get_async_pool()
+
+    @app.before_serving
+    async def open_pool():
+        await pool.open(wait=True)
+
+    @app.after_serving
+    async def close_pool():
+        await pool.close()
+
+    @app.errorhandler(PoolTimeout)
+    @app.errorhandler(TooManyRequests)
+    async def database_busy(error):
+        return jsonify({"error": "Database is busy, please retry"}), 503
+
+    @app.errorhandler(HasherBusy)
+    async def hasher_busy(error):
+        return jsonify({"error": "Server is busy, please retry"}), 503, {"Retry-After": str(PASSWORD_HASH_RETRY_AFTER)}
+
+    @app.errorhandler(Throttled)
+    async def throttled(error):
+        return jsonify({"error": "Too many attempts, please try again later"}), 429, {"Retry-After": str(error.retry_after)}
+
+    @app.before_request
+    async def begin_trace():
+        g.trace_token = start_trace()
+
+    @app.after_request
+    async def add_server_timing(response):
+        token = g.pop("trace_token", None)
+        if token is not None:
+            response.headers["Server-Timing"] = finish_trace(token).server_timing()
+        return response
+
+    # Registered after add_server_timing so it runs first and is timed.
+    @app.after_request
+    async def compress(response):
+        if not request.path.startswith("/api/"):
+            return response
+        with span("compress"):
+            return compress_response(response, request.accept_encodings)
+
+    @app.teardown_request
+    async def end_trace(error):
+        token = g.pop("trace_token", None)
+        if token is not None:
+            finish_trace(token)
+
+    @app.after_request
+    async def add_cors_headers(response):
+        origin = request.headers.get("Origin")
+        if request.path.startswith("/api/") and origin in ALLOWED_ORIGINS:
+            response.headers["Access-Control-Allow-Origin"] = origin
+            response.headers["Access-Control-Allow-Credentials"] = "true"
+            response.headers["Access-Control-Allow-Methods"] = CORS_METHODS
+            response.headers["Access-Control-Allow-Headers"] = CORS_HEADERS
+            response.vary.add("Origin")
+        return response
+
+    @app.before_request
+    async def spa_history_mode_fallback():
+        if request.method != "GET":
+            return None
+
+        accept_header = request.headers.get("Accept", "")
+
+        if "text/html" not in accept_header:
+            return None
+
+        if request.path.startswith("/api/"):
+            return None
+
+        return serve_index()
+
+    def asset_response(asset):
+        body, status, headers = assets.response(asset, request.accept_encodings, request.if_none_match)
+        return Response(body, status, headers)
+
+    def serve_index():
+        if assets.index is None:
+            return "Frontend build not found", 404
+        return asset_response(assets.index)
+
+    @app.route("/", defaults={"path": ""})
+    @app.route("/<path:path>")
+    async def serve_vue(path):
+        asset = assets.get(path)
+        if asset is not None:
+            return asset_response(asset)
+
+        return serve_index()
+
+    for endpoint, view in app.view_functions.items():
+        app.view_functions[endpoint] = traced("controller")(view)
+
+    return app
+
+app = create_app()
+
+if __name__ == "__main__":
+    app.run(debug=True)
@@ -0,0 +1,297 @@
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.seed import FIRST_NAMES, LAST_NAMES, analyze, create_database, drop_database, seed, student_code
+from benchmarks.stats import summarize
+from migrate import migrate
+
+
+load_dotenv()
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "api_suite.json")
+BENCH_USER = ("bench-user", "bench-password")
+
+# Nothing that imports db may be loaded before the throwaway database exists:
+# the pool connects to DATABASE_URL on import.
+
+# request(i, ctx) returns the arguments for one test-client call; i counts
+# calls to that scenario (warmup included), ctx holds ids and the auth token.
+Scenario = namedtuple("Scenario", ["name", "request", "expect", "max_iterations"], defaults=[(200,), None])
+
+
+def get(path):
+    return lambda i, ctx: {"method": "GET", "path": path}
+
+
+def cycled(template, values):
+    return lambda i, ctx: {"method": "GET", "path": template.format(values[i % len(values)])}
+
+
+def student_id(ctx, i):
+    # Stride through the table so consecutive calls hit different pages.
+    return student_code((i * 7919) % ctx["students"])
+
+
+def bench_student(i):
+    return {
+        "student_id": f"BENCH-{i:06d}",
+        "first_name": "Bench",
+        "last_name": f"Student{i}",
+        "year_level": 1 + i % 4,
+        "gender": "Other",
+        "program_code": "P1",
+    }
+
+
+def build_scenarios(ctx):
+    limit = 10
+    deep_page = ctx["students"] // limit // 2
+    last_page = -(-ctx["students"] // limit)
+    programs = [f"P{n}" for n in range(1, ctx["programs"] + 1)]
+    colleges = [f"C{n}" for n in range(1, ctx["colleges"] + 1)]
+
+    scenarios = [
+        Scenario("list/students", get(f"/api/students/?page=1&limit={limit}")),
+        Scenario("list/programs", get(f"/api/programs/?page=1&limit={limit}")),
+        Scenario("list/colleges", get(f"/api/colleges/?page=1&limit={limit}")),
+        Scenario("search/all", cycled(f"/api/students/?limit={limit}&query={{}}", ["santos", "mar", "2003-", "p1"])),
+        Scenario("search/id", cycled(f"/api/students/?limit={limit}&filterBy=ID&query={{}}", ["2001-0", "2002-12", "0042"])),
+        Scenario("search/first_name", cycled(f"/api/students/?limit={limit}&filterBy=First%20Name&query={{}}", [n[:3] for n in FIRST_NAMES])),
+        Scenario("search/last_name", cycled(f"/api/students/?limit={limit}&filterBy=Last%20Name&query={{}}", [n[:4] for n in LAST_NAMES])),
+        Scenario("search/year", cycled(f"/api/students/?limit={limit}&filterBy=Year&query={{}}", ["1", "2", "3", "4"])),
+        Scenario("search/gender", cycled(f"/api/students/?limit={limit}&filterBy=Gender&query={{}}", ["Male", "Female", "Other"])),
+        Scenario("search/program", cycled(f"/api/students/?limit={limit}&filterBy=Program&query={{}}", programs)),
+        Scenario("search/relevance", cycled(f"/api/students/?limit={limit}&sortBy=Relevance&query={{}}", ["santos", "maria"])),
+    ]
+
+    for label, column in (("id", "ID"), ("first_name", "First%20Name"), ("last_name", "Last%20Name"),
+                          ("year", "Year"), ("gender", "Gender"), ("program", "Program")):
+        scenarios.append(Scenario(f"sort/{label}", get(f"/api/students/?page=3&limit={limit}&sortBy={column}")))
+        scenarios.append(Scenario(f"sort/{label}_desc", get(f"/api/students/?page=3&limit={limit}&sortBy={column}&sortDesc=true")))
+
+    scenarios += [
+        Scenario("filter/program", cycled(f"/api/students/?limit={limit}&program={{}}", programs)),
+        Scenario("filter/college", cycled(f"/api/students/?limit={limit}&college={{}}", colleges)),
+        Scenario("filter/year_gender", cycled(f"/api/students/?limit={limit}&gender=Female&year={{}}", ["1", "2", "3", "4"])),
+        Scenario("filter/all_facets", cycled(f"/api/students/?limit={limit}&gender=Male&year=2&program={{}}&college=C1", programs)),
+        Scenario("facets/unfiltered", get("/api/students/facets")),
+        Scenario("facets/filtered", cycled("/api/students/facets?gender=Female&program={}", programs)),
+        Scenario("deep/offset_middle", get(f"/api/students/?page={deep_page}&limit={limit}")),
+        Scenario("deep/offset_last", get(f"/api/students/?page={last_page}&limit={limit}")),
+        Scenario("deep/cursor_middle", lambda i, ctx: {"method": "GET", "path": f"/api/students/?limit={limit}&cursor={ctx['middle_cursor']}"}),
+        Scenario("detail/student", lambda i, ctx: {"method": "GET", "path": f"/api/students/{student_id(ctx, i)}"}),
+        Scenario("detail/program", cycled("/api/programs/{}", programs)),
+        Scenario("detail/college", cycled("/api/colleges/{}", colleges)),
+        Scenario("stats/enrollment", get("/api/stats/enrollment")),
+        # The three write scenarios run the same number of calls, so each
+        # update and delete targets a student the create step added.
+        Scenario("write/create", lambda i, ctx: {
+            "method": "POST", "path": "/api/students/", "json": bench_student(i), "headers": ctx["auth"]
+        }, expect=(201,)),
+        Scenario("write/update", lambda i, ctx: {
+            "method": "PUT", "path": f"/api/students/BENCH-{i:06d}",
+            "json": {**bench_student(i), "first_name": "Updated"}, "headers": ctx["auth"]
+        }),
+        Scenario("write/delete", lambda i, ctx: {
+            "method": "DELETE", "path": f"/api/students/BENCH-{i:06d}", "headers": ctx["auth"]
+        }),
+        # Each login pays for a full password hash, so it gets fewer rounds.
+        Scenario("auth/login", lambda i, ctx: {
+            "method": "POST", "path": "/api/auth/login",
+            "json": {"username": BENCH_USER[0], "password": BENCH_USER[1]}
+        }, max_iterations=50),
+    ]
+    return scenarios
+
+
+def measure(client, scenario, ctx, iterations, warmup):
+    if scenario.max_iterations is not None:
+        iterations = min(iterations, scenario.max_iterations)
+        warmup = min(warmup, scenario.max_iterations // 5)
+
+    samples, errors = [], 0
+    for i in range(warmup + iterations):
+        kwargs = scenario.request(i, ctx)
+        start = time.perf_counter()
+        response = client.open(kwargs.pop("path"), **kwargs)
+        response.get_data()
+        elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code not in scenario.expect:
+            errors += 1
+        if i >= warmup:
+            samples.append(elapsed)
+
+    return {
+        "iterations": iterations,
+        "rps": round(iterations / (sum(samples) / 1000), 1),
+        **{name: round(value, 3) for name, value in summarize(samples).items()},
+        "errors": errors,
+    }
+
+
+def prepare_context(app, dataset):
+    from utils.pagination import encode_cursor
+
+    client = app.test_client()
+    client.post("/api/auth/register", json={"username": BENCH_USER[0], "password": BENCH_USER[1]})
+    token = client.post(
+        "/api/auth/login", json={"username": BENCH_USER[0], "password": BENCH_USER[1]}
+    ).get_json()["access_token"]
+
+    middle = student_code(dataset["students"] // 2)
+    return client, {
+        **dataset,
+        "auth": {"Authorization": f"Bearer {token}"},
+        "middle_cursor": encode_cursor("student_id", middle, middle, "next"),
+    }
+
+
+def compare(results, baseline, metric, threshold, min_delta_ms):
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        delta = current[metric] - previous[metric]
+        if current[metric] > previous[metric] * (1 + threshold) and delta > min_delta_ms:
+            regressions.append((name, previous[metric], current[metric]))
+    return regressions
+
+
+def print_report(results, baseline, metric):
+    print(f"{'scenario':<24}{'n':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}{'vs base':>10}")
+    for name, r in results.items():
+        change = ""
+        if name in baseline and baseline[name][metric] > 0:
+            change = f"{(r[metric] / baseline[name][metric] - 1) * 100:+.0f}%"
+        print(
+            f"{name:<24}{r['iterations']:>6}{r['rps']:>10.1f}{r['p50']:>10.3f}"
+            f"{r['p95']:>10.3f}{r['p99']:>10.3f}{r['errors']:>8}{change:>10}"
+        )
+
+
+def load_baseline(path, dataset):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        stored = json.load(f)
+    if stored["meta"]["dataset"] != dataset:
+        print(f"Baseline {path} was recorded on a different dataset; not comparing.")
+        return {}
+    return stored["results"]
+
+
+def save_baseline(path, dataset, args, results, server_version):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({
+            "meta": {
+                "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "dataset": dataset,
+                "iterations": args.iterations,
+                "python": platform.python_version(),
+                "postgres": server_version,
+                "machine": platform.machine(),
+            },
+            "results": results,
+        }, f, indent=2, sort_keys=True)
+    print(f"Saved baseline to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the REST API against a throwaway, seeded Postgres database."
+    )
+    parser.add_argument("--admin-url", default=os.getenv("BENCH_ADMIN_URL") or os.getenv("DATABASE_URL"),
+                        help="server to create the throwaway database on (default BENCH_ADMIN_URL, then DATABASE_URL)")
+    parser.add_argument("--students", type=int, default=50000)
+    parser.add_argument("--programs", type=int, default=40)
+    parser.add_argument("--colleges", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--only", nargs="+", help="glob patterns selecting scenarios, e.g. 'search/*'")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="record this run as the new baseline")
+    parser.add_argument("--metric", choices=["p50", "p95", "p99"], default="p95")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="fail when a scenario's metric grows by more than this fraction")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                        help="ignore regressions smaller than this many milliseconds")
+    parser.add_argument("--keep-db", action="store_true")
+    args = parser.parse_args()
+
+    if not args.admin_url:
+        raise RuntimeError("Set BENCH_ADMIN_URL or DATABASE_URL, or pass --admin-url")
+
+    name, database_url = create_database(args.admin_url)
+    print(f"Seeding throwaway database {name}")
+    try:
+        dataset = seed(database_url, args.students, args.programs, args.colleges, args.seed)
+        migrate(database_url)
+        analyze(database_url)
+
+        # The app reads its configuration at import time. Response, count and
+        # snapshot caches expire at once and tracing is off, so every call
+        # reaches the database.
+        os.environ.update({
+            "DATABASE_URL": database_url,
+            "RESPONSE_CACHE_TTL": "0",
+            "COUNT_CACHE_TTL": "0",
+            "SNAPSHOT_CACHE_TTL": "0",
+            "TRACE_SAMPLE_RATE": "0",
+            "SLOW_QUERY_MS": "-1",
+        })
+        os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-benchmark-secret-key")
+        os.environ.setdefault("SECRET_KEY", "benchmark")
+        from app import app
+        from db import get_pool
+
+        try:
+            client, ctx = prepare_context(app, dataset)
+            scenarios = build_scenarios(ctx)
+            if args.only:
+                scenarios = [s for s in scenarios if any(fnmatch.fnmatch(s.name, p) for p in args.only)]
+
+            results = {s.name: measure(client, s, ctx, args.iterations, args.warmup) for s in scenarios}
+            with get_pool().connection() as conn:
+                server_version = conn.execute("SHOW server_version").fetchone()[0]
+        finally:
+            get_pool().close()
+    finally:
+        if args.keep_db:
+            print(f"Kept database {name}")
+        else:
+            drop_database(args.admin_url, name)
+
+    baseline = load_baseline(args.baseline, dataset)
+    print_report(results, baseline, args.metric)
+
+    failed = [name for name, r in results.items() if r["errors"]]
+    for name in failed:
+        print(f"FAIL {name}: {results[name]['errors']} unexpected responses")
+
+    regressions = compare(results, baseline, args.metric, args.threshold, args.min_delta_ms)
+    for name, before, after in regressions:
+        print(f"REGRESSION {name}: {args.metric} {before:.3f} ms -> {after:.3f} ms")
+
+    if args.save_baseline and not failed:
+        save_baseline(args.baseline, dataset, args, results, server_version)
+
+    if failed or (regressions and not args.save_baseline):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.json_encode import reference_list, student_page
+from benchmarks.stats import summarize
+from utils.compression import available_encodings, compress
+from utils.json_codec import dumps
+
+
+# Levels worth comparing per encoding; the middle one is the default.
+LEVELS = {
+    "gzip": (1, 6, 9),
+    "br": (1, 4, 9),
+    "zstd": (1, 3, 9),
+}
+
+PAYLOADS = {
+    "programs x1000": lambda: reference_list(1000),
+    "students x1000": lambda: student_page(1000),
+    "students x50": lambda: student_page(50),
+    "students x10": lambda: student_page(10),
+}
+
+
+def compress_ms(encoding, level, data, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        compress(encoding, data, level)
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)["p50"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare CPU cost and bytes saved for API response compression.")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--link-mbps", type=float, default=5.0,
+                        help="Link speed used to turn bytes saved into transfer time saved")
+    args = parser.parse_args()
+
+    encodings = available_encodings()
+    missing = sorted(set(LEVELS) - set(encodings))
+    if missing:
+        print(f"not installed, skipped: {', '.join(missing)}")
+
+    bytes_per_ms = args.link_mbps * 1_000_000 / 8 / 1000
+    print(f"{'payload':<16}{'encoding':<10}{'level':>6}{'bytes':>10}{'ratio':>8}{'cpu ms':>9}{'saved ms':>10}")
+    for label, build in PAYLOADS.items():
+        data = dumps(build())
+        print(f"{label:<16}{'identity':<10}{'':>6}{len(data):>10}{1:>8.2f}{0:>9.3f}{0:>10.1f}")
+        for encoding in encodings:
+            for level in LEVELS[encoding]:
+                size = len(compress(encoding, data, level))
+                cpu = compress_ms(encoding, level, data, args.iterations)
+                # Transfer time saved on the given link, net of compression CPU.
+                saved = (len(data) - size) / bytes_per_ms - cpu
+                print(
+                    f"{'':<16}{encoding:<10}{level:>6}{size:>10}"
+                    f"{len(data) / size:>8.2f}{cpu:>9.3f}{saved:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
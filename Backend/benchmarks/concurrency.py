@@ -0,0 +1,140 @@
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.list_roundtrips import LatencyProxy
+from benchmarks.stats import summarize
+
+
+load_dotenv()
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Both apps are served by hypercorn so the HTTP layer is identical; the WSGI
+# app runs each request on hypercorn's thread pool, the ASGI app on the loop.
+SERVERS = {
+    "wsgi (flask)": "app:app",
+    "asgi (quart)": "asgi:app",
+}
+
+PATHS = [
+    "/api/students/?page=1&limit=10",
+    "/api/students/?page=5&limit=10&sortBy=Last%20Name",
+    "/api/students/?limit=10&program=P1",
+    "/api/programs/?page=1&limit=10",
+    "/api/colleges/?page=1&limit=10",
+]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(target, port, env):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "hypercorn", target, "--bind", f"127.0.0.1:{port}"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{target} did not start")
+
+
+async def fetch(reader, writer, path):
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: bench\r\nAccept: application/json\r\n\r\n".encode())
+    await writer.drain()
+
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def client(port, deadline, samples, errors, offset):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    i = offset
+    try:
+        while time.perf_counter() < deadline:
+            path = PATHS[i % len(PATHS)]
+            i += 1
+            start = time.perf_counter()
+            status = await fetch(reader, writer, path)
+            samples.append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def load(port, concurrency, duration):
+    samples, errors = [], []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(
+        client(port, deadline, samples, errors, n) for n in range(concurrency)
+    ))
+    return samples, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the WSGI and ASGI apps under concurrent load.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument(
+        "--rtt-ms", type=float, default=0,
+        help="simulated network round-trip time between the app and Postgres"
+    )
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL environment variable is not set")
+    if args.rtt_ms > 0:
+        database_url = LatencyProxy(database_url, args.rtt_ms).conninfo
+
+    # The response cache would turn this into a cache benchmark.
+    env = {**os.environ, "DATABASE_URL": database_url, "RESPONSE_CACHE_TTL": "0"}
+
+    print(f"{'server':<14}{'clients':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, target in SERVERS.items():
+        port = free_port()
+        process = start_server(target, port, env)
+        try:
+            asyncio.run(load(port, 4, 2))
+            for concurrency in args.concurrency:
+                samples, errors = asyncio.run(load(port, concurrency, args.duration))
+                summary = summarize(samples)
+                print(
+                    f"{name:<14}{concurrency:>8}{len(samples) / args.duration:>10.1f}"
+                    f"{summary['p50']:>10.2f}{summary['p95']:>10.2f}"
+                    f"{summary['p99']:>10.2f}{len(errors):>8}"
+                )
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
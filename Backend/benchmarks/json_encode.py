@@ -0,0 +1,119 @@
+import argparse
+import decimal
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timezone
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.stats import summarize
+from utils.json_codec import FastJSONMixin, orjson
+
+
+class FastProvider(FastJSONMixin, DefaultJSONProvider):
+    pass
+
+
+# Rows shaped like the repositories' dict_row output.
+def student_page(rows):
+    return {
+        "data": [
+            {
+                "student_id": f"{2000 + n // 10000}-{n % 10000:04d}",
+                "first_name": "Francine",
+                "last_name": "Dela Cruz",
+                "year_level": n % 4 + 1,
+                "gender": "Female",
+                "program_code": f"P{n % 40}",
+                "program_name": f"Program in Field {n % 40}",
+                "college_code": f"C{n % 8}",
+                "image_url": None,
+            }
+            for n in range(rows)
+        ],
+        "total": rows,
+        "page": 1,
+        "limit": rows,
+    }
+
+
+def reference_list(rows):
+    return {
+        "data": [{"program_code": f"P{n}", "program_name": f"Program in Field {n}", "college_code": f"C{n % 8}"} for n in range(rows)],
+        "total": rows,
+    }
+
+
+def typed_rows(rows):
+    now = datetime(2024, 6, 1, 8, 30, tzinfo=timezone.utc)
+    return [
+        {"id": uuid.UUID(int=n), "changed_at": now, "day": now.date(), "score": decimal.Decimal("87.50")}
+        for n in range(rows)
+    ]
+
+
+PAYLOADS = {
+    "students x1000": lambda: student_page(1000),
+    "students x50": lambda: student_page(50),
+    "programs x1000": lambda: reference_list(1000),
+    "typed x1000": lambda: typed_rows(1000),
+}
+
+
+def encode_ms(app, payload, iterations):
+    samples = []
+    with app.app_context():
+        for _ in range(iterations):
+            start = time.perf_counter()
+            app.json.response(payload).get_data()
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def allocations(app, payload):
+    with app.app_context():
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        app.json.response(payload).get_data()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return peak - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSON response encoding with the default and fast providers.")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("orjson is not installed; the fast provider will use the standard library")
+
+    apps = {}
+    for name, provider in (("stdlib", DefaultJSONProvider), ("fast", FastProvider)):
+        app = Flask(__name__)
+        app.json = provider(app)
+        apps[name] = app
+
+    print(f"{'payload':<16}{'provider':<10}{'p50 ms':>10}{'mean ms':>10}{'peak KiB':>11}{'bytes':>10}")
+    for label, build in PAYLOADS.items():
+        payload = build()
+        for name, app in apps.items():
+            with app.app_context():
+                size = len(app.json.response(payload).get_data())
+            summary = summarize(encode_ms(app, payload, args.iterations))
+            peak = allocations(app, payload)
+            print(
+                f"{label:<16}{name:<10}{summary['p50']:>10.3f}"
+                f"{summary['mean']:>10.3f}{peak / 1024:>11.1f}{size:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import argparse
+import itertools
+import os
+import statistics
+import sys
+import time
+
+import psycopg
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.stats import summarize
+from db import fetch_page
+from queries.builder import ListQueryBuilder
+from queries.student_queries import StudentQueries
+
+
+load_dotenv()
+
+
+# A spread of student list requests as the UI issues them: paging, sorting
+# and facet filters, each repeated with different values.
+WORKLOAD = [
+    dict(search_term="", filter_field="all", sort_column="student_id", sort_dir="ASC", page=1, filters={}),
+    dict(search_term="", filter_field="all", sort_column="last_name", sort_dir="DESC", page=3, filters={}),
+    dict(search_term="", filter_field="all", sort_column="student_id", sort_dir="ASC", page=1, filters={"program": "P1"}),
+    dict(search_term="", filter_field="all", sort_column="first_name", sort_dir="ASC", page=2, filters={"college": "C2", "gender": "Female"}),
+    dict(search_term="2", filter_field="year_level", sort_column="student_id", sort_dir="ASC", page=1, filters={"gender": "Male"}),
+    dict(search_term="Last1", filter_field="last_name", sort_column="last_name", sort_dir="ASC", page=1, filters={}),
+]
+LIMIT = 10
+
+
+def build(builder, request):
+    return builder.page(
+        request["search_term"], request["filter_field"], request["sort_column"], request["sort_dir"],
+        LIMIT, (request["page"] - 1) * LIMIT, request["filters"]
+    )
+
+
+def planning_ms(conn, query):
+    with conn.cursor() as cur:
+        cur.execute(f"EXPLAIN (ANALYZE, SUMMARY, FORMAT JSON) {query.sql}", query.params)
+        plan = cur.fetchone()[0][0]
+    conn.commit()
+    return plan["Planning Time"], plan["Execution Time"]
+
+
+def run(conn, queries, prepare, iterations, warmup):
+    cycle = itertools.cycle(queries)
+    for _ in range(warmup):
+        fetch_page(conn, *next(cycle), prepare=prepare)
+        conn.commit()
+
+    samples = []
+    for _ in range(iterations):
+        query = next(cycle)
+        start = time.perf_counter()
+        fetch_page(conn, *query, prepare=prepare)
+        conn.commit()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure planning time saved by prepared list queries.")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=60)
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL environment variable is not set")
+
+    builder = ListQueryBuilder(StudentQueries.LIST)
+    queries = [build(builder, request) for request in WORKLOAD]
+
+    with psycopg.connect(database_url) as conn:
+        plans = [planning_ms(conn, query) for query in queries]
+        print(f"{len(queries)} request shapes, {len({q.sql for q in queries})} distinct SQL texts")
+        print(f"planning per request: {statistics.mean(p for p, _ in plans):.3f} ms mean "
+              f"(execution {statistics.mean(e for _, e in plans):.3f} ms)")
+
+        print(f"{'mode':<12}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+        for name, prepare in (("unprepared", False), ("prepared", True)):
+            summary = summarize(run(conn, queries, prepare, args.iterations, args.warmup))
+            print(f"{name:<12}{summary['p50']:>10.3f}{summary['p95']:>10.3f}{summary['mean']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import argparse
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+
+import psycopg
+from dotenv import load_dotenv
+from psycopg.conninfo import conninfo_to_dict, make_conninfo
+from psycopg.rows import dict_row
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.stats import summarize
+from db import fetch_page
+from queries.builder import page_with_count_sql
+
+
+load_dotenv()
+
+
+# The hand-written list query the app used before queries/builder.py.
+SOURCE = "students s LEFT JOIN programs p ON s.program_code = p.program_code"
+WHERE_CLAUSE = "WHERE s.program_code = %s"
+PARAMS = ["P1"]
+
+COUNT_QUERY = f"SELECT COUNT(*) AS count FROM {SOURCE} {WHERE_CLAUSE}"
+DATA_QUERY = f"""
+    SELECT s.student_id, s.first_name, s.last_name, s.year_level, s.gender,
+           s.program_code, s.image_url, p.college_code
+    FROM {SOURCE}
+    {WHERE_CLAUSE}
+    ORDER BY student_id ASC
+    LIMIT %s OFFSET %s
+"""
+
+
+def sequential(conn):
+    with conn.cursor(row_factory=dict_row) as cur:
+        cur.execute(COUNT_QUERY, PARAMS)
+        total_records = cur.fetchone()['count']
+        cur.execute(DATA_QUERY, PARAMS + [10, 0])
+        return cur.fetchall(), total_records
+
+
+def combined(conn):
+    return fetch_page(conn, page_with_count_sql(DATA_QUERY, COUNT_QUERY), PARAMS + PARAMS + [10, 0], True)
+
+
+class LatencyProxy:
+    # Local Postgres answers in microseconds, which hides the round trips
+    # this change removes; the proxy delays every chunk to mimic a remote DB.
+    def __init__(self, database_url, rtt_ms):
+        params = conninfo_to_dict(database_url)
+        host = params.get("host") or "localhost"
+        port = int(params.get("port") or 5432)
+        if host.startswith("/"):
+            self.target = (socket.AF_UNIX, os.path.join(host, f".s.PGSQL.{port}"))
+        else:
+            self.target = (socket.AF_INET, (host, port))
+
+        self.delay = rtt_ms / 2000
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen()
+        self.conninfo = make_conninfo(
+            database_url, host="127.0.0.1", port=self.listener.getsockname()[1]
+        )
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            client, _ = self.listener.accept()
+            family, address = self.target
+            upstream = socket.socket(family, socket.SOCK_STREAM)
+            upstream.connect(address)
+            for src, dst in ((client, upstream), (upstream, client)):
+                pending = queue.Queue()
+                threading.Thread(target=self._read, args=(src, pending), daemon=True).start()
+                threading.Thread(target=self._write, args=(dst, pending), daemon=True).start()
+
+    def _read(self, src, pending):
+        while True:
+            chunk = src.recv(65536)
+            pending.put((time.perf_counter() + self.delay, chunk))
+            if not chunk:
+                return
+
+    def _write(self, dst, pending):
+        # Chunks are delayed from the moment they arrive, so back-to-back
+        # writes share one simulated trip instead of queueing behind each other.
+        while True:
+            due, chunk = pending.get()
+            time.sleep(max(0, due - time.perf_counter()))
+            if not chunk:
+                dst.close()
+                return
+            dst.sendall(chunk)
+
+
+def run(conn, fn, iterations, warmup):
+    for _ in range(warmup):
+        fn(conn)
+        conn.commit()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(conn)
+        conn.commit()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two-statement vs combined page + count list queries.")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument(
+        "--rtt-ms", type=float, default=0,
+        help="simulated network round-trip time added by a local proxy"
+    )
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL environment variable is not set")
+    if args.rtt_ms > 0:
+        database_url = LatencyProxy(database_url, args.rtt_ms).conninfo
+
+    with psycopg.connect(database_url) as conn:
+        if sequential(conn) != combined(conn):
+            raise RuntimeError("Combined results differ from sequential results")
+        conn.commit()
+
+        print(f"{'mode':<12}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+        for name, fn in (("sequential", sequential), ("combined", combined)):
+            summary = summarize(run(conn, fn, args.iterations, args.warmup))
+            print(f"{name:<12}{summary['p50']:>10.3f}{summary['p99']:>10.3f}{summary['mean']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import random
+import uuid
+
+import psycopg
+from psycopg import sql
+from psycopg.conninfo import make_conninfo
+
+
+# The base tables the migrations build on.
+SCHEMA = """
+    CREATE TABLE colleges (
+        college_code VARCHAR PRIMARY KEY,
+        college_name VARCHAR NOT NULL
+    );
+
+    CREATE TABLE programs (
+        program_code VARCHAR PRIMARY KEY,
+        program_name VARCHAR NOT NULL,
+        college_code VARCHAR REFERENCES colleges (college_code) ON UPDATE CASCADE ON DELETE SET NULL
+    );
+
+    CREATE TABLE students (
+        student_id VARCHAR PRIMARY KEY,
+        first_name VARCHAR NOT NULL,
+        last_name VARCHAR NOT NULL,
+        year_level INTEGER NOT NULL,
+        gender VARCHAR NOT NULL,
+        program_code VARCHAR REFERENCES programs (program_code) ON UPDATE CASCADE ON DELETE SET NULL,
+        image_url TEXT
+    );
+
+    CREATE TABLE users (
+        id SERIAL PRIMARY KEY,
+        username VARCHAR NOT NULL,
+        password_hash TEXT NOT NULL
+    );
+"""
+
+FIRST_NAMES = [
+    "Aaliyah", "Andres", "Bea", "Carlo", "Danica", "Elijah", "Francine", "Gabriel",
+    "Hannah", "Isidro", "Jasmine", "Kenji", "Liza", "Marco", "Nadine", "Oscar",
+    "Patricia", "Quentin", "Rosa", "Samuel", "Trisha", "Ulysses", "Vina", "Warren",
+]
+LAST_NAMES = [
+    "Abad", "Bautista", "Castillo", "Dela Cruz", "Estrada", "Flores", "Garcia", "Hernandez",
+    "Ilagan", "Jimenez", "Katigbak", "Lopez", "Mendoza", "Navarro", "Ocampo", "Pascual",
+    "Quiambao", "Reyes", "Santos", "Torres", "Umali", "Villanueva", "Yap", "Zamora",
+]
+GENDERS = ["Male", "Female", "Other"]
+
+
+def student_code(n):
+    return f"{2000 + n // 10000}-{n % 10000:04d}"
+
+
+def create_database(admin_url):
+    name = f"ssis_bench_{uuid.uuid4().hex[:8]}"
+    with psycopg.connect(admin_url, autocommit=True) as conn:
+        conn.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(name)))
+    return name, make_conninfo(admin_url, dbname=name)
+
+
+def drop_database(admin_url, name):
+    with psycopg.connect(admin_url, autocommit=True) as conn:
+        conn.execute(sql.SQL("DROP DATABASE IF EXISTS {} WITH (FORCE)").format(sql.Identifier(name)))
+
+
+def seed(database_url, students, programs, colleges, seed_value):
+    rng = random.Random(seed_value)
+    college_codes = [f"C{n}" for n in range(1, colleges + 1)]
+    program_codes = [f"P{n}" for n in range(1, programs + 1)]
+
+    with psycopg.connect(database_url) as conn:
+        with conn.cursor() as cur:
+            cur.execute(SCHEMA)
+            with cur.copy("COPY colleges (college_code, college_name) FROM STDIN") as copy:
+                for n, code in enumerate(college_codes, 1):
+                    copy.write_row((code, f"College of Studies {n}"))
+            with cur.copy("COPY programs (program_code, program_name, college_code) FROM STDIN") as copy:
+                for n, code in enumerate(program_codes, 1):
+                    copy.write_row((code, f"Program in Field {n}", college_codes[(n - 1) % colleges]))
+            with cur.copy(
+                "COPY students (student_id, first_name, last_name, year_level, gender, program_code) FROM STDIN"
+            ) as copy:
+                for n in range(students):
+                    copy.write_row((
+                        student_code(n),
+                        rng.choice(FIRST_NAMES),
+                        rng.choice(LAST_NAMES),
+                        rng.randint(1, 4),
+                        rng.choice(GENDERS),
+                        rng.choice(program_codes),
+                    ))
+        conn.commit()
+
+    return {"students": students, "programs": programs, "colleges": colleges, "seed": seed_value}
+
+
+def analyze(database_url):
+    with psycopg.connect(database_url, autocommit=True) as conn:
+        conn.execute("VACUUM ANALYZE")
@@ -0,0 +1,19 @@
+import statistics
+
+
+def percentile(samples, pct):
+    # Nearest rank, so every reported value is one that was measured.
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples):
+    # Every benchmark reports through this, so their p50/p95/p99 columns
+    # mean the same thing and can be compared.
+    return {
+        "mean": statistics.mean(samples),
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+    }
@@ -0,0 +1,18 @@
+from quart import Blueprint
+from utils.async_auth import jwt_required
+from controllers import async_auth_controller as auth_controller
+
+auth_bp = Blueprint("auth", __name__)
+
+@auth_bp.route("/register", methods=["POST"])
+async def register():
+    return await auth_controller.register()
+
+@auth_bp.route("/login", methods=["POST"])
+async def login():
+    return await auth_controller.login()
+
+@auth_bp.route("/protected", methods=["GET"])
+@jwt_required()
+async def protected():
+    return await auth_controller.protected_route()
\ No newline at end of file
@@ -0,0 +1,8 @@
+from quart import Blueprint
+from controllers import async_change_controller as change_controller
+
+changes_bp = Blueprint("changes", __name__)
+
+@changes_bp.route("/", methods=["GET"], strict_slashes=False)
+async def get_changes():
+    return await change_controller.get_changes()
@@ -0,0 +1,47 @@
+from quart import Blueprint
+from utils.async_auth import jwt_required
+from controllers import async_college_controller as college_controller
+
+colleges_bp = Blueprint("colleges", __name__)
+
+@colleges_bp.route("/", methods=["GET"], strict_slashes=False)
+async def list_colleges():
+    return await college_controller.list_colleges()
+
+@colleges_bp.route("/snapshot", methods=["GET"], strict_slashes=False)
+async def colleges_snapshot():
+    return await college_controller.get_colleges_snapshot()
+
+@colleges_bp.route("/", methods=["POST"], strict_slashes=False)
+@jwt_required()
+async def create_college():
+    return await college_controller.create_college()
+
+@colleges_bp.route("/<college_code>", methods=["PUT"], strict_slashes=False)
+@jwt_required()
+async def update_college(college_code):
+    return await college_controller.update_college(college_code)
+
+@colleges_bp.route("/<college_code>", methods=["DELETE"], strict_slashes=False)
+@jwt_required()
+async def delete_college(college_code):
+    return await college_controller.delete_college(college_code)
+
+@colleges_bp.route("/<college_code>", methods=["GET"], strict_slashes=False)
+async def get_college(college_code):
+    return await college_controller.get_college(college_code)
+
+@colleges_bp.route("/<college_code>/recode", methods=["GET"])
+@jwt_required()
+async def preview_recode(college_code):
+    return await college_controller.preview_recode(college_code)
+
+@colleges_bp.route("/<college_code>/recode", methods=["POST"])
+@jwt_required()
+async def start_recode(college_code):
+    return await college_controller.start_recode(college_code)
+
+@colleges_bp.route("/recode-jobs/<int:job_id>", methods=["GET"])
+@jwt_required()
+async def get_recode_job(job_id):
+    return await college_controller.get_recode_job(job_id)
\ No newline at end of file
@@ -0,0 +1,18 @@
+from quart import Blueprint
+from utils.async_auth import jwt_required
+from controllers import async_image_controller as image_controller
+
+images_bp = Blueprint("images", __name__)
+
+@images_bp.route("/", methods=["POST"], strict_slashes=False)
+@jwt_required()
+async def upload_image():
+    return await image_controller.upload_image()
+
+@images_bp.route("/<image_hash>.<extension>", methods=["GET"])
+async def get_image(image_hash, extension):
+    return await image_controller.get_image(image_hash, extension)
+
+@images_bp.route("/<image_hash>/<int:size>.<extension>", methods=["GET"])
+async def get_thumbnail(image_hash, size, extension):
+    return await image_controller.get_image(image_hash, extension, size)
\ No newline at end of file
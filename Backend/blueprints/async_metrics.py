@@ -0,0 +1,20 @@
+from quart import Blueprint
+from utils.async_auth import jwt_required
+from controllers import async_metrics_controller as metrics_controller
+
+metrics_bp = Blueprint("metrics", __name__)
+
+@metrics_bp.route("/cache", methods=["GET"])
+@jwt_required()
+async def cache_stats():
+    return await metrics_controller.cache_stats()
+
+@metrics_bp.route("/pool", methods=["GET"])
+@jwt_required()
+async def pool_stats():
+    return await metrics_controller.pool_stats()
+
+@metrics_bp.route("/auth", methods=["GET"])
+@jwt_required()
+async def auth_stats():
+    return await metrics_controller.auth_stats()
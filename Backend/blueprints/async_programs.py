@@ -0,0 +1,47 @@
+from quart import Blueprint
+from utils.async_auth import jwt_required
+from controllers import async_program_controller as program_controller
+
+programs_bp = Blueprint("programs", __name__)
+
+@programs_bp.route("/", methods=["GET"])
+async def list_programs():
+    return await program_controller.list_programs()
+
+@programs_bp.route("/snapshot", methods=["GET"])
+async def programs_snapshot():
+    return await program_controller.get_programs_snapshot()
+
+@programs_bp.route("/", methods=["POST"])
+@jwt_required()
+async def create_program():
+    return await program_controller.create_program()
+
+@programs_bp.route("/<program_code>", methods=["PUT"])
+@jwt_required()
+async def update_program(program_code):
+    return await program_controller.update_program(program_code)
+
+@programs_bp.route("/<program_code>", methods=["DELETE"])
+@jwt_required()
+async def delete_program(program_code):
+    return await program_controller.delete_program(program_code)
+
+@programs_bp.route("/<program_code>", methods=["GET"])
+async def get_program(program_code):
+    return await program_controller.get_program(program_code)
+
+@programs_bp.route("/<program_code>/recode", methods=["GET"])
+@jwt_required()
+async def preview_recode(program_code):
+    return await program_controller.preview_recode(program_code)
+
+@programs_bp.route("/<program_code>/recode", methods=["POST"])
+@jwt_required()
+async def start_recode(program_code):
+    return await program_controller.start_recode(program_code)
+
+@programs_bp.route("/recode-jobs/<int:job_id>", methods=["GET"])
+@jwt_required()
+async def get_recode_job(job_id):
+    return await program_controller.get_recode_job(job_id)
\ No newline at end of file
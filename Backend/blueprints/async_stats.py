@@ -0,0 +1,8 @@
+from quart import Blueprint
+from controllers import async_stats_controller as stats_controller
+
+stats_bp = Blueprint("stats", __name__)
+
+@stats_bp.route("/enrollment", methods=["GET"])
+async def enrollment_stats():
+    return await stats_controller.get_enrollment_stats()
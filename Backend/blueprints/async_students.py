@@ -0,0 +1,67 @@
+from quart import Blueprint
+from utils.async_auth import jwt_required
+from controllers import async_student_controller as student_controller
+
+students_bp = Blueprint("students", __name__)
+
+@students_bp.route("/", methods=["GET"], strict_slashes=False)
+async def list_students():
+    return await student_controller.list_students()
+
+@students_bp.route("/facets", methods=["GET"], strict_slashes=False)
+async def student_facets():
+    return await student_controller.student_facets()
+
+@students_bp.route("/export", methods=["GET"], strict_slashes=False)
+@jwt_required()
+async def export_students():
+    return await student_controller.export_students()
+
+@students_bp.route("/<student_id>", methods=["GET"], strict_slashes=False)
+async def get_student(student_id):
+    return await student_controller.get_student(student_id)
+
+@students_bp.route("/", methods=["POST"], strict_slashes=False)
+@jwt_required()
+async def create_student():
+    return await student_controller.create_student()
+
+@students_bp.route("/import", methods=["POST"], strict_slashes=False)
+@jwt_required()
+async def import_students():
+    return await student_controller.import_students()
+
+@students_bp.route("/batch/promote", methods=["POST"], strict_slashes=False)
+@jwt_required()
+async def promote_students():
+    return await student_controller.promote_students()
+
+@students_bp.route("/batch/reassign", methods=["POST"], strict_slashes=False)
+@jwt_required()
+async def reassign_students():
+    return await student_controller.reassign_students()
+
+@students_bp.route("/batch/delete", methods=["POST"], strict_slashes=False)
+@jwt_required()
+async def delete_students():
+    return await student_controller.delete_students()
+
+@students_bp.route("/<student_id>", methods=["PUT"], strict_slashes=False)
+@jwt_required()
+async def update_student(student_id):
+    return await student_controller.update_student(student_id)
+
+@students_bp.route("/<student_id>", methods=["DELETE"], strict_slashes=False)
+@jwt_required()
+async def delete_student(student_id):
+    return await student_controller.delete_student(student_id)
+
+@students_bp.route("/<student_id>/image", methods=["PATCH"], strict_slashes=False)
+@jwt_required()
+async def update_student_image(student_id):
+    return await student_controller.update_student_image(student_id)
+
+@students_bp.route("/<student_id>/image", methods=["DELETE"], strict_slashes=False)
+@jwt_required()
+async def delete_student_image(student_id):
+    return await student_controller.delete_student_image(student_id)
\ No newline at end of file
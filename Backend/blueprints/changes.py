@@ -0,0 +1,8 @@
+from flask import Blueprint
+from controllers import change_controller
+
+changes_bp = Blueprint("changes", __name__)
+
+@changes_bp.route("/", methods=["GET"], strict_slashes=False)
+def get_changes():
+    return change_controller.get_changes()
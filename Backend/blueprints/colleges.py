@@ -10,6 +10,10 @@ CORS(colleges_bp)
 def list_colleges():
     return college_controller.list_colleges()
 
+@colleges_bp.route("/snapshot", methods=["GET"], strict_slashes=False)
+def colleges_snapshot():
+    return college_controller.get_colleges_snapshot()
+
 @colleges_bp.route("/", methods=["POST"], strict_slashes=False)
 @jwt_required()
 def create_college():
@@ -27,4 +31,19 @@ def delete_college(college_code):
 
 @colleges_bp.route("/<college_code>", methods=["GET"], strict_slashes=False)
 def get_college(college_code):
-    return college_controller.get_college(college_code)
\ No newline at end of file
+    return college_controller.get_college(college_code)
+
+@colleges_bp.route("/<college_code>/recode", methods=["GET"])
+@jwt_required()
+def preview_recode(college_code):
+    return college_controller.preview_recode(college_code)
+
+@colleges_bp.route("/<college_code>/recode", methods=["POST"])
+@jwt_required()
+def start_recode(college_code):
+    return college_controller.start_recode(college_code)
+
+@colleges_bp.route("/recode-jobs/<int:job_id>", methods=["GET"])
+@jwt_required()
+def get_recode_job(job_id):
+    return college_controller.get_recode_job(job_id)
\ No newline at end of file
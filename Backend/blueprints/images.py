@@ -0,0 +1,18 @@
+from flask import Blueprint
+from flask_jwt_extended import jwt_required
+from controllers import image_controller
+
+images_bp = Blueprint("images", __name__)
+
+@images_bp.route("/", methods=["POST"], strict_slashes=False)
+@jwt_required()
+def upload_image():
+    return image_controller.upload_image()
+
+@images_bp.route("/<image_hash>.<extension>", methods=["GET"])
+def get_image(image_hash, extension):
+    return image_controller.get_image(image_hash, extension)
+
+@images_bp.route("/<image_hash>/<int:size>.<extension>", methods=["GET"])
+def get_thumbnail(image_hash, size, extension):
+    return image_controller.get_image(image_hash, extension, size)
\ No newline at end of file
@@ -0,0 +1,20 @@
+from flask import Blueprint
+from flask_jwt_extended import jwt_required
+from controllers import metrics_controller
+
+metrics_bp = Blueprint("metrics", __name__)
+
+@metrics_bp.route("/cache", methods=["GET"])
+@jwt_required()
+def cache_stats():
+    return metrics_controller.cache_stats()
+
+@metrics_bp.route("/pool", methods=["GET"])
+@jwt_required()
+def pool_stats():
+    return metrics_controller.pool_stats()
+
+@metrics_bp.route("/auth", methods=["GET"])
+@jwt_required()
+def auth_stats():
+    return metrics_controller.auth_stats()
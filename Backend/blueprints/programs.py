@@ -8,6 +8,10 @@ programs_bp = Blueprint("programs", __name__)
 def list_programs():
     return program_controller.list_programs()
 
+@programs_bp.route("/snapshot", methods=["GET"])
+def programs_snapshot():
+    return program_controller.get_programs_snapshot()
+
 @programs_bp.route("/", methods=["POST"])
 @jwt_required()
 def create_program():
@@ -25,4 +29,19 @@ def delete_program(program_code):
 
 @programs_bp.route("/<program_code>", methods=["GET"])
 def get_program(program_code):
-    return program_controller.get_program(program_code)
\ No newline at end of file
+    return program_controller.get_program(program_code)
+
+@programs_bp.route("/<program_code>/recode", methods=["GET"])
+@jwt_required()
+def preview_recode(program_code):
+    return program_controller.preview_recode(program_code)
+
+@programs_bp.route("/<program_code>/recode", methods=["POST"])
+@jwt_required()
+def start_recode(program_code):
+    return program_controller.start_recode(program_code)
+
+@programs_bp.route("/recode-jobs/<int:job_id>", methods=["GET"])
+@jwt_required()
+def get_recode_job(job_id):
+    return program_controller.get_recode_job(job_id)
\ No newline at end of file
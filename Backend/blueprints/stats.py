@@ -0,0 +1,8 @@
+from flask import Blueprint
+from controllers import stats_controller
+
+stats_bp = Blueprint("stats", __name__)
+
+@stats_bp.route("/enrollment", methods=["GET"])
+def enrollment_stats():
+    return stats_controller.get_enrollment_stats()
@@ -10,6 +10,15 @@ CORS(students_bp)
 def list_students():
     return student_controller.list_students()
 
+@students_bp.route("/facets", methods=["GET"], strict_slashes=False)
+def student_facets():
+    return student_controller.student_facets()
+
+@students_bp.route("/export", methods=["GET"], strict_slashes=False)
+@jwt_required()
+def export_students():
+    return student_controller.export_students()
+
 @students_bp.route("/<student_id>", methods=["GET"], strict_slashes=False)
 def get_student(student_id):
     return student_controller.get_student(student_id)
@@ -19,6 +28,26 @@ def get_student(student_id):
 def create_student():
     return student_controller.create_student()
 
+@students_bp.route("/import", methods=["POST"], strict_slashes=False)
+@jwt_required()
+def import_students():
+    return student_controller.import_students()
+
+@students_bp.route("/batch/promote", methods=["POST"], strict_slashes=False)
+@jwt_required()
+def promote_students():
+    return student_controller.promote_students()
+
+@students_bp.route("/batch/reassign", methods=["POST"], strict_slashes=False)
+@jwt_required()
+def reassign_students():
+    return student_controller.reassign_students()
+
+@students_bp.route("/batch/delete", methods=["POST"], strict_slashes=False)
+@jwt_required()
+def delete_students():
+    return student_controller.delete_students()
+
 @students_bp.route("/<student_id>", methods=["PUT"], strict_slashes=False)
 @jwt_required()
 def update_student(student_id):
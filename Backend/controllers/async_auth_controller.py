@@ -0,0 +1,31 @@
+from quart import request, jsonify
+from utils.async_auth import get_jwt_identity
+from services.async_auth_service import AsyncAuthService
+
+auth_service = AsyncAuthService()
+
+async def register():
+    data = await request.get_json()
+    username = data.get("username")
+    password = data.get("password")
+
+    if not username or not password:
+        return jsonify({"error": "Missing username or password"}), 400
+
+    response, status_code = await auth_service.register_user(username, password, request.remote_addr)
+    return jsonify(response), status_code
+
+async def login():
+    data = await request.get_json()
+    username = data.get("username")
+    password = data.get("password")
+
+    if not username or not password:
+        return jsonify({"error": "Missing username or password"}), 400
+
+    response, status_code = await auth_service.login_user(username, password, request.remote_addr)
+    return jsonify(response), status_code
+
+async def protected_route():
+    current_user_id = get_jwt_identity()
+    return jsonify({"message": f"Hello user {current_user_id}"}), 200
\ No newline at end of file
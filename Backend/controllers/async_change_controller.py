@@ -0,0 +1,13 @@
+from quart import request, jsonify
+from services.async_change_service import AsyncChangeService
+from services.change_service import CHANGE_FEED_LIMIT
+
+change_service = AsyncChangeService()
+
+async def get_changes():
+    since = request.args.get("since", 0, type=int)
+    limit = request.args.get("limit", CHANGE_FEED_LIMIT, type=int)
+    entities = request.args.get("entity", "", type=str)
+
+    response, status = await change_service.get_changes(since, limit, entities)
+    return jsonify(response), status
@@ -0,0 +1,30 @@
+import io
+from quart import request, jsonify, send_file
+from controllers.image_controller import IMAGE_MAX_AGE
+from services.async_image_service import AsyncImageService
+from services.image_service import IMAGE_MAX_BYTES
+
+image_service = AsyncImageService()
+
+async def upload_image():
+    upload = (await request.files).get("file")
+    if upload is None:
+        return jsonify({"error": "file is required"}), 400
+
+    response, status = await image_service.store(upload.stream.read(IMAGE_MAX_BYTES + 1))
+    return jsonify(response), status
+
+async def get_image(image_hash, extension, size=None):
+    image, status = await image_service.get_image(image_hash, size, extension)
+    if status != 200:
+        return jsonify(image), status
+
+    response = await send_file(
+        image["path"] or io.BytesIO(image["data"]),
+        mimetype=image["content_type"],
+        add_etags=False,
+        cache_timeout=IMAGE_MAX_AGE
+    )
+    response.set_etag(image["etag"])
+    response.cache_control.immutable = True
+    return await response.make_conditional(request, accept_ranges=True, complete_length=response.content_length)
\ No newline at end of file
@@ -0,0 +1,27 @@
+from quart import jsonify
+from utils.response_cache import get_response_cache
+from db import get_async_pool
+from queries.builder import get_query_cache
+from utils.login_throttle import get_login_throttle
+from utils.password_hasher import get_password_hasher
+
+response_cache = get_response_cache()
+pool = get_async_pool()
+query_cache = get_query_cache()
+password_hasher = get_password_hasher()
+login_throttle = get_login_throttle()
+
+async def cache_stats():
+    return jsonify({
+        "response_cache": response_cache.stats(),
+        "query_cache": query_cache.stats()
+    }), 200
+
+async def pool_stats():
+    return jsonify({"pool": pool.stats()}), 200
+
+async def auth_stats():
+    return jsonify({
+        "password_hasher": password_hasher.stats(),
+        "login_throttle": login_throttle.stats()
+    }), 200
@@ -0,0 +1,77 @@
+from quart import Response, request, jsonify
+from utils.snapshot_cache import snapshot_response
+from utils.response_cache import get_response_cache
+from services.async_program_service import AsyncProgramService
+from services.program_service import REQUIRED_FIELDS
+
+program_service = AsyncProgramService()
+response_cache = get_response_cache()
+
+async def list_programs():
+    page = request.args.get("page", 1, type=int)
+    limit = request.args.get("limit", 10, type=int)
+    query = request.args.get("query", "", type=str)
+    filter_by = request.args.get("filterBy", "All", type=str)
+    sort_by = request.args.get("sortBy", "Program Code", type=str)
+    sort_desc = request.args.get("sortDesc", "false").lower()
+    cursor = request.args.get("cursor", None, type=str)
+    pagination_mode = request.args.get("paginationMode", "offset", type=str).lower()
+    count_mode = request.args.get("countMode", "exact", type=str).lower()
+    fields = request.args.get("fields", None, type=str)
+
+    args = (
+        page, limit, query, filter_by, sort_by, sort_desc, cursor, pagination_mode, count_mode, fields
+    )
+    response, status = await response_cache.get_or_load_async(
+        ("programs", args), ("programs",),
+        lambda: program_service.get_all_programs(*args)
+    )
+    return jsonify(response), status
+
+async def get_programs_snapshot():
+    return snapshot_response(await program_service.get_programs_snapshot(), request, Response)
+
+async def get_program(program_code):
+    fields = request.args.get("fields", None, type=str)
+    response, status = await response_cache.get_or_load_async(
+        ("program", program_code, fields), ("program-details", f"program:{program_code}"),
+        lambda: program_service.get_program(program_code, fields)
+    )
+    return jsonify(response), status
+
+async def create_program():
+    data = (await request.get_json()) or {}
+    for f in REQUIRED_FIELDS:
+        if f not in data or data[f] in (None, ""):
+            return jsonify({"error": f"{f} is required"}), 400
+            
+    response, status = await program_service.create_program(data)
+    return jsonify(response), status
+
+async def update_program(program_code):
+    data = (await request.get_json()) or {}
+    for f in REQUIRED_FIELDS:
+        if f not in data or data[f] in (None, ""):
+            return jsonify({"error": f"{f} is required"}), 400
+
+    response, status = await program_service.update_program(program_code, data)
+    return jsonify(response), status
+
+async def delete_program(program_code):
+    response, status = await program_service.delete_program(program_code)
+    return jsonify(response), status
+
+async def preview_recode(program_code):
+    new_code = request.args.get("new_code", "", type=str).strip()
+    response, status = await program_service.recodes.preview(program_code, new_code)
+    return jsonify(response), status
+
+async def start_recode(program_code):
+    data = await request.get_json() or {}
+    new_code = str(data.get("new_code") or "").strip()
+    response, status = await program_service.recodes.start(program_code, new_code)
+    return jsonify(response), status
+
+async def get_recode_job(job_id):
+    response, status = await program_service.recodes.get_job(job_id)
+    return jsonify(response), status
\ No newline at end of file
@@ -0,0 +1,8 @@
+from quart import Response, request
+from utils.snapshot_cache import snapshot_response
+from services.async_stats_service import AsyncStatsService
+
+stats_service = AsyncStatsService()
+
+async def get_enrollment_stats():
+    return snapshot_response(await stats_service.get_enrollment_stats(), request, Response)
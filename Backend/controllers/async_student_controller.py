@@ -0,0 +1,157 @@
+import io
+import tempfile
+from quart import Response, request, jsonify
+from utils.response_cache import get_response_cache
+from services.async_student_service import AsyncStudentService
+from services.student_service import EXPORT_MIMETYPES, IMPORT_FORMATS, IMPORT_MODES, REQUIRED_FIELDS
+
+student_service = AsyncStudentService()
+response_cache = get_response_cache()
+IMPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
+async def list_students():
+    page = request.args.get("page", 1, type=int)
+    limit = request.args.get("limit", 10, type=int)
+    query = request.args.get("query", "", type=str)
+    filter_by = request.args.get("filterBy", "All", type=str)
+    sort_by = request.args.get("sortBy", "ID", type=str)
+    sort_desc = request.args.get("sortDesc", "false").lower()
+    cursor = request.args.get("cursor", None, type=str)
+    pagination_mode = request.args.get("paginationMode", "offset", type=str).lower()
+    count_mode = request.args.get("countMode", "exact", type=str).lower()
+    fields = request.args.get("fields", None, type=str)
+    
+    program_filter = request.args.get("program", "", type=str)
+    year_filter = request.args.get("year", "", type=str)
+    gender_filter = request.args.get("gender", "", type=str)
+    college_filter = request.args.get("college", "", type=str)
+
+    args = (
+        page, limit, query, filter_by, sort_by, sort_desc,
+        program_filter, year_filter, gender_filter, college_filter,
+        cursor, pagination_mode, count_mode, fields
+    )
+    response, status = await response_cache.get_or_load_async(
+        ("students", args), ("students",),
+        lambda: student_service.get_all_students(*args)
+    )
+    
+    return jsonify(response), status
+
+async def student_facets():
+    query = request.args.get("query", "", type=str)
+    filter_by = request.args.get("filterBy", "All", type=str)
+    program_filter = request.args.get("program", "", type=str)
+    year_filter = request.args.get("year", "", type=str)
+    gender_filter = request.args.get("gender", "", type=str)
+    college_filter = request.args.get("college", "", type=str)
+
+    args = (query, filter_by, program_filter, year_filter, gender_filter, college_filter)
+    response, status = await response_cache.get_or_load_async(
+        ("student-facets", args), ("students",),
+        lambda: student_service.get_student_facets(*args)
+    )
+    return jsonify(response), status
+
+async def get_student(student_id):
+    fields = request.args.get("fields", None, type=str)
+    response, status = await response_cache.get_or_load_async(
+        ("student", student_id, fields), ("student-details", f"student:{student_id}"),
+        lambda: student_service.get_student(student_id, fields)
+    )
+    return jsonify(response), status
+
+async def create_student():
+    data = await request.get_json()
+    for f in REQUIRED_FIELDS:
+        if f not in data or data[f] in (None, ""):
+            return jsonify({"error": f"{f} is required"}), 400
+            
+    response, status = await student_service.create_student(data)
+    return jsonify(response), status
+
+async def import_students():
+    fmt = request.args.get("format", "", type=str).lower() or IMPORT_FORMATS.get(request.mimetype)
+    mode = request.args.get("mode", "atomic", type=str).lower()
+
+    if fmt not in IMPORT_FORMATS.values():
+        return jsonify({"error": "Upload must be CSV (text/csv) or NDJSON (application/x-ndjson)"}), 400
+    if mode not in IMPORT_MODES:
+        return jsonify({"error": "mode must be 'atomic' or 'skip'"}), 400
+
+    # The body arrives asynchronously but the record readers are synchronous,
+    # so spool it (to disk past IMPORT_SPOOL_BYTES) and parse from there.
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES) as spool:
+        async for chunk in request.body:
+            spool.write(chunk)
+        spool.seek(0)
+        stream = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+        response, status = await student_service.import_students(stream, fmt, mode, REQUIRED_FIELDS)
+    return jsonify(response), status
+
+async def export_students():
+    fmt = request.args.get("format", "csv", type=str).lower()
+    if fmt not in EXPORT_MIMETYPES:
+        return jsonify({"error": "format must be 'csv' or 'ndjson'"}), 400
+
+    query = request.args.get("query", "", type=str)
+    filter_by = request.args.get("filterBy", "All", type=str)
+    sort_by = request.args.get("sortBy", "ID", type=str)
+    sort_desc = request.args.get("sortDesc", "false").lower()
+    program_filter = request.args.get("program", "", type=str)
+    year_filter = request.args.get("year", "", type=str)
+    gender_filter = request.args.get("gender", "", type=str)
+    college_filter = request.args.get("college", "", type=str)
+
+    chunks, status = await student_service.export_students(
+        fmt, query, filter_by, sort_by, sort_desc,
+        program_filter, year_filter, gender_filter, college_filter
+    )
+    return Response(
+        chunks,
+        status=status,
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={"Content-Disposition": f"attachment; filename=students.{fmt}"}
+    )
+
+async def update_student(student_id):
+    data = (await request.get_json()) or {}
+    for f in REQUIRED_FIELDS:
+        if f not in data or data[f] in (None, ""):
+            return jsonify({"error": f"{f} is required"}), 400
+
+    response, status = await student_service.update_student(student_id, data)
+    return jsonify(response), status
+
+async def delete_student(student_id):
+    response, status = await student_service.delete_student(student_id)
+    return jsonify(response), status
+
+async def update_student_image(student_id):
+    data = await request.get_json()
+    image_url = data.get("image_url")
+
+    if not image_url:
+        return jsonify({"error": "image_url is required"}), 400
+
+    response, status = await student_service.update_student_image(student_id, image_url)
+    return jsonify(response), status
+
+async def delete_student_image(student_id):
+    response, status = await student_service.remove_student_image(student_id)
+    return jsonify(response), status
+
+async def promote_students():
+    data = (await request.get_json()) or {}
+    response, status = await student_service.promote_students(data)
+    return jsonify(response), status
+
+async def reassign_students():
+    data = (await request.get_json()) or {}
+    response, status = await student_service.reassign_students(data)
+    return jsonify(response), status
+
+async def delete_students():
+    data = (await request.get_json()) or {}
+    response, status = await student_service.delete_students(data)
+    return jsonify(response), status
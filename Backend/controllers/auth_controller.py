@@ -12,7 +12,7 @@ def register():
     if not username or not password:
         return jsonify({"error": "Missing username or password"}), 400
 
-    response, status_code = auth_service.register_user(username, password)
+    response, status_code = auth_service.register_user(username, password, request.remote_addr)
     return jsonify(response), status_code
 
 def login():
@@ -23,7 +23,7 @@ def login():
     if not username or not password:
         return jsonify({"error": "Missing username or password"}), 400
 
-    response, status_code = auth_service.login_user(username, password)
+    response, status_code = auth_service.login_user(username, password, request.remote_addr)
     return jsonify(response), status_code
 
 def protected_route():
@@ -0,0 +1,12 @@
+from flask import request, jsonify
+from services.change_service import CHANGE_FEED_LIMIT, ChangeService
+
+change_service = ChangeService()
+
+def get_changes():
+    since = request.args.get("since", 0, type=int)
+    limit = request.args.get("limit", CHANGE_FEED_LIMIT, type=int)
+    entities = request.args.get("entity", "", type=str)
+
+    response, status = change_service.get_changes(since, limit, entities)
+    return jsonify(response), status
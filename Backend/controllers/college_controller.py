@@ -1,8 +1,10 @@
 from flask import request, jsonify
-from services.college_service import CollegeService
+from utils.snapshot_cache import snapshot_response
+from utils.response_cache import get_response_cache
+from services.college_service import REQUIRED_FIELDS, CollegeService
 
 college_service = CollegeService()
-REQUIRED_FIELDS = ["college_code", "college_name"]
+response_cache = get_response_cache()
 
 def list_colleges():
     page = request.args.get("page", 1, type=int)
@@ -11,14 +13,29 @@ def list_colleges():
     filter_by = request.args.get("filterBy", "All", type=str)
     sort_by = request.args.get("sortBy", "College Code", type=str)
     sort_desc = request.args.get("sortDesc", "false").lower()
+    cursor = request.args.get("cursor", None, type=str)
+    pagination_mode = request.args.get("paginationMode", "offset", type=str).lower()
+    count_mode = request.args.get("countMode", "exact", type=str).lower()
+    fields = request.args.get("fields", None, type=str)
 
-    response, status = college_service.get_all_colleges(
-        page, limit, query, filter_by, sort_by, sort_desc
+    args = (
+        page, limit, query, filter_by, sort_by, sort_desc, cursor, pagination_mode, count_mode, fields
+    )
+    response, status = response_cache.get_or_load(
+        ("colleges", args), ("colleges",),
+        lambda: college_service.get_all_colleges(*args)
     )
     return jsonify(response), status
 
+def get_colleges_snapshot():
+    return snapshot_response(college_service.get_colleges_snapshot())
+
 def get_college(college_code):
-    response, status = college_service.get_college(college_code)
+    fields = request.args.get("fields", None, type=str)
+    response, status = response_cache.get_or_load(
+        ("college", college_code, fields), ("college-details", f"college:{college_code}"),
+        lambda: college_service.get_college(college_code, fields)
+    )
     return jsonify(response), status
 
 def create_college():
@@ -41,4 +58,19 @@ def update_college(college_code):
 
 def delete_college(college_code):
     response, status = college_service.delete_college(college_code)
+    return jsonify(response), status
+
+def preview_recode(college_code):
+    new_code = request.args.get("new_code", "", type=str).strip()
+    response, status = college_service.recodes.preview(college_code, new_code)
+    return jsonify(response), status
+
+def start_recode(college_code):
+    data = request.get_json() or {}
+    new_code = str(data.get("new_code") or "").strip()
+    response, status = college_service.recodes.start(college_code, new_code)
+    return jsonify(response), status
+
+def get_recode_job(job_id):
+    response, status = college_service.recodes.get_job(job_id)
     return jsonify(response), status
\ No newline at end of file
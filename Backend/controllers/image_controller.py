@@ -0,0 +1,31 @@
+import io
+from flask import request, jsonify, send_file
+from services.image_service import IMAGE_MAX_BYTES, ImageService
+
+image_service = ImageService()
+IMAGE_MAX_AGE = 31536000
+
+def upload_image():
+    upload = request.files.get("file")
+    if upload is None:
+        return jsonify({"error": "file is required"}), 400
+
+    # One byte past the limit is enough to tell the upload is too large.
+    response, status = image_service.store(upload.stream.read(IMAGE_MAX_BYTES + 1))
+    return jsonify(response), status
+
+def get_image(image_hash, extension, size=None):
+    image, status = image_service.get_image(image_hash, size, extension)
+    if status != 200:
+        return jsonify(image), status
+
+    response = send_file(
+        image["path"] or io.BytesIO(image["data"]),
+        mimetype=image["content_type"],
+        etag=image["etag"],
+        conditional=True,
+        max_age=IMAGE_MAX_AGE
+    )
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
\ No newline at end of file
@@ -0,0 +1,27 @@
+from flask import jsonify
+from utils.response_cache import get_response_cache
+from db import get_pool
+from queries.builder import get_query_cache
+from utils.login_throttle import get_login_throttle
+from utils.password_hasher import get_password_hasher
+
+response_cache = get_response_cache()
+pool = get_pool()
+query_cache = get_query_cache()
+password_hasher = get_password_hasher()
+login_throttle = get_login_throttle()
+
+def cache_stats():
+    return jsonify({
+        "response_cache": response_cache.stats(),
+        "query_cache": query_cache.stats()
+    }), 200
+
+def pool_stats():
+    return jsonify({"pool": pool.stats()}), 200
+
+def auth_stats():
+    return jsonify({
+        "password_hasher": password_hasher.stats(),
+        "login_throttle": login_throttle.stats()
+    }), 200
@@ -1,8 +1,10 @@
 from flask import request, jsonify
-from services.program_service import ProgramService
+from utils.snapshot_cache import snapshot_response
+from utils.response_cache import get_response_cache
+from services.program_service import REQUIRED_FIELDS, ProgramService
 
 program_service = ProgramService()
-REQUIRED_FIELDS = ["program_code", "program_name", "college_code"]
+response_cache = get_response_cache()
 
 def list_programs():
     page = request.args.get("page", 1, type=int)
@@ -11,14 +13,29 @@ def list_programs():
     filter_by = request.args.get("filterBy", "All", type=str)
     sort_by = request.args.get("sortBy", "Program Code", type=str)
     sort_desc = request.args.get("sortDesc", "false").lower()
+    cursor = request.args.get("cursor", None, type=str)
+    pagination_mode = request.args.get("paginationMode", "offset", type=str).lower()
+    count_mode = request.args.get("countMode", "exact", type=str).lower()
+    fields = request.args.get("fields", None, type=str)
 
-    response, status = program_service.get_all_programs(
-        page, limit, query, filter_by, sort_by, sort_desc
+    args = (
+        page, limit, query, filter_by, sort_by, sort_desc, cursor, pagination_mode, count_mode, fields
+    )
+    response, status = response_cache.get_or_load(
+        ("programs", args), ("programs",),
+        lambda: program_service.get_all_programs(*args)
     )
     return jsonify(response), status
 
+def get_programs_snapshot():
+    return snapshot_response(program_service.get_programs_snapshot())
+
 def get_program(program_code):
-    response, status = program_service.get_program(program_code)
+    fields = request.args.get("fields", None, type=str)
+    response, status = response_cache.get_or_load(
+        ("program", program_code, fields), ("program-details", f"program:{program_code}"),
+        lambda: program_service.get_program(program_code, fields)
+    )
     return jsonify(response), status
 
 def create_program():
@@ -41,4 +58,19 @@ def update_program(program_code):
 
 def delete_program(program_code):
     response, status = program_service.delete_program(program_code)
+    return jsonify(response), status
+
+def preview_recode(program_code):
+    new_code = request.args.get("new_code", "", type=str).strip()
+    response, status = program_service.recodes.preview(program_code, new_code)
+    return jsonify(response), status
+
+def start_recode(program_code):
+    data = request.get_json() or {}
+    new_code = str(data.get("new_code") or "").strip()
+    response, status = program_service.recodes.start(program_code, new_code)
+    return jsonify(response), status
+
+def get_recode_job(job_id):
+    response, status = program_service.recodes.get_job(job_id)
     return jsonify(response), status
\ No newline at end of file
@@ -0,0 +1,7 @@
+from utils.snapshot_cache import snapshot_response
+from services.stats_service import StatsService
+
+stats_service = StatsService()
+
+def get_enrollment_stats():
+    return snapshot_response(stats_service.get_enrollment_stats())
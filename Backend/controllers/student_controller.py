@@ -1,8 +1,10 @@
-from flask import request, jsonify
-from services.student_service import StudentService
+import io
+from flask import Response, request, jsonify, stream_with_context
+from utils.response_cache import get_response_cache
+from services.student_service import EXPORT_MIMETYPES, IMPORT_FORMATS, IMPORT_MODES, REQUIRED_FIELDS, StudentService
 
 student_service = StudentService()
-REQUIRED_FIELDS = ["student_id", "first_name", "last_name", "year_level", "gender", "program_code"]
+response_cache = get_response_cache()
 
 def list_students():
     page = request.args.get("page", 1, type=int)
@@ -11,24 +13,49 @@ def list_students():
     filter_by = request.args.get("filterBy", "All", type=str)
     sort_by = request.args.get("sortBy", "ID", type=str)
     sort_desc = request.args.get("sortDesc", "false").lower()
+    cursor = request.args.get("cursor", None, type=str)
+    pagination_mode = request.args.get("paginationMode", "offset", type=str).lower()
+    count_mode = request.args.get("countMode", "exact", type=str).lower()
+    fields = request.args.get("fields", None, type=str)
     
     program_filter = request.args.get("program", "", type=str)
     year_filter = request.args.get("year", "", type=str)
     gender_filter = request.args.get("gender", "", type=str)
     college_filter = request.args.get("college", "", type=str)
 
-
-    print(f"DEBUG: Filtering by Year: '{year_filter}', Program: '{program_filter}', Gender: '{gender_filter}', College: '{college_filter}'")
-    
-    response, status = student_service.get_all_students(
-        page, limit, query, filter_by, sort_by, sort_desc, 
-        program_filter, year_filter, gender_filter, college_filter
+    args = (
+        page, limit, query, filter_by, sort_by, sort_desc,
+        program_filter, year_filter, gender_filter, college_filter,
+        cursor, pagination_mode, count_mode, fields
+    )
+    response, status = response_cache.get_or_load(
+        ("students", args), ("students",),
+        lambda: student_service.get_all_students(*args)
     )
     
     return jsonify(response), status
 
+def student_facets():
+    query = request.args.get("query", "", type=str)
+    filter_by = request.args.get("filterBy", "All", type=str)
+    program_filter = request.args.get("program", "", type=str)
+    year_filter = request.args.get("year", "", type=str)
+    gender_filter = request.args.get("gender", "", type=str)
+    college_filter = request.args.get("college", "", type=str)
+
+    args = (query, filter_by, program_filter, year_filter, gender_filter, college_filter)
+    response, status = response_cache.get_or_load(
+        ("student-facets", args), ("students",),
+        lambda: student_service.get_student_facets(*args)
+    )
+    return jsonify(response), status
+
 def get_student(student_id):
-    response, status = student_service.get_student(student_id)
+    fields = request.args.get("fields", None, type=str)
+    response, status = response_cache.get_or_load(
+        ("student", student_id, fields), ("student-details", f"student:{student_id}"),
+        lambda: student_service.get_student(student_id, fields)
+    )
     return jsonify(response), status
 
 def create_student():
@@ -40,6 +67,45 @@ def create_student():
     response, status = student_service.create_student(data)
     return jsonify(response), status
 
+def import_students():
+    fmt = request.args.get("format", "", type=str).lower() or IMPORT_FORMATS.get(request.mimetype)
+    mode = request.args.get("mode", "atomic", type=str).lower()
+
+    if fmt not in IMPORT_FORMATS.values():
+        return jsonify({"error": "Upload must be CSV (text/csv) or NDJSON (application/x-ndjson)"}), 400
+    if mode not in IMPORT_MODES:
+        return jsonify({"error": "mode must be 'atomic' or 'skip'"}), 400
+
+    # Read the raw body as it arrives instead of buffering the whole upload.
+    stream = io.TextIOWrapper(request.stream, encoding="utf-8-sig", newline="")
+    response, status = student_service.import_students(stream, fmt, mode, REQUIRED_FIELDS)
+    return jsonify(response), status
+
+def export_students():
+    fmt = request.args.get("format", "csv", type=str).lower()
+    if fmt not in EXPORT_MIMETYPES:
+        return jsonify({"error": "format must be 'csv' or 'ndjson'"}), 400
+
+    query = request.args.get("query", "", type=str)
+    filter_by = request.args.get("filterBy", "All", type=str)
+    sort_by = request.args.get("sortBy", "ID", type=str)
+    sort_desc = request.args.get("sortDesc", "false").lower()
+    program_filter = request.args.get("program", "", type=str)
+    year_filter = request.args.get("year", "", type=str)
+    gender_filter = request.args.get("gender", "", type=str)
+    college_filter = request.args.get("college", "", type=str)
+
+    chunks, status = student_service.export_students(
+        fmt, query, filter_by, sort_by, sort_desc,
+        program_filter, year_filter, gender_filter, college_filter
+    )
+    return Response(
+        stream_with_context(chunks),
+        status=status,
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={"Content-Disposition": f"attachment; filename=students.{fmt}"}
+    )
+
 def update_student(student_id):
     data = request.get_json() or {}
     for f in REQUIRED_FIELDS:
@@ -65,4 +131,19 @@ def update_student_image(student_id):
 
 def delete_student_image(student_id):
     response, status = student_service.remove_student_image(student_id)
-    return jsonify(response), status
\ No newline at end of file
+    return jsonify(response), status
+
+def promote_students():
+    data = request.get_json() or {}
+    response, status = student_service.promote_students(data)
+    return jsonify(response), status
+
+def reassign_students():
+    data = request.get_json() or {}
+    response, status = student_service.reassign_students(data)
+    return jsonify(response), status
+
+def delete_students():
+    data = request.get_json() or {}
+    response, status = student_service.delete_students(data)
+    return jsonify(response), status
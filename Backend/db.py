@@ -1,18 +1,258 @@
+import logging
 import os
+import time
+import weakref
 from dotenv import load_dotenv
-from psycopg_pool import ConnectionPool
+from psycopg import AsyncCursor, AsyncServerCursor, Cursor, ServerCursor
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+from queries.builder import ROW_COLUMN, TOTAL_COLUMN
+from utils.metrics import Histogram
+from utils.tracing import record, record_query
 
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL environment variable is not set")
 
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "4"))
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", str(POOL_MIN_SIZE)))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+POOL_MAX_WAITING = int(os.getenv("DB_POOL_MAX_WAITING", "0"))
+POOL_MAX_IDLE = float(os.getenv("DB_POOL_MAX_IDLE", "600"))
+POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME", "3600"))
+# Connections idle for longer than this are pinged before being handed out;
+# 0 checks every checkout, a negative value disables the check.
+POOL_CHECK_AFTER = float(os.getenv("DB_POOL_CHECK_AFTER", "30"))
+POOL_SLOW_ACQUIRE_MS = float(os.getenv("DB_POOL_SLOW_ACQUIRE_MS", "100"))
+STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+# Transaction-mode poolers such as PgBouncer cannot keep server-side prepared
+# statements; set DB_PREPARE_THRESHOLD=none when connecting through one.
+_prepare_threshold = os.getenv("DB_PREPARE_THRESHOLD", "5").strip().lower()
+PREPARE_THRESHOLD = None if _prepare_threshold in ("", "none", "off") else int(_prepare_threshold)
+PREPARED_MAX = int(os.getenv("DB_PREPARED_MAX", "100"))
+
+
+class PoolInstrumentation:
+    def _init_instrumentation(self):
+        self.wait_ms = Histogram()
+        self._returned_at = weakref.WeakKeyDictionary()
+
+    def _record_wait(self, start):
+        waited_ms = (time.perf_counter() - start) * 1000
+        self.wait_ms.observe(waited_ms)
+        record("pool", waited_ms)
+        if waited_ms >= POOL_SLOW_ACQUIRE_MS:
+            stats = self.get_stats()
+            logger.warning(
+                "Waited %.1f ms for a database connection (size=%s, available=%s, waiting=%s)",
+                waited_ms, stats.get("pool_size"), stats.get("pool_available"), stats.get("requests_waiting")
+            )
+
+    def _record_return(self, conn):
+        self._returned_at[conn] = time.monotonic()
+
+    def _needs_check(self, conn):
+        if POOL_CHECK_AFTER < 0:
+            return False
+        returned_at = self._returned_at.get(conn)
+        return returned_at is None or time.monotonic() - returned_at >= POOL_CHECK_AFTER
+
+    def stats(self):
+        stats = self.get_stats()
+        size = stats.get("pool_size", 0)
+        available = stats.get("pool_available", 0)
+        return {
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "size": size,
+            "available": available,
+            "in_use": size - available,
+            "waiting": stats.get("requests_waiting", 0),
+            "requests": stats.get("requests_num", 0),
+            "requests_queued": stats.get("requests_queued", 0),
+            "requests_errors": stats.get("requests_errors", 0),
+            "connections_opened": stats.get("connections_num", 0),
+            "connections_errors": stats.get("connections_errors", 0),
+            "connections_lost": stats.get("connections_lost", 0),
+            "returns_bad": stats.get("returns_bad", 0),
+            "wait_ms": self.wait_ms.snapshot(),
+        }
+
+
+class InstrumentedConnectionPool(PoolInstrumentation, ConnectionPool):
+    def __init__(self, *args, **kwargs):
+        self._init_instrumentation()
+        super().__init__(*args, check=self._check_idle_connection, **kwargs)
+
+    def getconn(self, timeout=None):
+        start = time.perf_counter()
+        conn = super().getconn(timeout=timeout)
+        self._record_wait(start)
+        return conn
+
+    def putconn(self, conn):
+        self._record_return(conn)
+        super().putconn(conn)
+
+    def _check_idle_connection(self, conn):
+        if self._needs_check(conn):
+            ConnectionPool.check_connection(conn)
+
+
+class InstrumentedAsyncConnectionPool(PoolInstrumentation, AsyncConnectionPool):
+    def __init__(self, *args, **kwargs):
+        self._init_instrumentation()
+        super().__init__(*args, check=self._check_idle_connection, **kwargs)
+
+    async def getconn(self, timeout=None):
+        start = time.perf_counter()
+        conn = await super().getconn(timeout=timeout)
+        self._record_wait(start)
+        return conn
+
+    async def putconn(self, conn):
+        self._record_return(conn)
+        await super().putconn(conn)
+
+    async def _check_idle_connection(self, conn):
+        if self._needs_check(conn):
+            await AsyncConnectionPool.check_connection(conn)
+
+
+class TracingCursor(Cursor):
+    def execute(self, query, params=None, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().execute(query, params, **kwargs)
+        finally:
+            record_query(query, params, (time.perf_counter() - start) * 1000)
+
+
+class TracingServerCursor(ServerCursor):
+    def execute(self, query, params=None, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().execute(query, params, **kwargs)
+        finally:
+            record_query(query, params, (time.perf_counter() - start) * 1000)
+
 
-pool = ConnectionPool(conninfo=DATABASE_URL)
+class TracingAsyncCursor(AsyncCursor):
+    async def execute(self, query, params=None, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await super().execute(query, params, **kwargs)
+        finally:
+            record_query(query, params, (time.perf_counter() - start) * 1000)
+
+
+class TracingAsyncServerCursor(AsyncServerCursor):
+    async def execute(self, query, params=None, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await super().execute(query, params, **kwargs)
+        finally:
+            record_query(query, params, (time.perf_counter() - start) * 1000)
+
+
+def configure_connection(conn):
+    conn.cursor_factory = TracingCursor
+    conn.server_cursor_factory = TracingServerCursor
+    conn.prepare_threshold = PREPARE_THRESHOLD
+    conn.prepared_max = PREPARED_MAX
+    if STATEMENT_TIMEOUT_MS > 0:
+        conn.execute(f"SET statement_timeout = {STATEMENT_TIMEOUT_MS}")
+        conn.commit()
+
+
+pool = InstrumentedConnectionPool(
+    conninfo=DATABASE_URL,
+    min_size=POOL_MIN_SIZE,
+    max_size=POOL_MAX_SIZE,
+    timeout=POOL_TIMEOUT,
+    max_waiting=POOL_MAX_WAITING,
+    max_idle=POOL_MAX_IDLE,
+    max_lifetime=POOL_MAX_LIFETIME,
+    configure=configure_connection,
+    name="ssis",
+    open=False
+)
+_pool_opened = False
 
 
 def get_pool():
-    return pool
\ No newline at end of file
+    # Opened on first use, so the ASGI app, which only talks to the async
+    # pool, never holds idle sync connections. open() is safe to repeat.
+    global _pool_opened
+    if not _pool_opened:
+        pool.open()
+        _pool_opened = True
+    return pool
+
+
+async def configure_async_connection(conn):
+    conn.cursor_factory = TracingAsyncCursor
+    conn.server_cursor_factory = TracingAsyncServerCursor
+    conn.prepare_threshold = PREPARE_THRESHOLD
+    conn.prepared_max = PREPARED_MAX
+    if STATEMENT_TIMEOUT_MS > 0:
+        await conn.execute(f"SET statement_timeout = {STATEMENT_TIMEOUT_MS}")
+        await conn.commit()
+
+
+# The async pool needs a running event loop, so the ASGI app opens it on
+# startup; the Flask app never touches it.
+async_pool = InstrumentedAsyncConnectionPool(
+    conninfo=DATABASE_URL,
+    min_size=POOL_MIN_SIZE,
+    max_size=POOL_MAX_SIZE,
+    timeout=POOL_TIMEOUT,
+    max_waiting=POOL_MAX_WAITING,
+    max_idle=POOL_MAX_IDLE,
+    max_lifetime=POOL_MAX_LIFETIME,
+    configure=configure_async_connection,
+    name="ssis-async",
+    open=False
+)
+
+
+def get_async_pool():
+    return async_pool
+
+
+def split_total(rows):
+    total_records = rows[0][TOTAL_COLUMN]
+    for row in rows:
+        del row[TOTAL_COLUMN]
+        del row[ROW_COLUMN]
+
+    if len(rows) == 1 and all(value is None for value in rows[0].values()):
+        rows = []
+
+    return rows, total_records
+
+
+def fetch_page(conn, query, params, with_total, prepare=None):
+    with conn.cursor(row_factory=dict_row) as cur:
+        cur.execute(query, params, prepare=prepare)
+        rows = cur.fetchall()
+
+    if not with_total:
+        return rows, None
+    return split_total(rows)
+
+
+async def fetch_page_async(conn, query, params, with_total, prepare=None):
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(query, params, prepare=prepare)
+        rows = await cur.fetchall()
+
+    if not with_total:
+        return rows, None
+    return split_total(rows)
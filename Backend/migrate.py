@@ -0,0 +1,49 @@
+import os
+import psycopg
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+
+MIGRATIONS_DIR = os.path.join(os.path.abspath(os.path.dirname(__file__)), "migrations")
+
+CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version TEXT PRIMARY KEY,
+        applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+"""
+
+
+def pending_migrations(applied):
+    files = sorted(f for f in os.listdir(MIGRATIONS_DIR) if f.endswith(".sql"))
+    return [f for f in files if f not in applied]
+
+
+def migrate(database_url):
+    with psycopg.connect(database_url) as conn:
+        with conn.cursor() as cur:
+            cur.execute(CREATE_TABLE)
+            cur.execute("SELECT version FROM schema_migrations")
+            applied = {row[0] for row in cur.fetchall()}
+        conn.commit()
+
+        for filename in pending_migrations(applied):
+            with open(os.path.join(MIGRATIONS_DIR, filename)) as f:
+                sql = f.read()
+
+            with conn.transaction():
+                with conn.cursor() as cur:
+                    cur.execute(sql)
+                    cur.execute(
+                        "INSERT INTO schema_migrations (version) VALUES (%s)", (filename,)
+                    )
+            print(f"Applied {filename}")
+
+
+if __name__ == "__main__":
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL environment variable is not set")
+    migrate(database_url)
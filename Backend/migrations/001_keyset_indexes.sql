@@ -0,0 +1,14 @@
+-- Composite (sort column, primary key) indexes backing keyset pagination.
+-- Each list sort option can seek straight to the cursor position instead of
+-- scanning past every earlier row.
+
+CREATE INDEX IF NOT EXISTS idx_students_first_name_id ON students (first_name, student_id);
+CREATE INDEX IF NOT EXISTS idx_students_last_name_id ON students (last_name, student_id);
+CREATE INDEX IF NOT EXISTS idx_students_year_level_id ON students (year_level, student_id);
+CREATE INDEX IF NOT EXISTS idx_students_gender_id ON students (gender, student_id);
+CREATE INDEX IF NOT EXISTS idx_students_program_code_id ON students (program_code, student_id);
+
+CREATE INDEX IF NOT EXISTS idx_programs_program_name_code ON programs (program_name, program_code);
+CREATE INDEX IF NOT EXISTS idx_programs_college_code_code ON programs (college_code, program_code);
+
+CREATE INDEX IF NOT EXISTS idx_colleges_college_name_code ON colleges (college_name, college_code);
@@ -0,0 +1,84 @@
+-- Maintained search documents for the "All" search filter.
+-- Each row keeps a lower-cased concatenation of its searchable fields, backed
+-- by a trigram GIN index so substring searches (ILIKE '%term%') and
+-- word_similarity() ranking no longer need a sequential scan.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Colleges and programs only search their own columns, so a generated column
+-- keeps the document in sync without triggers.
+ALTER TABLE colleges
+    ADD COLUMN IF NOT EXISTS search_text TEXT
+    GENERATED ALWAYS AS (lower(college_code || ' ' || college_name)) STORED;
+
+ALTER TABLE programs
+    ADD COLUMN IF NOT EXISTS search_text TEXT
+    GENERATED ALWAYS AS (
+        lower(program_code || ' ' || program_name || ' ' || coalesce(college_code, ''))
+    ) STORED;
+
+-- Students also match on their program's college, which lives in another
+-- table, so the document is maintained by triggers on both tables.
+ALTER TABLE students ADD COLUMN IF NOT EXISTS search_text TEXT;
+
+CREATE OR REPLACE FUNCTION students_search_text(
+    p_student_id TEXT, p_first_name TEXT, p_last_name TEXT,
+    p_year_level TEXT, p_gender TEXT, p_program_code TEXT
+) RETURNS TEXT AS $$
+    SELECT lower(concat_ws(' ',
+        p_student_id, p_first_name, p_last_name, p_year_level, p_gender, p_program_code,
+        (SELECT college_code FROM programs WHERE program_code = p_program_code)
+    ));
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION students_refresh_search_text() RETURNS trigger AS $$
+BEGIN
+    NEW.search_text := students_search_text(
+        NEW.student_id, NEW.first_name, NEW.last_name,
+        NEW.year_level::text, NEW.gender, NEW.program_code
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS students_search_text_trg ON students;
+CREATE TRIGGER students_search_text_trg
+    BEFORE INSERT OR UPDATE OF student_id, first_name, last_name, year_level, gender, program_code
+    ON students
+    FOR EACH ROW EXECUTE FUNCTION students_refresh_search_text();
+
+CREATE OR REPLACE FUNCTION programs_refresh_student_search_text() RETURNS trigger AS $$
+BEGIN
+    -- Program code renames already cascade into students and fire their
+    -- trigger; only a college reassignment needs an explicit refresh.
+    UPDATE students
+    SET search_text = students_search_text(
+        student_id, first_name, last_name, year_level::text, gender, program_code
+    )
+    WHERE program_code = NEW.program_code;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS programs_student_search_text_trg ON programs;
+CREATE TRIGGER programs_student_search_text_trg
+    AFTER UPDATE OF college_code ON programs
+    FOR EACH ROW
+    WHEN (OLD.college_code IS DISTINCT FROM NEW.college_code)
+    EXECUTE FUNCTION programs_refresh_student_search_text();
+
+UPDATE students
+SET search_text = students_search_text(
+    student_id, first_name, last_name, year_level::text, gender, program_code
+);
+
+CREATE INDEX IF NOT EXISTS idx_students_search_text_trgm ON students USING gin (search_text gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_programs_search_text_trgm ON programs USING gin (search_text gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_colleges_search_text_trgm ON colleges USING gin (search_text gin_trgm_ops);
+
+-- Single-column searches hit the text columns directly.
+CREATE INDEX IF NOT EXISTS idx_students_student_id_trgm ON students USING gin (student_id gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_students_first_name_trgm ON students USING gin (first_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_students_last_name_trgm ON students USING gin (last_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_programs_program_name_trgm ON programs USING gin (program_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_colleges_college_name_trgm ON colleges USING gin (college_name gin_trgm_ops);
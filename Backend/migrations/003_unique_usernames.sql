@@ -0,0 +1,16 @@
+-- Registration looks the username up before hashing, but two sign-ups for
+-- the same name can both pass that check, so the insert still relies on
+-- INSERT ... ON CONFLICT DO NOTHING and the database must enforce unique
+-- usernames.
+--
+-- Databases created before this index may already hold duplicates, which
+-- would make it fail to build. The oldest account keeps each name; later
+-- ones are renamed to "<name>#<id>" rather than deleted, so their owners
+-- can still be identified and their accounts kept.
+UPDATE users AS u
+SET username = left(u.username, 100 - length('#' || u.id)) || '#' || u.id
+WHERE EXISTS (
+    SELECT 1 FROM users AS o WHERE o.username = u.username AND o.id < u.id
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_username_unique ON users (username);
@@ -0,0 +1,90 @@
+-- Pre-aggregated enrollment counts for the statistics API.
+-- enrollment_stats keeps one row per (program, year level, gender) with the
+-- number of students in it. Per-college, per-program, per-year and per-gender
+-- totals are rolled up from these few hundred rows at read time, so program
+-- and college changes (including college reassignment) need no refresh.
+
+CREATE TABLE IF NOT EXISTS enrollment_stats (
+    program_code VARCHAR,
+    year_level INTEGER NOT NULL,
+    gender VARCHAR NOT NULL,
+    student_count BIGINT NOT NULL
+);
+
+-- Students without a program are counted under a NULL program_code, which a
+-- plain unique constraint would treat as distinct.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_enrollment_stats_key
+    ON enrollment_stats ((coalesce(program_code, '')), year_level, gender);
+
+-- Statement-level triggers see every row a statement touched through its
+-- transition tables, so a COPY-backed import or a batch update applies one
+-- grouped delta instead of one upsert per student. Program renames and
+-- deletions cascade into students and arrive here as updates. Deltas are
+-- upserted in key order so concurrent writers never deadlock on the shared
+-- counter rows.
+CREATE OR REPLACE FUNCTION enrollment_stats_refresh() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO enrollment_stats AS e (program_code, year_level, gender, student_count)
+        SELECT program_code, year_level, gender, SUM(delta)
+        FROM (SELECT program_code, year_level, gender, 1 AS delta FROM new_rows) AS d
+        GROUP BY program_code, year_level, gender
+        HAVING SUM(delta) <> 0
+        ORDER BY coalesce(program_code, ''), year_level, gender
+        ON CONFLICT ((coalesce(program_code, '')), year_level, gender)
+        DO UPDATE SET student_count = e.student_count + EXCLUDED.student_count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO enrollment_stats AS e (program_code, year_level, gender, student_count)
+        SELECT program_code, year_level, gender, SUM(delta)
+        FROM (SELECT program_code, year_level, gender, -1 AS delta FROM old_rows) AS d
+        GROUP BY program_code, year_level, gender
+        HAVING SUM(delta) <> 0
+        ORDER BY coalesce(program_code, ''), year_level, gender
+        ON CONFLICT ((coalesce(program_code, '')), year_level, gender)
+        DO UPDATE SET student_count = e.student_count + EXCLUDED.student_count;
+    ELSE
+        INSERT INTO enrollment_stats AS e (program_code, year_level, gender, student_count)
+        SELECT program_code, year_level, gender, SUM(delta)
+        FROM (
+            SELECT program_code, year_level, gender, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT program_code, year_level, gender, -1 AS delta FROM old_rows
+        ) AS d
+        GROUP BY program_code, year_level, gender
+        HAVING SUM(delta) <> 0
+        ORDER BY coalesce(program_code, ''), year_level, gender
+        ON CONFLICT ((coalesce(program_code, '')), year_level, gender)
+        DO UPDATE SET student_count = e.student_count + EXCLUDED.student_count;
+    END IF;
+
+    DELETE FROM enrollment_stats WHERE student_count = 0;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables need one trigger per event.
+DROP TRIGGER IF EXISTS enrollment_stats_insert_trg ON students;
+CREATE TRIGGER enrollment_stats_insert_trg
+    AFTER INSERT ON students
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION enrollment_stats_refresh();
+
+DROP TRIGGER IF EXISTS enrollment_stats_update_trg ON students;
+CREATE TRIGGER enrollment_stats_update_trg
+    AFTER UPDATE ON students
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION enrollment_stats_refresh();
+
+DROP TRIGGER IF EXISTS enrollment_stats_delete_trg ON students;
+CREATE TRIGGER enrollment_stats_delete_trg
+    AFTER DELETE ON students
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION enrollment_stats_refresh();
+
+-- Creating the triggers locks students against writes until this migration
+-- commits, so no change can slip between the seed and the triggers.
+TRUNCATE enrollment_stats;
+INSERT INTO enrollment_stats (program_code, year_level, gender, student_count)
+SELECT program_code, year_level, gender, COUNT(*)
+FROM students
+GROUP BY program_code, year_level, gender;
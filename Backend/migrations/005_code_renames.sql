@@ -0,0 +1,28 @@
+-- Progress records for batched college/program code renames.
+-- A rename copies the parent row under its new code, moves dependents over
+-- in short batches and finally deletes the old row. Each batch bumps
+-- `moved` in the same transaction that moves the rows, so the record is
+-- always exact and any worker can report on or resume the job.
+
+CREATE TABLE IF NOT EXISTS code_renames (
+    id BIGSERIAL PRIMARY KEY,
+    entity VARCHAR NOT NULL,
+    old_code VARCHAR NOT NULL,
+    new_code VARCHAR NOT NULL,
+    -- running, done, or failed (dependents moved back to old_code).
+    state VARCHAR NOT NULL DEFAULT 'running',
+    total INTEGER NOT NULL,
+    moved INTEGER NOT NULL DEFAULT 0,
+    batches INTEGER NOT NULL DEFAULT 0,
+    retries INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    started_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    finished_at TIMESTAMPTZ
+);
+
+-- At most one running rename may touch a given code, from either side.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_code_renames_running_old
+    ON code_renames (entity, old_code) WHERE state = 'running';
+CREATE UNIQUE INDEX IF NOT EXISTS idx_code_renames_running_new
+    ON code_renames (entity, new_code) WHERE state = 'running';
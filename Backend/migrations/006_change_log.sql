@@ -0,0 +1,172 @@
+-- Ordered log of student, program and college changes for delta sync.
+-- Statement-level triggers append one row per changed record in the same
+-- transaction as the write, so bulk imports, batch updates, cascades and
+-- code renames are all captured.
+--
+-- Readers page through the log by seq. A sequence value taken at write time
+-- would let a long transaction commit a lower seq after a reader has moved
+-- past it, so rows are written without one and numbered by a deferred
+-- trigger at commit, one committing transaction at a time. That makes seq
+-- order commit order and lets "changes since N" never skip a change.
+
+CREATE SEQUENCE IF NOT EXISTS change_log_seq;
+
+CREATE TABLE IF NOT EXISTS change_log (
+    id BIGSERIAL PRIMARY KEY,
+    -- NULL until the writing transaction commits.
+    seq BIGINT UNIQUE,
+    txid xid8 NOT NULL DEFAULT pg_current_xact_id(),
+    entity VARCHAR NOT NULL,
+    op VARCHAR NOT NULL,
+    record_key VARCHAR NOT NULL,
+    -- The record after the change; NULL for deletes.
+    data JSONB,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_change_log_unsealed ON change_log (txid) WHERE seq IS NULL;
+
+-- One row per transaction with unnumbered changes; its deferred trigger
+-- numbers them once at commit instead of once per change.
+CREATE TABLE IF NOT EXISTS change_log_pending (
+    txid xid8 PRIMARY KEY
+);
+
+-- Records are logged as the API returns them: without search documents,
+-- and students with their program's college.
+CREATE OR REPLACE FUNCTION change_log_data(p_entity TEXT, p_row JSONB) RETURNS JSONB AS $$
+    SELECT CASE
+        WHEN p_entity = 'student' THEN
+            (p_row - 'search_text') || jsonb_build_object(
+                'college_code',
+                (SELECT college_code FROM programs WHERE program_code = p_row ->> 'program_code')
+            )
+        ELSE p_row - 'search_text'
+    END;
+$$ LANGUAGE sql STABLE;
+
+-- TG_ARGV: entity name, key column.
+CREATE OR REPLACE FUNCTION change_log_capture() RETURNS trigger AS $$
+BEGIN
+    -- Statements that touched nothing still fire; keep them from taking
+    -- the commit lock.
+    IF TG_OP = 'DELETE' THEN
+        IF NOT EXISTS (SELECT 1 FROM old_rows) THEN
+            RETURN NULL;
+        END IF;
+    ELSIF NOT EXISTS (SELECT 1 FROM new_rows) THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO change_log (entity, op, record_key, data)
+        SELECT TG_ARGV[0], 'insert', to_jsonb(n) ->> TG_ARGV[1], change_log_data(TG_ARGV[0], to_jsonb(n))
+        FROM new_rows n;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO change_log (entity, op, record_key)
+        SELECT TG_ARGV[0], 'delete', to_jsonb(o) ->> TG_ARGV[1]
+        FROM old_rows o;
+    ELSE
+        -- A changed key retires the old one: log it as deleted before the
+        -- record is logged under its new key.
+        INSERT INTO change_log (entity, op, record_key)
+        SELECT TG_ARGV[0], 'delete', o.record_key
+        FROM (SELECT to_jsonb(o) ->> TG_ARGV[1] AS record_key FROM old_rows o) AS o
+        WHERE NOT EXISTS (
+            SELECT 1 FROM new_rows n WHERE to_jsonb(n) ->> TG_ARGV[1] = o.record_key
+        );
+
+        INSERT INTO change_log (entity, op, record_key, data)
+        SELECT TG_ARGV[0], 'update', to_jsonb(n) ->> TG_ARGV[1], change_log_data(TG_ARGV[0], to_jsonb(n))
+        FROM new_rows n;
+    END IF;
+
+    INSERT INTO change_log_pending (txid) VALUES (pg_current_xact_id()) ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Runs at commit. The advisory lock is held from here until the commit
+-- completes, so the next committer can only take higher numbers once these
+-- rows are visible.
+CREATE OR REPLACE FUNCTION change_log_seal() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('change_log'));
+
+    -- nextval() is evaluated after the sort, so changes keep their order
+    -- within the transaction.
+    UPDATE change_log c
+    SET seq = numbered.seq
+    FROM (
+        SELECT id, nextval('change_log_seq') AS seq
+        FROM change_log
+        WHERE txid = NEW.txid AND seq IS NULL
+        ORDER BY id
+    ) AS numbered
+    WHERE c.id = numbered.id;
+
+    DELETE FROM change_log_pending WHERE txid = NEW.txid;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS change_log_seal_trg ON change_log_pending;
+CREATE CONSTRAINT TRIGGER change_log_seal_trg
+    AFTER INSERT ON change_log_pending
+    DEFERRABLE INITIALLY DEFERRED
+    FOR EACH ROW EXECUTE FUNCTION change_log_seal();
+
+-- Transition tables need one trigger per event.
+DROP TRIGGER IF EXISTS change_log_insert_trg ON students;
+CREATE TRIGGER change_log_insert_trg
+    AFTER INSERT ON students
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION change_log_capture('student', 'student_id');
+
+DROP TRIGGER IF EXISTS change_log_update_trg ON students;
+CREATE TRIGGER change_log_update_trg
+    AFTER UPDATE ON students
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION change_log_capture('student', 'student_id');
+
+DROP TRIGGER IF EXISTS change_log_delete_trg ON students;
+CREATE TRIGGER change_log_delete_trg
+    AFTER DELETE ON students
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION change_log_capture('student', 'student_id');
+
+DROP TRIGGER IF EXISTS change_log_insert_trg ON programs;
+CREATE TRIGGER change_log_insert_trg
+    AFTER INSERT ON programs
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION change_log_capture('program', 'program_code');
+
+DROP TRIGGER IF EXISTS change_log_update_trg ON programs;
+CREATE TRIGGER change_log_update_trg
+    AFTER UPDATE ON programs
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION change_log_capture('program', 'program_code');
+
+DROP TRIGGER IF EXISTS change_log_delete_trg ON programs;
+CREATE TRIGGER change_log_delete_trg
+    AFTER DELETE ON programs
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION change_log_capture('program', 'program_code');
+
+DROP TRIGGER IF EXISTS change_log_insert_trg ON colleges;
+CREATE TRIGGER change_log_insert_trg
+    AFTER INSERT ON colleges
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION change_log_capture('college', 'college_code');
+
+DROP TRIGGER IF EXISTS change_log_update_trg ON colleges;
+CREATE TRIGGER change_log_update_trg
+    AFTER UPDATE ON colleges
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION change_log_capture('college', 'college_code');
+
+DROP TRIGGER IF EXISTS change_log_delete_trg ON colleges;
+CREATE TRIGGER change_log_delete_trg
+    AFTER DELETE ON colleges
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION change_log_capture('college', 'college_code');
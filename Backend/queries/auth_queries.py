@@ -8,5 +8,6 @@ class AuthQueries:
     INSERT_USER = """
         INSERT INTO users (username, password_hash) 
         VALUES (%s, %s) 
+        ON CONFLICT DO NOTHING
         RETURNING id
     """
\ No newline at end of file
@@ -0,0 +1,339 @@
+from collections import OrderedDict, namedtuple
+import os
+import re
+import threading
+from psycopg.types.numeric import Int8
+from utils.pagination import keyset_clause, keyset_params
+
+
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "256"))
+
+BuiltQuery = namedtuple("BuiltQuery", ["sql", "params", "with_total"])
+
+TOTAL_FACET = "total"
+TOTAL_COLUMN = "_total_records"
+ROW_COLUMN = "_page_row"
+
+
+def page_with_count_sql(data_query, count_query):
+    # The count drives a lateral join onto the page, so one statement (and
+    # one round trip) returns both. An empty page still yields the total
+    # as a single row whose page columns are all NULL.
+    #
+    # The join does not promise to keep the page's ORDER BY, so each row is
+    # numbered as it leaves the page query and the outer query sorts on
+    # that. The page can hold at most LIMIT rows, so the sort is cheap.
+    return (
+        f"SELECT page.*, total.count AS {TOTAL_COLUMN} FROM ({count_query}) AS total "
+        f"LEFT JOIN LATERAL (SELECT data.*, row_number() OVER () AS {ROW_COLUMN} FROM ({data_query}) AS data) AS page ON TRUE "
+        f"ORDER BY page.{ROW_COLUMN}"
+    )
+
+
+class CompiledQueryCache:
+    def __init__(self, max_entries=QUERY_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compile(self, shape, compile_fn):
+        with self._lock:
+            sql = self._entries.get(shape)
+            if sql is not None:
+                self._entries.move_to_end(shape)
+                self.hits += 1
+                return sql
+            self.misses += 1
+
+        sql = compile_fn()
+
+        with self._lock:
+            self._entries[shape] = sql
+            self._entries.move_to_end(shape)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return sql
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+compiled_queries = CompiledQueryCache()
+
+
+def get_query_cache():
+    return compiled_queries
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+class ListQuerySpec:
+    def __init__(self, name, table, columns, key_column, sort_columns, search_columns, search_document, filter_columns=None, joins=None, nullable_columns=()):
+        self.name = name
+        self.table = table
+        # Response field -> select expression, in default response order.
+        self.columns = columns
+        # Alias -> join clause. Only to-one joins belong here, since a join
+        # is left out of any query that does not reference its alias.
+        self.joins = joins or {}
+        self.source = " ".join((table, *self.joins.values()))
+        self.key_column = key_column
+        self.key_field = next(name for name, expr in columns.items() if expr == key_column)
+        # Every identifier that can reach the SQL text comes from these maps,
+        # so request values only ever travel as bound parameters.
+        self.sort_columns = sort_columns
+        # Sort expressions that can be NULL and need NULL-aware seeks.
+        self.nullable_columns = frozenset(nullable_columns)
+        self.search_columns = search_columns
+        self.search_document = search_document
+        self.filter_columns = filter_columns or {}
+        self.join_patterns = {alias: re.compile(rf"\b{alias}\.") for alias in self.joins}
+
+
+def _bind(value):
+    # psycopg picks int2/int4/int8 by magnitude and keys prepared statements
+    # on parameter types, so pin every integer to int8 to keep one shape.
+    if isinstance(value, int) and not isinstance(value, bool):
+        return Int8(value)
+    return value
+
+
+class ListQueryBuilder:
+    def __init__(self, spec, cache=None):
+        self.spec = spec
+        self.cache = cache or get_query_cache()
+
+    def _sort_expr(self, sort_column):
+        try:
+            return self.spec.sort_columns[sort_column]
+        except KeyError:
+            raise ValueError(f"Unknown sort column: {sort_column}")
+
+    def _predicates(self, search_term, filter_field, filters):
+        predicates = []
+        params = []
+
+        if search_term:
+            if filter_field == 'all':
+                predicates.append(f"{self.spec.search_document} ILIKE %s")
+                params.append(f"%{search_term}%")
+            else:
+                try:
+                    expr, kind = self.spec.search_columns[filter_field]
+                except KeyError:
+                    raise ValueError(f"Unknown search column: {filter_field}")
+                if kind == "int":
+                    # Compare the integer directly so the column's index stays usable.
+                    if search_term.strip().isdigit():
+                        predicates.append(f"{expr} = %s")
+                        params.append(int(search_term.strip()))
+                    else:
+                        predicates.append("FALSE")
+                else:
+                    predicates.append(f"{expr} ILIKE %s")
+                    params.append(f"%{search_term}%")
+
+        # Facets are applied in spec order, not argument order, so the same
+        # set of active filters always yields the same SQL text.
+        for name, expr in self.spec.filter_columns.items():
+            value = (filters or {}).get(name)
+            if value:
+                predicates.append(f"{expr} = %s")
+                params.append(value)
+
+        return tuple(predicates), params
+
+    def _order(self, search_term, sort_column, sort_dir):
+        key_expr = self.spec.key_column
+        if sort_column == 'relevance':
+            return f"word_similarity(%s, {self.spec.search_document}) DESC, {key_expr}", [search_term.lower()]
+
+        sort_expr = self._sort_expr(sort_column)
+        if sort_expr == key_expr:
+            return f"{key_expr} {sort_dir}", []
+        # The key breaks ties so offset pages never overlap.
+        return f"{sort_expr} {sort_dir}, {key_expr} {sort_dir}", []
+
+    def _compile(self, shape, compile_fn):
+        return self.cache.get_or_compile((self.spec.name,) + shape, compile_fn)
+
+    @staticmethod
+    def _check_dir(sort_dir):
+        if sort_dir not in ("ASC", "DESC"):
+            raise ValueError(f"Unknown sort direction: {sort_dir}")
+
+    @staticmethod
+    def _where(predicates):
+        return f" WHERE {' AND '.join(predicates)}" if predicates else ""
+
+    def _kind(self, field):
+        # Fields without a search column entry are text.
+        return self.spec.search_columns.get(field, (None, "text"))[1]
+
+    def cursor_kinds(self, sort_column):
+        # (sort kind, key kind, nullable) for decode_cursor.
+        nullable = self.spec.sort_columns.get(sort_column) in self.spec.nullable_columns
+        return self._kind(sort_column), self._kind(self.spec.key_field), nullable
+
+    def fields(self, requested):
+        # Parses a comma-separated fields= value into a tuple in spec order,
+        # so equivalent requests share one SQL shape. None selects everything.
+        if not requested:
+            return None
+        names = {name.strip() for name in requested.split(",") if name.strip()}
+        unknown = sorted(names - self.spec.columns.keys())
+        if unknown:
+            raise InvalidFields(f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(self.spec.columns)}")
+        names.add(self.spec.key_field)
+        return tuple(name for name in self.spec.columns if name in names)
+
+    def _select(self, fields, *required):
+        names = self.spec.columns if fields is None else fields + tuple(n for n in required if n not in fields)
+        exprs = []
+        for name in names:
+            expr = self.spec.columns[name]
+            exprs.append(expr if expr.rsplit(".", 1)[-1] == name else f"{expr} AS {name}")
+        return ", ".join(exprs)
+
+    def _from(self, *fragments):
+        text = " ".join(fragments)
+        joins = [clause for alias, clause in self.spec.joins.items() if self.spec.join_patterns[alias].search(text)]
+        return " ".join((self.spec.table, *joins))
+
+    def page(self, search_term, filter_field, sort_column, sort_dir, limit, offset, filters=None, include_count=True, fields=None):
+        predicates, params = self._predicates(search_term, filter_field, filters)
+        self._check_dir(sort_dir)
+        order_by, order_params = self._order(search_term, sort_column, sort_dir)
+
+        def compile_sql():
+            where = self._where(predicates)
+            select = self._select(fields)
+            data_sql = f"SELECT {select} FROM {self._from(select, where, order_by)}{where} ORDER BY {order_by} LIMIT %s OFFSET %s"
+            if not include_count:
+                return data_sql
+            return page_with_count_sql(data_sql, f"SELECT COUNT(*) AS count FROM {self._from(where)}{where}")
+
+        sql = self._compile(("page", predicates, order_by, include_count, fields), compile_sql)
+        data_params = params + order_params + [limit, offset]
+        if include_count:
+            data_params = params + data_params
+        return BuiltQuery(sql, [_bind(p) for p in data_params], include_count)
+
+    def keyset(self, search_term, filter_field, sort_column, sort_dir, limit, cursor_values=None, direction="next", filters=None, include_count=True, fields=None):
+        predicates, params = self._predicates(search_term, filter_field, filters)
+        self._check_dir(sort_dir)
+        sort_expr = self._sort_expr(sort_column)
+        key_expr = self.spec.key_column
+        has_cursor = cursor_values is not None
+        nullable = sort_expr in self.spec.nullable_columns
+        null_cursor = nullable and has_cursor and cursor_values[0] is None
+
+        def compile_sql():
+            seek_clause, order_by = keyset_clause(sort_expr, key_expr, sort_dir, direction, nullable, null_cursor)
+            seek = predicates + (seek_clause,) if has_cursor else predicates
+            where = self._where(seek)
+            # The next cursor is read from the sort field of the last row.
+            select = self._select(fields, sort_column)
+            data_sql = f"SELECT {select} FROM {self._from(select, where, order_by)}{where} ORDER BY {order_by} LIMIT %s"
+            if not include_count:
+                return data_sql
+            count_where = self._where(predicates)
+            return page_with_count_sql(data_sql, f"SELECT COUNT(*) AS count FROM {self._from(count_where)}{count_where}")
+
+        sql = self._compile(("keyset", predicates, sort_expr, sort_dir, direction, has_cursor, null_cursor, include_count, fields), compile_sql)
+
+        data_params = list(params)
+        if has_cursor:
+            data_params.extend(keyset_params(sort_expr, key_expr, cursor_values, null_cursor))
+        # One extra row tells the caller whether another page exists.
+        data_params.append(limit + 1)
+        if include_count:
+            data_params = params + data_params
+        return BuiltQuery(sql, [_bind(p) for p in data_params], include_count)
+
+    def stream(self, search_term, filter_field, sort_column, sort_dir, filters=None):
+        predicates, params = self._predicates(search_term, filter_field, filters)
+        self._check_dir(sort_dir)
+        order_by, order_params = self._order(search_term, sort_column, sort_dir)
+
+        def compile_sql():
+            where = self._where(predicates)
+            select = self._select(None)
+            return f"SELECT {select} FROM {self._from(select, where, order_by)}{where} ORDER BY {order_by}"
+
+        sql = self._compile(("stream", predicates, order_by), compile_sql)
+        return BuiltQuery(sql, [_bind(p) for p in params + order_params], False)
+
+    def explain(self, search_term, filter_field, filters=None):
+        predicates, params = self._predicates(search_term, filter_field, filters)
+        if not predicates:
+            return None
+
+        def compile_sql():
+            where = self._where(predicates)
+            return f"EXPLAIN (FORMAT JSON) SELECT {self.spec.key_column} FROM {self._from(where)}{where}"
+
+        sql = self._compile(("explain", predicates), compile_sql)
+        return BuiltQuery(sql, [_bind(p) for p in params], False)
+
+    def keys(self, search_term, filter_field, filters=None):
+        predicates, params = self._predicates(search_term, filter_field, filters)
+
+        def compile_sql():
+            where = self._where(predicates)
+            return f"SELECT {self.spec.key_column} FROM {self._from(where)}{where}"
+
+        sql = self._compile(("keys", predicates), compile_sql)
+        return BuiltQuery(sql, [_bind(p) for p in params], False)
+
+    def lookup(self, key, fields):
+        def compile_sql():
+            select = self._select(fields)
+            return f"SELECT {select} FROM {self._from(select)} WHERE {self.spec.key_column} = %s"
+
+        sql = self._compile(("lookup", fields), compile_sql)
+        return BuiltQuery(sql, [_bind(key)], False)
+
+    def facets(self, search_term, filter_field, filters=None):
+        predicates, params = self._predicates(search_term, filter_field, None)
+        active = [
+            (name, expr, filters[name])
+            for name, expr in self.spec.filter_columns.items()
+            if (filters or {}).get(name)
+        ]
+
+        def compile_sql():
+            # Each row fans out into one (facet, value) pair per facet. A pair
+            # counts when the row passes every active filter except the
+            # facet's own, so each option shows what picking it would return.
+            facet_rows = []
+            for name, expr in self.spec.filter_columns.items():
+                others = [f"{e} = %s" for n, e, _ in active if n != name]
+                facet_rows.append(f"('{name}', ({expr})::text, {' AND '.join(others) or 'TRUE'})")
+            matches_all = [f"{e} = %s" for _, e, _ in active]
+            facet_rows.append(f"('{TOTAL_FACET}', NULL, {' AND '.join(matches_all) or 'TRUE'})")
+
+            return (
+                f"SELECT f.facet, f.value, COUNT(*) AS count FROM {self.spec.source} "
+                f"CROSS JOIN LATERAL (VALUES {', '.join(facet_rows)}) AS f(facet, value, included)"
+                f"{self._where(predicates + ('f.included',))} "
+                "GROUP BY f.facet, f.value ORDER BY f.facet, f.value"
+            )
+
+        sql = self._compile(("facets", predicates, tuple(name for name, _, _ in active)), compile_sql)
+
+        facet_params = []
+        for name in self.spec.filter_columns:
+            facet_params.extend(value for n, _, value in active if n != name)
+        facet_params.extend(value for _, _, value in active)
+        return BuiltQuery(sql, [_bind(p) for p in facet_params + params], False)
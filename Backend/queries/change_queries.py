@@ -0,0 +1,14 @@
+class ChangeQueries:
+    # change_log is appended to by triggers on students, programs and
+    # colleges and numbered at commit (migrations/006_change_log.sql). Every
+    # seq up to the current maximum is therefore already visible, so pages
+    # are bounded by it and a client resuming from it misses nothing.
+    BOUNDS = "SELECT coalesce(min(seq), 1) AS oldest, coalesce(max(seq), 0) AS latest FROM change_log"
+
+    CHANGES_SINCE = """
+        SELECT seq, entity, op, record_key AS key, data, changed_at
+        FROM change_log
+        WHERE seq > %s AND seq <= %s AND entity = ANY(%s)
+        ORDER BY seq
+        LIMIT %s
+    """
@@ -1,25 +1,62 @@
+from queries.builder import ListQuerySpec
+from queries.recode_queries import RecodeQueries
+
 class CollegeQueries:
-    SELECT_BASE = "SELECT * FROM colleges"
+    COLUMNS = "college_code, college_name"
+
+    ESTIMATE_ROWS = "SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = 'colleges'::regclass"
+
+    LIST = ListQuerySpec(
+        name="colleges",
+        table="colleges",
+        columns={
+            "college_code": "college_code",
+            "college_name": "college_name",
+        },
+        key_column="college_code",
+        sort_columns={
+            "college_code": "college_code",
+            "college_name": "college_name",
+        },
+        search_columns={
+            "college_code": ("college_code", "text"),
+            "college_name": ("college_name", "text"),
+        },
+        search_document="search_text"
+    )
     
-    COUNT_BASE = "SELECT COUNT(*) AS count FROM colleges"
+    SELECT_ALL = f"SELECT {COLUMNS} FROM colleges ORDER BY college_code"
     
-    SELECT_ALL = "SELECT * FROM colleges ORDER BY college_code"
+    SELECT_BY_CODE = f"SELECT {COLUMNS} FROM colleges WHERE college_code = %s"
     
-    SELECT_BY_CODE = "SELECT * FROM colleges WHERE college_code = %s"
-    
-    CHECK_EXISTS = "SELECT 1 FROM colleges WHERE college_code = %s"
-    
-    INSERT_COLLEGE = """
+    INSERT_COLLEGE = f"""
         INSERT INTO colleges (college_code, college_name)
         VALUES (%s, %s)
-        RETURNING *;
+        RETURNING {COLUMNS};
     """
     
-    UPDATE_COLLEGE = """
+    UPDATE_COLLEGE = f"""
         UPDATE colleges
         SET college_code = %s, college_name = %s
         WHERE college_code = %s
-        RETURNING *;
+        RETURNING {COLUMNS};
     """
     
-    DELETE_COLLEGE = "DELETE FROM colleges WHERE college_code = %s RETURNING *"
\ No newline at end of file
+    DELETE_COLLEGE = f"DELETE FROM colleges WHERE college_code = %s RETURNING {COLUMNS}"
+
+    # Moving a program to the new college code also refreshes its students'
+    # search documents, so students are counted as dependents too.
+    RECODE = RecodeQueries(
+        entity="college",
+        parent_table="colleges",
+        parent_key="college_code",
+        parent_columns=("college_name",),
+        child_table="programs",
+        child_key="program_code",
+        child_fk="college_code",
+        count_dependents="""
+            SELECT COUNT(DISTINCT p.program_code) AS programs, COUNT(s.student_id) AS students
+            FROM programs p LEFT JOIN students s ON s.program_code = p.program_code
+            WHERE p.college_code = %s
+        """
+    )
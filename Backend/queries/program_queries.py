@@ -1,25 +1,60 @@
+from queries.builder import ListQuerySpec
+from queries.recode_queries import RecodeQueries
+
 class ProgramQueries:
-    SELECT_BASE = "SELECT * FROM programs"
+    COLUMNS = "program_code, program_name, college_code"
+
+    ESTIMATE_ROWS = "SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = 'programs'::regclass"
+
+    LIST = ListQuerySpec(
+        name="programs",
+        table="programs",
+        columns={
+            "program_code": "program_code",
+            "program_name": "program_name",
+            "college_code": "college_code",
+        },
+        key_column="program_code",
+        sort_columns={
+            "program_code": "program_code",
+            "program_name": "program_name",
+            "college_code": "college_code",
+        },
+        nullable_columns={"college_code"},
+        search_columns={
+            "program_code": ("program_code", "text"),
+            "program_name": ("program_name", "text"),
+            "college_code": ("college_code", "text"),
+        },
+        search_document="search_text"
+    )
     
-    COUNT_BASE = "SELECT COUNT(*) AS count FROM programs"
+    SELECT_ALL = f"SELECT {COLUMNS} FROM programs ORDER BY program_code"
     
-    SELECT_ALL = "SELECT * FROM programs ORDER BY program_code"
+    SELECT_BY_CODE = f"SELECT {COLUMNS} FROM programs WHERE program_code = %s"
     
-    SELECT_BY_CODE = "SELECT * FROM programs WHERE program_code = %s"
-    
-    CHECK_EXISTS = "SELECT 1 FROM programs WHERE program_code = %s"
-    
-    INSERT_PROGRAM = """
+    INSERT_PROGRAM = f"""
         INSERT INTO programs (program_code, program_name, college_code)
         VALUES (%s, %s, %s)
-        RETURNING *;
+        RETURNING {COLUMNS};
     """
     
-    UPDATE_PROGRAM = """
+    UPDATE_PROGRAM = f"""
         UPDATE programs
         SET program_code = %s, program_name = %s, college_code = %s
         WHERE program_code = %s
-        RETURNING *;
+        RETURNING {COLUMNS};
     """
     
-    DELETE_PROGRAM = "DELETE FROM programs WHERE program_code = %s RETURNING *"
\ No newline at end of file
+    DELETE_PROGRAM = f"DELETE FROM programs WHERE program_code = %s RETURNING {COLUMNS}"
+
+    RECODE = RecodeQueries(
+        entity="program",
+        parent_table="programs",
+        parent_key="program_code",
+        parent_columns=("program_name", "college_code"),
+        child_table="students",
+        child_key="student_id",
+        child_fk="program_code",
+        count_dependents="SELECT COUNT(*) AS students FROM students WHERE program_code = %s"
+    )
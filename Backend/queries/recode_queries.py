@@ -0,0 +1,74 @@
+JOB_COLUMNS = "id, entity, old_code, new_code, state, total, moved, batches, retries, error, started_at, updated_at, finished_at"
+
+
+class RecodeQueries:
+    def __init__(self, entity, parent_table, parent_key, parent_columns, child_table, child_key, child_fk, count_dependents):
+        self.entity = entity
+        parent_list = ", ".join(parent_columns)
+
+        # One row of named dependent counts for the preview. The first
+        # column is what the batches move.
+        self.COUNT_DEPENDENTS = count_dependents
+
+        self.PARENT_EXISTS = f"SELECT EXISTS (SELECT 1 FROM {parent_table} WHERE {parent_key} = %s) AS found"
+
+        self.COPY_PARENT = f"""
+            INSERT INTO {parent_table} ({parent_key}, {parent_list})
+            SELECT %s, {parent_list} FROM {parent_table} WHERE {parent_key} = %s
+            RETURNING {parent_key}
+        """
+
+        # SKIP LOCKED leaves rows that a concurrent edit holds for a later
+        # batch instead of queueing behind it.
+        self.MOVE_BATCH = f"""
+            WITH batch AS (
+                SELECT {child_key} FROM {child_table}
+                WHERE {child_fk} = %s
+                ORDER BY {child_key}
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            UPDATE {child_table} c SET {child_fk} = %s
+            FROM batch WHERE c.{child_key} = batch.{child_key}
+        """
+
+        self.HAS_DEPENDENTS = f"SELECT EXISTS (SELECT 1 FROM {child_table} WHERE {child_fk} = %s) AS found"
+
+        # Holding the parent row FOR UPDATE blocks new references to it, so
+        # nothing can be left behind when it is deleted.
+        self.LOCK_PARENT = f"SELECT 1 FROM {parent_table} WHERE {parent_key} = %s FOR UPDATE"
+
+        self.MOVE_REST = f"UPDATE {child_table} SET {child_fk} = %s WHERE {child_fk} = %s"
+
+        self.DELETE_PARENT = f"DELETE FROM {parent_table} WHERE {parent_key} = %s"
+
+
+class RecodeJobQueries:
+    SET_LOCK_TIMEOUT = "SELECT set_config('lock_timeout', %s, true)"
+
+    START = f"""
+        INSERT INTO code_renames (entity, old_code, new_code, total)
+        VALUES (%s, %s, %s, %s)
+        RETURNING {JOB_COLUMNS}
+    """
+
+    RUNNING_FOR_CODE = f"""
+        SELECT {JOB_COLUMNS} FROM code_renames
+        WHERE entity = %s AND state = 'running' AND (old_code = %s OR new_code = %s)
+    """
+
+    GET = f"SELECT {JOB_COLUMNS} FROM code_renames WHERE id = %s AND entity = %s"
+
+    RECORD_BATCH = "UPDATE code_renames SET moved = moved + %s, batches = batches + 1, updated_at = now() WHERE id = %s"
+
+    RECORD_RETRY = "UPDATE code_renames SET retries = retries + 1, updated_at = now() WHERE id = %s"
+
+    # Reverting moves rows back, so progress counts down again.
+    RECORD_REVERT = "UPDATE code_renames SET moved = moved - %s, batches = batches + 1, updated_at = now() WHERE id = %s"
+
+    FINISH = f"""
+        UPDATE code_renames
+        SET state = %s, error = %s, updated_at = now(), finished_at = now()
+        WHERE id = %s
+        RETURNING {JOB_COLUMNS}
+    """
@@ -0,0 +1,30 @@
+class StatsQueries:
+    # enrollment_stats holds one row per (program, year level, gender), kept
+    # current by triggers on students (migrations/004_enrollment_stats.sql).
+    # Colleges come from the live programs table, so reassigning a program
+    # moves its students without touching the summary.
+    ENROLLMENT_ROLLUP = """
+        SELECT
+            CASE
+                WHEN GROUPING(e.program_code) = 0 THEN 'program'
+                WHEN GROUPING(p.college_code) = 0 THEN 'college'
+                WHEN GROUPING(e.year_level) = 0 THEN 'year'
+                WHEN GROUPING(e.gender) = 0 THEN 'gender'
+                ELSE 'total'
+            END AS dimension,
+            e.program_code,
+            p.college_code,
+            e.year_level,
+            e.gender,
+            SUM(e.student_count)::bigint AS count
+        FROM enrollment_stats e
+        LEFT JOIN programs p ON e.program_code = p.program_code
+        GROUP BY GROUPING SETS (
+            (e.program_code, p.college_code),
+            (p.college_code),
+            (e.year_level),
+            (e.gender),
+            ()
+        )
+        ORDER BY dimension, e.program_code, p.college_code, e.year_level, e.gender
+    """
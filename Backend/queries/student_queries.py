@@ -1,26 +1,123 @@
+from queries.builder import ListQuerySpec
+
 class StudentQueries:
-    SELECT_BASE = "SELECT s.*, p.college_code FROM students s LEFT JOIN programs p ON s.program_code = p.program_code"
-    COUNT_BASE = "SELECT COUNT(*) AS count FROM students s LEFT JOIN programs p ON s.program_code = p.program_code"
+    COLUMNS = "student_id, first_name, last_name, year_level, gender, program_code, image_url"
+
+    ESTIMATE_ROWS = "SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = 'students'::regclass"
+
+    LIST = ListQuerySpec(
+        name="students",
+        table="students s",
+        columns={
+            "student_id": "s.student_id",
+            "first_name": "s.first_name",
+            "last_name": "s.last_name",
+            "year_level": "s.year_level",
+            "gender": "s.gender",
+            "program_code": "s.program_code",
+            "image_url": "s.image_url",
+            "college_code": "p.college_code",
+        },
+        joins={"p": "LEFT JOIN programs p ON s.program_code = p.program_code"},
+        key_column="s.student_id",
+        sort_columns={
+            "student_id": "s.student_id",
+            "first_name": "s.first_name",
+            "last_name": "s.last_name",
+            "year_level": "s.year_level",
+            "gender": "s.gender",
+            "program_code": "s.program_code",
+        },
+        nullable_columns={"s.program_code"},
+        search_columns={
+            "student_id": ("s.student_id", "text"),
+            "first_name": ("s.first_name", "text"),
+            "last_name": ("s.last_name", "text"),
+            "year_level": ("s.year_level", "int"),
+            "gender": ("s.gender", "text"),
+            "program_code": ("s.program_code", "text"),
+        },
+        search_document="s.search_text",
+        filter_columns={
+            "program": "s.program_code",
+            "year": "s.year_level",
+            "gender": "s.gender",
+            "college": "p.college_code",
+        }
+    )
     
-    SELECT_ALL = "SELECT * FROM students ORDER BY student_id"
+    SELECT_ALL = f"SELECT {COLUMNS} FROM students ORDER BY student_id"
     
-    SELECT_BY_ID = "SELECT * FROM students WHERE student_id = %s"
+    SELECT_BY_ID = f"SELECT {COLUMNS} FROM students WHERE student_id = %s"
     
-    CHECK_EXISTS = "SELECT 1 FROM students WHERE student_id = %s"
-    
-    INSERT_STUDENT = """
+    INSERT_STUDENT = f"""
         INSERT INTO students (student_id, first_name, last_name, year_level, gender, program_code)
         VALUES (%s, %s, %s, %s, %s, %s)
-        RETURNING *;
+        RETURNING {COLUMNS};
     """
     
-    UPDATE_STUDENT = """
+    UPDATE_STUDENT = f"""
         UPDATE students
         SET student_id = %s, first_name = %s, last_name = %s, year_level = %s, gender = %s, program_code = %s
         WHERE student_id = %s
-        RETURNING *;
+        RETURNING {COLUMNS};
     """
     
-    UPDATE_IMAGE = "UPDATE students SET image_url = %s WHERE student_id = %s RETURNING *"
+    UPDATE_IMAGE = f"UPDATE students SET image_url = %s WHERE student_id = %s RETURNING {COLUMNS}"
     
-    DELETE_STUDENT = "DELETE FROM students WHERE student_id = %s RETURNING *"
\ No newline at end of file
+    DELETE_STUDENT = f"DELETE FROM students WHERE student_id = %s RETURNING {COLUMNS}"
+
+    CREATE_IMPORT_STAGING = """
+        CREATE TEMP TABLE student_import (
+            row_number INT NOT NULL,
+            student_id TEXT,
+            first_name TEXT,
+            last_name TEXT,
+            year_level INT,
+            gender TEXT,
+            program_code TEXT
+        ) ON COMMIT DROP
+    """
+
+    COPY_IMPORT_STAGING = """
+        COPY student_import (row_number, student_id, first_name, last_name, year_level, gender, program_code)
+        FROM STDIN
+    """
+
+    FIND_IMPORT_CONFLICTS = """
+        SELECT row_number, student_id, program_code, id_exists, duplicate, missing_program
+        FROM (
+            SELECT
+                st.row_number,
+                st.student_id,
+                st.program_code,
+                EXISTS (SELECT 1 FROM students s WHERE s.student_id = st.student_id) AS id_exists,
+                st.row_number > MIN(st.row_number) OVER (PARTITION BY st.student_id) AS duplicate,
+                NOT EXISTS (SELECT 1 FROM programs p WHERE p.program_code = st.program_code) AS missing_program
+            FROM student_import st
+        ) checked
+        WHERE id_exists OR duplicate OR missing_program
+        ORDER BY row_number
+    """
+
+    DISCARD_IMPORT_ROWS = "DELETE FROM student_import WHERE row_number = ANY(%s)"
+
+    MERGE_IMPORT = """
+        INSERT INTO students (student_id, first_name, last_name, year_level, gender, program_code)
+        SELECT student_id, first_name, last_name, year_level, gender, program_code
+        FROM student_import
+        ORDER BY row_number
+        ON CONFLICT (student_id) DO NOTHING
+    """
+
+    # {target} is either an ID array match or a subquery compiled by the list
+    # query builder, so batch changes accept the same filters as the list.
+    BATCH_PROMOTE = "UPDATE students SET year_level = year_level + %s WHERE {target}"
+
+    BATCH_REASSIGN = "UPDATE students SET program_code = %s WHERE {target}"
+
+    BATCH_DELETE = "DELETE FROM students WHERE {target}"
+
+    BATCH_TARGET_IDS = "student_id = ANY(%s)"
+
+    BATCH_TARGET_FILTER = "student_id IN ({keys})"
@@ -0,0 +1,25 @@
+from db import get_async_pool
+from queries.auth_queries import AuthQueries  
+from utils.tracing import trace_methods
+
+@trace_methods("repo")
+class AsyncUserRepository:
+    def __init__(self):
+        self.pool = get_async_pool()
+
+    async def get_by_username(self, username):
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(AuthQueries.GET_USER_BY_USERNAME, (username,))
+                return await cur.fetchone()
+
+    async def create(self, username, password_hash):
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    AuthQueries.INSERT_USER, 
+                    (username, password_hash)
+                )
+                row = await cur.fetchone()
+                await conn.commit() 
+                return row[0] if row else None
\ No newline at end of file
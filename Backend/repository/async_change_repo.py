@@ -0,0 +1,17 @@
+from psycopg.rows import dict_row
+from db import get_async_pool
+from queries.change_queries import ChangeQueries
+from utils.tracing import trace_methods
+
+@trace_methods("repo")
+class AsyncChangeRepository:
+    def __init__(self):
+        self.pool = get_async_pool()
+
+    async def get_since(self, since, entities, limit):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(ChangeQueries.BOUNDS, prepare=True)
+                bounds = await cur.fetchone()
+                await cur.execute(ChangeQueries.CHANGES_SINCE, (since, bounds["latest"], list(entities), limit), prepare=True)
+                return await cur.fetchall(), bounds
@@ -0,0 +1,91 @@
+from psycopg.rows import dict_row
+from db import fetch_page_async, get_async_pool
+from queries.builder import ListQueryBuilder
+from queries.college_queries import CollegeQueries
+from utils.tracing import trace_methods
+
+@trace_methods("repo")
+class AsyncCollegeRepository:
+    def __init__(self):
+        self.pool = get_async_pool()
+        self.queries = ListQueryBuilder(CollegeQueries.LIST)
+
+    async def get_paginated(self, search_term, filter_field, sort_column, sort_dir, limit, offset, include_count=True, fields=None):
+        query = self.queries.page(
+            search_term, filter_field, sort_column, sort_dir, limit, offset, include_count=include_count, fields=fields
+        )
+
+        async with self.pool.connection() as conn:
+            colleges, total_records = await fetch_page_async(conn, *query, prepare=True)
+            return colleges, total_records
+
+    async def get_keyset(self, search_term, filter_field, sort_column, sort_dir, limit, cursor_values=None, direction="next", include_count=True, fields=None):
+        query = self.queries.keyset(
+            search_term, filter_field, sort_column, sort_dir, limit, cursor_values, direction, include_count=include_count, fields=fields
+        )
+
+        async with self.pool.connection() as conn:
+            colleges, total_records = await fetch_page_async(conn, *query, prepare=True)
+            return colleges, total_records
+
+    async def estimate_count(self, search_term, filter_field):
+        query = self.queries.explain(search_term, filter_field)
+
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                if query is None:
+                    await cur.execute(CollegeQueries.ESTIMATE_ROWS)
+                    estimate = (await cur.fetchone())['estimate']
+                    # reltuples is -1 until the table has been analyzed.
+                    return estimate if estimate >= 0 else None
+
+                await cur.execute(query.sql, query.params)
+                plan = (await cur.fetchone())['QUERY PLAN'][0]['Plan']
+                return int(plan['Plan Rows'])
+
+    async def get_all(self):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(CollegeQueries.SELECT_ALL)
+                return await cur.fetchall()
+
+    async def get_by_code(self, college_code, fields=None):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                if fields is None:
+                    await cur.execute(CollegeQueries.SELECT_BY_CODE, (college_code,))
+                else:
+                    query = self.queries.lookup(college_code, fields)
+                    await cur.execute(query.sql, query.params, prepare=True)
+                return await cur.fetchone()
+
+    async def create(self, data):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(CollegeQueries.INSERT_COLLEGE, (
+                    data["college_code"], 
+                    data["college_name"]
+                ))
+                new_college = await cur.fetchone()
+                await conn.commit()
+                return new_college
+
+    async def update(self, current_code, data):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(CollegeQueries.UPDATE_COLLEGE, (
+                    data["college_code"], 
+                    data["college_name"],
+                    current_code
+                ))
+                updated = await cur.fetchone()
+                await conn.commit()
+                return updated
+
+    async def delete(self, college_code):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(CollegeQueries.DELETE_COLLEGE, (college_code,))
+                deleted = await cur.fetchone()
+                await conn.commit()
+                return deleted
\ No newline at end of file
@@ -0,0 +1,93 @@
+from psycopg.rows import dict_row
+from db import fetch_page_async, get_async_pool
+from queries.builder import ListQueryBuilder
+from queries.program_queries import ProgramQueries
+from utils.tracing import trace_methods
+
+@trace_methods("repo")
+class AsyncProgramRepository:
+    def __init__(self):
+        self.pool = get_async_pool()
+        self.queries = ListQueryBuilder(ProgramQueries.LIST)
+        
+    async def get_paginated(self, search_term, filter_field, sort_column, sort_dir, limit, offset, include_count=True, fields=None):
+        query = self.queries.page(
+            search_term, filter_field, sort_column, sort_dir, limit, offset, include_count=include_count, fields=fields
+        )
+
+        async with self.pool.connection() as conn:
+            programs, total_records = await fetch_page_async(conn, *query, prepare=True)
+            return programs, total_records
+
+    async def get_keyset(self, search_term, filter_field, sort_column, sort_dir, limit, cursor_values=None, direction="next", include_count=True, fields=None):
+        query = self.queries.keyset(
+            search_term, filter_field, sort_column, sort_dir, limit, cursor_values, direction, include_count=include_count, fields=fields
+        )
+
+        async with self.pool.connection() as conn:
+            programs, total_records = await fetch_page_async(conn, *query, prepare=True)
+            return programs, total_records
+
+    async def estimate_count(self, search_term, filter_field):
+        query = self.queries.explain(search_term, filter_field)
+
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                if query is None:
+                    await cur.execute(ProgramQueries.ESTIMATE_ROWS)
+                    estimate = (await cur.fetchone())['estimate']
+                    # reltuples is -1 until the table has been analyzed.
+                    return estimate if estimate >= 0 else None
+
+                await cur.execute(query.sql, query.params)
+                plan = (await cur.fetchone())['QUERY PLAN'][0]['Plan']
+                return int(plan['Plan Rows'])
+
+    async def get_all(self):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(ProgramQueries.SELECT_ALL)
+                return await cur.fetchall()
+
+    async def get_by_code(self, program_code, fields=None):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                if fields is None:
+                    await cur.execute(ProgramQueries.SELECT_BY_CODE, (program_code,))
+                else:
+                    query = self.queries.lookup(program_code, fields)
+                    await cur.execute(query.sql, query.params, prepare=True)
+                return await cur.fetchone()
+
+    async def create(self, data):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(ProgramQueries.INSERT_PROGRAM, (
+                    data["program_code"], 
+                    data["program_name"], 
+                    data["college_code"]
+                ))
+                new_program = await cur.fetchone()
+                await conn.commit()
+                return new_program
+
+    async def update(self, current_code, data):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(ProgramQueries.UPDATE_PROGRAM, (
+                    data["program_code"], 
+                    data["program_name"], 
+                    data["college_code"],
+                    current_code
+                ))
+                updated = await cur.fetchone()
+                await conn.commit()
+                return updated
+
+    async def delete(self, program_code):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(ProgramQueries.DELETE_PROGRAM, (program_code,))
+                deleted = await cur.fetchone()
+                await conn.commit()
+                return deleted
\ No newline at end of file
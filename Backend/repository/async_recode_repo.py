@@ -0,0 +1,86 @@
+from psycopg.rows import dict_row
+from db import get_async_pool
+from queries.recode_queries import RecodeJobQueries
+from utils.tracing import trace_methods
+
+@trace_methods("repo")
+class AsyncRecodeRepository:
+    def __init__(self, queries):
+        self.pool = get_async_pool()
+        self.queries = queries
+
+    async def preview(self, old_code, new_code):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(self.queries.PARENT_EXISTS, (old_code,))
+                exists = (await cur.fetchone())["found"]
+                await cur.execute(self.queries.PARENT_EXISTS, (new_code,))
+                target_taken = (await cur.fetchone())["found"]
+                await cur.execute(self.queries.COUNT_DEPENDENTS, (old_code,))
+                dependents = await cur.fetchone()
+                return exists, target_taken, dependents
+
+    async def running_for(self, code):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(RecodeJobQueries.RUNNING_FOR_CODE, (self.queries.entity, code, code))
+                return await cur.fetchone()
+
+    async def get_job(self, job_id):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(RecodeJobQueries.GET, (job_id, self.queries.entity))
+                return await cur.fetchone()
+
+    async def start(self, old_code, new_code, total):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(self.queries.COPY_PARENT, (new_code, old_code))
+                if (await cur.fetchone()) is None:
+                    await conn.rollback()
+                    return None
+                await cur.execute(RecodeJobQueries.START, (self.queries.entity, old_code, new_code, total))
+                job = await cur.fetchone()
+                await conn.commit()
+                return job
+
+    async def move_batch(self, job_id, from_code, to_code, batch_size, lock_timeout_ms, reverting=False):
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(RecodeJobQueries.SET_LOCK_TIMEOUT, (f"{lock_timeout_ms}ms",))
+                await cur.execute(self.queries.MOVE_BATCH, (from_code, batch_size, to_code))
+                moved = cur.rowcount
+                if moved:
+                    record = RecodeJobQueries.RECORD_REVERT if reverting else RecodeJobQueries.RECORD_BATCH
+                    await cur.execute(record, (moved, job_id))
+                await conn.commit()
+                return moved
+
+    async def has_dependents(self, code):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(self.queries.HAS_DEPENDENTS, (code,))
+                return (await cur.fetchone())["found"]
+
+    async def record_retry(self, job_id):
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(RecodeJobQueries.RECORD_RETRY, (job_id,))
+                await conn.commit()
+
+    async def close(self, job_id, from_code, to_code, state, error, lock_timeout_ms):
+        # Retires from_code in one short transaction: anything that started
+        # referencing it since the last batch moves with it.
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(RecodeJobQueries.SET_LOCK_TIMEOUT, (f"{lock_timeout_ms}ms",))
+                await cur.execute(self.queries.LOCK_PARENT, (from_code,))
+                await cur.execute(self.queries.MOVE_REST, (to_code, from_code))
+                if cur.rowcount:
+                    record = RecodeJobQueries.RECORD_BATCH if state == "done" else RecodeJobQueries.RECORD_REVERT
+                    await cur.execute(record, (cur.rowcount, job_id))
+                await cur.execute(self.queries.DELETE_PARENT, (from_code,))
+                await cur.execute(RecodeJobQueries.FINISH, (state, error, job_id))
+                job = await cur.fetchone()
+                await conn.commit()
+                return job
@@ -0,0 +1,15 @@
+from psycopg.rows import dict_row
+from db import get_async_pool
+from queries.stats_queries import StatsQueries
+from utils.tracing import trace_methods
+
+@trace_methods("repo")
+class AsyncStatsRepository:
+    def __init__(self):
+        self.pool = get_async_pool()
+
+    async def get_enrollment_rollup(self):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(StatsQueries.ENROLLMENT_ROLLUP, prepare=True)
+                return await cur.fetchall()
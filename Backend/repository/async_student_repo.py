@@ -0,0 +1,195 @@
+from psycopg.rows import dict_row
+from db import fetch_page_async, get_async_pool
+from queries.builder import ListQueryBuilder
+from queries.student_queries import StudentQueries
+from utils.tracing import trace_methods
+
+@trace_methods("repo")
+class AsyncStudentRepository:
+    def __init__(self):
+        self.pool = get_async_pool()
+        self.queries = ListQueryBuilder(StudentQueries.LIST)
+
+    async def get_all(self):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(StudentQueries.SELECT_ALL)
+                return await cur.fetchall()
+
+    async def get_by_id(self, student_id, fields=None):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                if fields is None:
+                    await cur.execute(StudentQueries.SELECT_BY_ID, (student_id,))
+                else:
+                    query = self.queries.lookup(student_id, fields)
+                    await cur.execute(query.sql, query.params, prepare=True)
+                return await cur.fetchone()
+            
+    def _filters(self, program_filter, year_filter, gender_filter, college_filter):
+        return {
+            "program": program_filter,
+            "year": year_filter,
+            "gender": gender_filter,
+            "college": college_filter,
+        }
+
+    async def get_paginated(self, search_term, filter_field, sort_column, sort_dir, limit, offset, program_filter=None, year_filter=None, gender_filter=None, college_filter=None, include_count=True, fields=None):
+        query = self.queries.page(
+            search_term, filter_field, sort_column, sort_dir, limit, offset,
+            self._filters(program_filter, year_filter, gender_filter, college_filter),
+            include_count,
+            fields
+        )
+
+        async with self.pool.connection() as conn:
+            students, total_records = await fetch_page_async(conn, *query, prepare=True)
+            return students, total_records
+
+    async def get_keyset(self, search_term, filter_field, sort_column, sort_dir, limit, cursor_values=None, direction="next", program_filter=None, year_filter=None, gender_filter=None, college_filter=None, include_count=True, fields=None):
+        query = self.queries.keyset(
+            search_term, filter_field, sort_column, sort_dir, limit, cursor_values, direction,
+            self._filters(program_filter, year_filter, gender_filter, college_filter),
+            include_count,
+            fields
+        )
+
+        async with self.pool.connection() as conn:
+            students, total_records = await fetch_page_async(conn, *query, prepare=True)
+            return students, total_records
+
+    async def iter_filtered(self, search_term, filter_field, sort_column, sort_dir, program_filter=None, year_filter=None, gender_filter=None, college_filter=None, batch_size=2000):
+        query = self.queries.stream(
+            search_term, filter_field, sort_column, sort_dir,
+            self._filters(program_filter, year_filter, gender_filter, college_filter)
+        )
+
+        async with self.pool.connection() as conn:
+            # A named cursor keeps the result set on the server; we only ever
+            # hold one batch in memory regardless of how many rows match.
+            async with conn.cursor(name="student_export", row_factory=dict_row) as cur:
+                cur.itersize = batch_size
+                await cur.execute(query.sql, query.params)
+                while True:
+                    rows = await cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+
+    async def estimate_count(self, search_term, filter_field, program_filter=None, year_filter=None, gender_filter=None, college_filter=None):
+        query = self.queries.explain(
+            search_term, filter_field,
+            self._filters(program_filter, year_filter, gender_filter, college_filter)
+        )
+
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                if query is None:
+                    await cur.execute(StudentQueries.ESTIMATE_ROWS)
+                    estimate = (await cur.fetchone())['estimate']
+                    # reltuples is -1 until the table has been analyzed.
+                    return estimate if estimate >= 0 else None
+
+                await cur.execute(query.sql, query.params)
+                plan = (await cur.fetchone())['QUERY PLAN'][0]['Plan']
+                return int(plan['Plan Rows'])
+
+    async def get_facet_counts(self, search_term, filter_field, program_filter=None, year_filter=None, gender_filter=None, college_filter=None):
+        query = self.queries.facets(
+            search_term, filter_field,
+            self._filters(program_filter, year_filter, gender_filter, college_filter)
+        )
+
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(query.sql, query.params, prepare=True)
+                return await cur.fetchall()
+
+    async def create(self, data):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(StudentQueries.INSERT_STUDENT, (
+                    data["student_id"], data["first_name"], data["last_name"],
+                    data["year_level"], data["gender"], data["program_code"]
+                ))
+                new_student = await cur.fetchone()
+                await conn.commit()
+                return new_student
+
+    async def bulk_import(self, batches, commit_if):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(StudentQueries.CREATE_IMPORT_STAGING)
+                async with cur.copy(StudentQueries.COPY_IMPORT_STAGING) as copy:
+                    async for rows in batches:
+                        for row in rows:
+                            await copy.write_row(row)
+
+                await cur.execute(StudentQueries.FIND_IMPORT_CONFLICTS)
+                conflicts = await cur.fetchall()
+
+                if not commit_if(conflicts):
+                    await conn.rollback()
+                    return 0, conflicts
+
+                if conflicts:
+                    await cur.execute(
+                        StudentQueries.DISCARD_IMPORT_ROWS,
+                        ([c["row_number"] for c in conflicts],)
+                    )
+                await cur.execute(StudentQueries.MERGE_IMPORT)
+                inserted = cur.rowcount
+                await conn.commit()
+                return inserted, conflicts
+
+    def _batch_target(self, ids, search_term, filter_field, filters):
+        if ids is not None:
+            return StudentQueries.BATCH_TARGET_IDS, [list(ids)]
+        query = self.queries.keys(search_term, filter_field, filters)
+        return StudentQueries.BATCH_TARGET_FILTER.format(keys=query.sql), query.params
+
+    async def batch_update(self, statement, params, ids=None, search_term="", filter_field="all", filters=None):
+        target, target_params = self._batch_target(ids, search_term, filter_field, filters)
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(statement.format(target=target), params + target_params)
+                affected = cur.rowcount
+                await conn.commit()
+                return affected
+
+    async def batch_promote(self, step, **selection):
+        return await self.batch_update(StudentQueries.BATCH_PROMOTE, [step], **selection)
+
+    async def batch_reassign(self, program_code, **selection):
+        return await self.batch_update(StudentQueries.BATCH_REASSIGN, [program_code], **selection)
+
+    async def batch_delete(self, **selection):
+        return await self.batch_update(StudentQueries.BATCH_DELETE, [], **selection)
+
+    async def update(self, current_id, data):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(StudentQueries.UPDATE_STUDENT, (
+                    data["student_id"], data["first_name"], data["last_name"],
+                    data["year_level"], data["gender"], data["program_code"],
+                    current_id  
+                ))
+                updated = await cur.fetchone()
+                await conn.commit()
+                return updated
+
+    async def update_image(self, student_id, image_url):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(StudentQueries.UPDATE_IMAGE, (image_url, student_id))
+                updated = await cur.fetchone()
+                await conn.commit()
+                return updated
+
+    async def delete(self, student_id):
+        async with self.pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(StudentQueries.DELETE_STUDENT, (student_id,))
+                deleted = await cur.fetchone()
+                await conn.commit()
+                return deleted
\ No newline at end of file
@@ -1,6 +1,8 @@
 from db import get_pool
 from queries.auth_queries import AuthQueries  
+from utils.tracing import trace_methods
 
+@trace_methods("repo")
 class UserRepository:
     def __init__(self):
         self.pool = get_pool()
@@ -18,6 +20,6 @@ class UserRepository:
                     AuthQueries.INSERT_USER, 
                     (username, password_hash)
                 )
-                user_id = cur.fetchone()[0]
+                row = cur.fetchone()
                 conn.commit() 
-                return user_id
\ No newline at end of file
+                return row[0] if row else None
\ No newline at end of file
@@ -0,0 +1,17 @@
+from psycopg.rows import dict_row
+from db import get_pool
+from queries.change_queries import ChangeQueries
+from utils.tracing import trace_methods
+
+@trace_methods("repo")
+class ChangeRepository:
+    def __init__(self):
+        self.pool = get_pool()
+
+    def get_since(self, since, entities, limit):
+        with self.pool.connection() as conn:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute(ChangeQueries.BOUNDS, prepare=True)
+                bounds = cur.fetchone()
+                cur.execute(ChangeQueries.CHANGES_SINCE, (since, bounds["latest"], list(entities), limit), prepare=True)
+                return cur.fetchall(), bounds
@@ -1,59 +1,63 @@
 from psycopg.rows import dict_row
-from db import get_pool
+from db import fetch_page, get_pool
+from queries.builder import ListQueryBuilder
 from queries.college_queries import CollegeQueries
+from utils.tracing import trace_methods
 
+@trace_methods("repo")
 class CollegeRepository:
     def __init__(self):
         self.pool = get_pool()
+        self.queries = ListQueryBuilder(CollegeQueries.LIST)
 
-    def get_paginated(self, search_term, filter_field, sort_column, sort_dir, limit, offset):
-        sql_where = ""
-        params = []
+    def get_paginated(self, search_term, filter_field, sort_column, sort_dir, limit, offset, include_count=True, fields=None):
+        query = self.queries.page(
+            search_term, filter_field, sort_column, sort_dir, limit, offset, include_count=include_count, fields=fields
+        )
 
-        if search_term:
-            term = f"%{search_term}%"
-            
-            if filter_field == 'all':
-                sql_where = """
-                    WHERE college_code ILIKE %s 
-                    OR college_name ILIKE %s
-                """
-                params = [term] * 2
-            else:
-                sql_where = f"WHERE {filter_field}::text ILIKE %s"
-                params = [term]
+        with self.pool.connection() as conn:
+            colleges, total_records = fetch_page(conn, *query, prepare=True)
+            return colleges, total_records
+
+    def get_keyset(self, search_term, filter_field, sort_column, sort_dir, limit, cursor_values=None, direction="next", include_count=True, fields=None):
+        query = self.queries.keyset(
+            search_term, filter_field, sort_column, sort_dir, limit, cursor_values, direction, include_count=include_count, fields=fields
+        )
 
         with self.pool.connection() as conn:
-            with conn.cursor(row_factory=dict_row) as cur:
-                count_query = f"{CollegeQueries.COUNT_BASE} {sql_where}"
-                cur.execute(count_query, params)
-                total_records = cur.fetchone()['count']
+            colleges, total_records = fetch_page(conn, *query, prepare=True)
+            return colleges, total_records
 
-                data_query = f"""
-                    {CollegeQueries.SELECT_BASE} 
-                    {sql_where}
-                    ORDER BY {sort_column} {sort_dir}
-                    LIMIT %s OFFSET %s
-                """
-                
-                final_params = params + [limit, offset]
-                
-                cur.execute(data_query, final_params)
-                colleges = cur.fetchall()
+    def estimate_count(self, search_term, filter_field):
+        query = self.queries.explain(search_term, filter_field)
 
-                return colleges, total_records
+        with self.pool.connection() as conn:
+            with conn.cursor(row_factory=dict_row) as cur:
+                if query is None:
+                    cur.execute(CollegeQueries.ESTIMATE_ROWS)
+                    estimate = cur.fetchone()['estimate']
+                    # reltuples is -1 until the table has been analyzed.
+                    return estimate if estimate >= 0 else None
 
-    def get_by_code(self, college_code):
+                cur.execute(query.sql, query.params)
+                plan = cur.fetchone()['QUERY PLAN'][0]['Plan']
+                return int(plan['Plan Rows'])
+
+    def get_all(self):
         with self.pool.connection() as conn:
             with conn.cursor(row_factory=dict_row) as cur:
-                cur.execute(CollegeQueries.SELECT_BY_CODE, (college_code,))
-                return cur.fetchone()
+                cur.execute(CollegeQueries.SELECT_ALL)
+                return cur.fetchall()
 
-    def exists(self, college_code):
+    def get_by_code(self, college_code, fields=None):
         with self.pool.connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(CollegeQueries.CHECK_EXISTS, (college_code,))
-                return cur.fetchone() is not None
+            with conn.cursor(row_factory=dict_row) as cur:
+                if fields is None:
+                    cur.execute(CollegeQueries.SELECT_BY_CODE, (college_code,))
+                else:
+                    query = self.queries.lookup(college_code, fields)
+                    cur.execute(query.sql, query.params, prepare=True)
+                return cur.fetchone()
 
     def create(self, data):
         with self.pool.connection() as conn:
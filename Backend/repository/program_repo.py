@@ -1,48 +1,47 @@
 from psycopg.rows import dict_row
-from db import get_pool
+from db import fetch_page, get_pool
+from queries.builder import ListQueryBuilder
 from queries.program_queries import ProgramQueries
+from utils.tracing import trace_methods
 
+@trace_methods("repo")
 class ProgramRepository:
     def __init__(self):
         self.pool = get_pool()
+        self.queries = ListQueryBuilder(ProgramQueries.LIST)
         
-    def get_paginated(self, search_term, filter_field, sort_column, sort_dir, limit, offset):
-        sql_where = ""
-        params = []
+    def get_paginated(self, search_term, filter_field, sort_column, sort_dir, limit, offset, include_count=True, fields=None):
+        query = self.queries.page(
+            search_term, filter_field, sort_column, sort_dir, limit, offset, include_count=include_count, fields=fields
+        )
 
-        if search_term:
-            term = f"%{search_term}%"
-            
-            if filter_field == 'all':
-                sql_where = """
-                    WHERE program_code ILIKE %s 
-                    OR program_name ILIKE %s 
-                    OR college_code ILIKE %s
-                """
-                params = [term] * 3
-            else:
-                sql_where = f"WHERE {filter_field}::text ILIKE %s"
-                params = [term]
+        with self.pool.connection() as conn:
+            programs, total_records = fetch_page(conn, *query, prepare=True)
+            return programs, total_records
+
+    def get_keyset(self, search_term, filter_field, sort_column, sort_dir, limit, cursor_values=None, direction="next", include_count=True, fields=None):
+        query = self.queries.keyset(
+            search_term, filter_field, sort_column, sort_dir, limit, cursor_values, direction, include_count=include_count, fields=fields
+        )
+
+        with self.pool.connection() as conn:
+            programs, total_records = fetch_page(conn, *query, prepare=True)
+            return programs, total_records
+
+    def estimate_count(self, search_term, filter_field):
+        query = self.queries.explain(search_term, filter_field)
 
         with self.pool.connection() as conn:
             with conn.cursor(row_factory=dict_row) as cur:
-                count_query = f"{ProgramQueries.COUNT_BASE} {sql_where}"
-                cur.execute(count_query, params)
-                total_records = cur.fetchone()['count']
+                if query is None:
+                    cur.execute(ProgramQueries.ESTIMATE_ROWS)
+                    estimate = cur.fetchone()['estimate']
+                    # reltuples is -1 until the table has been analyzed.
+                    return estimate if estimate >= 0 else None
 
-                data_query = f"""
-                    {ProgramQueries.SELECT_BASE} 
-                    {sql_where}
-                    ORDER BY {sort_column} {sort_dir}
-                    LIMIT %s OFFSET %s
-                """
-                
-                final_params = params + [limit, offset]
-                
-                cur.execute(data_query, final_params)
-                programs = cur.fetchall()
-                
-                return programs, total_records
+                cur.execute(query.sql, query.params)
+                plan = cur.fetchone()['QUERY PLAN'][0]['Plan']
+                return int(plan['Plan Rows'])
 
     def get_all(self):
         with self.pool.connection() as conn:
@@ -50,18 +49,16 @@ class ProgramRepository:
                 cur.execute(ProgramQueries.SELECT_ALL)
                 return cur.fetchall()
 
-    def get_by_code(self, program_code):
+    def get_by_code(self, program_code, fields=None):
         with self.pool.connection() as conn:
             with conn.cursor(row_factory=dict_row) as cur:
-                cur.execute(ProgramQueries.SELECT_BY_CODE, (program_code,))
+                if fields is None:
+                    cur.execute(ProgramQueries.SELECT_BY_CODE, (program_code,))
+                else:
+                    query = self.queries.lookup(program_code, fields)
+                    cur.execute(query.sql, query.params, prepare=True)
                 return cur.fetchone()
 
-    def exists(self, program_code):
-        with self.pool.connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(ProgramQueries.CHECK_EXISTS, (program_code,))
-                return cur.fetchone() is not None
-
     def create(self, data):
         with self.pool.connection() as conn:
             with conn.cursor(row_factory=dict_row) as cur:
@@ -0,0 +1,86 @@
+from psycopg.rows import dict_row
+from db import get_pool
+from queries.recode_queries import RecodeJobQueries
+from utils.tracing import trace_methods
+
+@trace_methods("repo")
+class RecodeRepository:
+    def __init__(self, queries):
+        self.pool = get_pool()
+        self.queries = queries
+
+    def preview(self, old_code, new_code):
+        with self.pool.connection() as conn:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute(self.queries.PARENT_EXISTS, (old_code,))
+                exists = cur.fetchone()["found"]
+                cur.execute(self.queries.PARENT_EXISTS, (new_code,))
+                target_taken = cur.fetchone()["found"]
+                cur.execute(self.queries.COUNT_DEPENDENTS, (old_code,))
+                dependents = cur.fetchone()
+                return exists, target_taken, dependents
+
+    def running_for(self, code):
+        with self.pool.connection() as conn:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute(RecodeJobQueries.RUNNING_FOR_CODE, (self.queries.entity, code, code))
+                return cur.fetchone()
+
+    def get_job(self, job_id):
+        with self.pool.connection() as conn:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute(RecodeJobQueries.GET, (job_id, self.queries.entity))
+                return cur.fetchone()
+
+    def start(self, old_code, new_code, total):
+        with self.pool.connection() as conn:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute(self.queries.COPY_PARENT, (new_code, old_code))
+                if cur.fetchone() is None:
+                    conn.rollback()
+                    return None
+                cur.execute(RecodeJobQueries.START, (self.queries.entity, old_code, new_code, total))
+                job = cur.fetchone()
+                conn.commit()
+                return job
+
+    def move_batch(self, job_id, from_code, to_code, batch_size, lock_timeout_ms, reverting=False):
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(RecodeJobQueries.SET_LOCK_TIMEOUT, (f"{lock_timeout_ms}ms",))
+                cur.execute(self.queries.MOVE_BATCH, (from_code, batch_size, to_code))
+                moved = cur.rowcount
+                if moved:
+                    record = RecodeJobQueries.RECORD_REVERT if reverting else RecodeJobQueries.RECORD_BATCH
+                    cur.execute(record, (moved, job_id))
+                conn.commit()
+                return moved
+
+    def has_dependents(self, code):
+        with self.pool.connection() as conn:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute(self.queries.HAS_DEPENDENTS, (code,))
+                return cur.fetchone()["found"]
+
+    def record_retry(self, job_id):
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(RecodeJobQueries.RECORD_RETRY, (job_id,))
+                conn.commit()
+
+    def close(self, job_id, from_code, to_code, state, error, lock_timeout_ms):
+        # Retires from_code in one short transaction: anything that started
+        # referencing it since the last batch moves with it.
+        with self.pool.connection() as conn:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute(RecodeJobQueries.SET_LOCK_TIMEOUT, (f"{lock_timeout_ms}ms",))
+                cur.execute(self.queries.LOCK_PARENT, (from_code,))
+                cur.execute(self.queries.MOVE_REST, (to_code, from_code))
+                if cur.rowcount:
+                    record = RecodeJobQueries.RECORD_BATCH if state == "done" else RecodeJobQueries.RECORD_REVERT
+                    cur.execute(record, (cur.rowcount, job_id))
+                cur.execute(self.queries.DELETE_PARENT, (from_code,))
+                cur.execute(RecodeJobQueries.FINISH, (state, error, job_id))
+                job = cur.fetchone()
+                conn.commit()
+                return job
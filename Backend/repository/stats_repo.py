@@ -0,0 +1,15 @@
+from psycopg.rows import dict_row
+from db import get_pool
+from queries.stats_queries import StatsQueries
+from utils.tracing import trace_methods
+
+@trace_methods("repo")
+class StatsRepository:
+    def __init__(self):
+        self.pool = get_pool()
+
+    def get_enrollment_rollup(self):
+        with self.pool.connection() as conn:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute(StatsQueries.ENROLLMENT_ROLLUP, prepare=True)
+                return cur.fetchall()
@@ -1,10 +1,14 @@
 from psycopg.rows import dict_row
-from db import get_pool
+from db import fetch_page, get_pool
+from queries.builder import ListQueryBuilder
 from queries.student_queries import StudentQueries
+from utils.tracing import trace_methods
 
+@trace_methods("repo")
 class StudentRepository:
     def __init__(self):
         self.pool = get_pool()
+        self.queries = ListQueryBuilder(StudentQueries.LIST)
 
     def get_all(self):
         with self.pool.connection() as conn:
@@ -12,78 +16,94 @@ class StudentRepository:
                 cur.execute(StudentQueries.SELECT_ALL)
                 return cur.fetchall()
 
-    def get_by_id(self, student_id):
+    def get_by_id(self, student_id, fields=None):
         with self.pool.connection() as conn:
             with conn.cursor(row_factory=dict_row) as cur:
-                cur.execute(StudentQueries.SELECT_BY_ID, (student_id,))
+                if fields is None:
+                    cur.execute(StudentQueries.SELECT_BY_ID, (student_id,))
+                else:
+                    query = self.queries.lookup(student_id, fields)
+                    cur.execute(query.sql, query.params, prepare=True)
                 return cur.fetchone()
             
-    def get_paginated(self, search_term, filter_field, sort_column, sort_dir, limit, offset, program_filter=None, year_filter=None, gender_filter=None, college_filter=None):
-        sql_where = []
-        params = []
-
-        if search_term:
-            term = f"%{search_term}%"
-            if filter_field == 'all':
-                sql_where.append("""
-                    (student_id ILIKE %s 
-                    OR s.first_name ILIKE %s 
-                    OR s.last_name ILIKE %s 
-                    OR s.year_level::text ILIKE %s 
-                    OR s.gender ILIKE %s 
-                    OR s.program_code ILIKE %s
-                    OR p.college_code ILIKE %s)
-                """)
-                params.extend([term] * 7)
-            else:
-                sql_where.append(f"{filter_field}::text ILIKE %s")
-                params.append(term)
-
-        if program_filter:
-            sql_where.append("s.program_code = %s")
-            params.append(program_filter)
-
-        if year_filter:
-            sql_where.append("s.year_level = %s")
-            params.append(year_filter)
-
-        if gender_filter:
-            sql_where.append("s.gender = %s")
-            params.append(gender_filter)
-            
-        if college_filter:
-            sql_where.append("p.college_code = %s") 
-            params.append(college_filter)
+    def _filters(self, program_filter, year_filter, gender_filter, college_filter):
+        return {
+            "program": program_filter,
+            "year": year_filter,
+            "gender": gender_filter,
+            "college": college_filter,
+        }
+
+    def get_paginated(self, search_term, filter_field, sort_column, sort_dir, limit, offset, program_filter=None, year_filter=None, gender_filter=None, college_filter=None, include_count=True, fields=None):
+        query = self.queries.page(
+            search_term, filter_field, sort_column, sort_dir, limit, offset,
+            self._filters(program_filter, year_filter, gender_filter, college_filter),
+            include_count,
+            fields
+        )
+
+        with self.pool.connection() as conn:
+            students, total_records = fetch_page(conn, *query, prepare=True)
+            return students, total_records
+
+    def get_keyset(self, search_term, filter_field, sort_column, sort_dir, limit, cursor_values=None, direction="next", program_filter=None, year_filter=None, gender_filter=None, college_filter=None, include_count=True, fields=None):
+        query = self.queries.keyset(
+            search_term, filter_field, sort_column, sort_dir, limit, cursor_values, direction,
+            self._filters(program_filter, year_filter, gender_filter, college_filter),
+            include_count,
+            fields
+        )
+
+        with self.pool.connection() as conn:
+            students, total_records = fetch_page(conn, *query, prepare=True)
+            return students, total_records
 
-        where_clause = ""
-        if sql_where:
-            where_clause = "WHERE " + " AND ".join(sql_where)
+    def iter_filtered(self, search_term, filter_field, sort_column, sort_dir, program_filter=None, year_filter=None, gender_filter=None, college_filter=None, batch_size=2000):
+        query = self.queries.stream(
+            search_term, filter_field, sort_column, sort_dir,
+            self._filters(program_filter, year_filter, gender_filter, college_filter)
+        )
+
+        with self.pool.connection() as conn:
+            # A named cursor keeps the result set on the server; we only ever
+            # hold one batch in memory regardless of how many rows match.
+            with conn.cursor(name="student_export", row_factory=dict_row) as cur:
+                cur.itersize = batch_size
+                cur.execute(query.sql, query.params)
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+
+    def estimate_count(self, search_term, filter_field, program_filter=None, year_filter=None, gender_filter=None, college_filter=None):
+        query = self.queries.explain(
+            search_term, filter_field,
+            self._filters(program_filter, year_filter, gender_filter, college_filter)
+        )
 
         with self.pool.connection() as conn:
             with conn.cursor(row_factory=dict_row) as cur:
-                count_query = f"{StudentQueries.COUNT_BASE} {where_clause}"
-                cur.execute(count_query, params)
-                total_records = cur.fetchone()['count']
-
-                data_query = f"""
-                    {StudentQueries.SELECT_BASE} 
-                    {where_clause}
-                    ORDER BY {sort_column} {sort_dir}
-                    LIMIT %s OFFSET %s
-                """
-                
-                final_params = params + [limit, offset]
-                
-                cur.execute(data_query, final_params)
-                students = cur.fetchall()
-
-                return students, total_records
-
-    def exists(self, student_id):
+                if query is None:
+                    cur.execute(StudentQueries.ESTIMATE_ROWS)
+                    estimate = cur.fetchone()['estimate']
+                    # reltuples is -1 until the table has been analyzed.
+                    return estimate if estimate >= 0 else None
+
+                cur.execute(query.sql, query.params)
+                plan = cur.fetchone()['QUERY PLAN'][0]['Plan']
+                return int(plan['Plan Rows'])
+
+    def get_facet_counts(self, search_term, filter_field, program_filter=None, year_filter=None, gender_filter=None, college_filter=None):
+        query = self.queries.facets(
+            search_term, filter_field,
+            self._filters(program_filter, year_filter, gender_filter, college_filter)
+        )
+
         with self.pool.connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(StudentQueries.CHECK_EXISTS, (student_id,))
-                return cur.fetchone() is not None
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute(query.sql, query.params, prepare=True)
+                return cur.fetchall()
 
     def create(self, data):
         with self.pool.connection() as conn:
@@ -96,6 +116,55 @@ class StudentRepository:
                 conn.commit()
                 return new_student
 
+    def bulk_import(self, rows, commit_if):
+        with self.pool.connection() as conn:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute(StudentQueries.CREATE_IMPORT_STAGING)
+                with cur.copy(StudentQueries.COPY_IMPORT_STAGING) as copy:
+                    for row in rows:
+                        copy.write_row(row)
+
+                cur.execute(StudentQueries.FIND_IMPORT_CONFLICTS)
+                conflicts = cur.fetchall()
+
+                if not commit_if(conflicts):
+                    conn.rollback()
+                    return 0, conflicts
+
+                if conflicts:
+                    cur.execute(
+                        StudentQueries.DISCARD_IMPORT_ROWS,
+                        ([c["row_number"] for c in conflicts],)
+                    )
+                cur.execute(StudentQueries.MERGE_IMPORT)
+                inserted = cur.rowcount
+                conn.commit()
+                return inserted, conflicts
+
+    def _batch_target(self, ids, search_term, filter_field, filters):
+        if ids is not None:
+            return StudentQueries.BATCH_TARGET_IDS, [list(ids)]
+        query = self.queries.keys(search_term, filter_field, filters)
+        return StudentQueries.BATCH_TARGET_FILTER.format(keys=query.sql), query.params
+
+    def batch_update(self, statement, params, ids=None, search_term="", filter_field="all", filters=None):
+        target, target_params = self._batch_target(ids, search_term, filter_field, filters)
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(statement.format(target=target), params + target_params)
+                affected = cur.rowcount
+                conn.commit()
+                return affected
+
+    def batch_promote(self, step, **selection):
+        return self.batch_update(StudentQueries.BATCH_PROMOTE, [step], **selection)
+
+    def batch_reassign(self, program_code, **selection):
+        return self.batch_update(StudentQueries.BATCH_REASSIGN, [program_code], **selection)
+
+    def batch_delete(self, **selection):
+        return self.batch_update(StudentQueries.BATCH_DELETE, [], **selection)
+
     def update(self, current_id, data):
         with self.pool.connection() as conn:
             with conn.cursor(row_factory=dict_row) as cur:
@@ -0,0 +1,39 @@
+from repository.async_auth_repo import AsyncUserRepository
+from services.auth_service import AuthService
+from utils.jwt_tokens import create_access_token
+from utils.tracing import trace_methods
+
+@trace_methods("service")
+class AsyncAuthService(AuthService):
+    user_repository_class = AsyncUserRepository
+
+    async def register_user(self, username, password, client_ip=None):
+        keys = self._register_keys(client_ip)
+        self.throttle.check(keys)
+        self.throttle.record(keys)
+
+        if await self.user_repo.get_by_username(username):
+            return {"error": "Username already exists"}, 400
+
+        # Hashing is deliberately slow CPU work; keep it off the event loop.
+        hashed_pw = await self.hasher.hash_async(password)
+
+        user_id = await self.user_repo.create(username, hashed_pw)
+        if user_id is None:
+            return {"error": "Username already exists"}, 400
+
+        return {"message": "Account created", "user_id": user_id}, 201
+
+    async def login_user(self, username, password, client_ip=None):
+        keys = self._login_keys(username, client_ip)
+        self.throttle.check(keys)
+
+        user_row = await self.user_repo.get_by_username(username)
+
+        if user_row and await self.hasher.verify_async(user_row[1], password):
+            self.throttle.reset(keys[0])
+            access_token = create_access_token(identity=str(user_row[0]))
+            return {"access_token": access_token}, 200
+
+        self.throttle.record(keys)
+        return {"error": "Invalid username or password"}, 401
@@ -0,0 +1,15 @@
+from repository.async_change_repo import AsyncChangeRepository
+from services.change_service import ChangeService
+from utils.tracing import trace_methods
+
+@trace_methods("service")
+class AsyncChangeService(ChangeService):
+    repository_class = AsyncChangeRepository
+
+    async def get_changes(self, since, limit, entities):
+        selected, invalid = self._validate(since, limit, entities)
+        if invalid:
+            return invalid
+
+        rows, bounds = await self.repo.get_since(since, selected, limit + 1)
+        return self._page(rows, bounds, since, limit)
@@ -0,0 +1,117 @@
+from psycopg.errors import ForeignKeyViolation, UniqueViolation
+from queries.builder import InvalidFields
+from repository.async_college_repo import AsyncCollegeRepository
+from services.async_recode_service import AsyncRecodeService
+from services.college_service import CollegeService
+from utils.pagination import InvalidCursor, decode_cursor
+from utils.tracing import trace_methods
+
+@trace_methods("service")
+class AsyncCollegeService(CollegeService):
+    repository_class = AsyncCollegeRepository
+    recode_service_class = AsyncRecodeService
+
+    async def get_all_colleges(self, page, limit, search, filter_by, sort_by, sort_desc, cursor=None, pagination_mode="offset", count_mode="exact", fields=None):
+        try:
+            fields = self.repo.queries.fields(fields)
+        except InvalidFields as e:
+            return {"error": str(e)}, 400
+
+        db_filter_field, db_sort_column, db_sort_dir = self._resolve_listing(search, filter_by, sort_by, sort_desc)
+
+        if pagination_mode == "cursor" or cursor:
+            if db_sort_column == 'relevance':
+                return {"error": "Relevance sorting is not available with cursor pagination"}, 400
+            return await self._get_colleges_by_cursor(
+                limit, search, db_filter_field, db_sort_column, db_sort_dir, cursor, count_mode, fields
+            )
+
+        offset = (page - 1) * limit
+        count_filters, known = await self._lookup_total(search, db_filter_field, count_mode)
+
+        colleges, total_records = await self.repo.get_paginated(
+            search,
+            db_filter_field,
+            db_sort_column,
+            db_sort_dir,
+            limit,
+            offset,
+            include_count=known is None,
+            fields=fields
+        )
+        return self._offset_page(colleges, self._store_total(count_filters, known, total_records), page, limit)
+
+    async def _lookup_total(self, search, db_filter_field, count_mode):
+        count_filters = self._count_filters(search, db_filter_field)
+        known = await self.counts.lookup_async(
+            "colleges", count_filters, count_mode,
+            lambda: self.repo.estimate_count(search, db_filter_field)
+        )
+        return count_filters, known
+
+    async def _get_colleges_by_cursor(self, limit, search, db_filter_field, db_sort_column, db_sort_dir, cursor, count_mode, fields):
+        cursor_values = None
+        direction = "next"
+        if cursor:
+            try:
+                cursor_values, direction = decode_cursor(cursor, db_sort_column, *self.repo.queries.cursor_kinds(db_sort_column))
+            except InvalidCursor as e:
+                return {"error": str(e)}, 400
+
+        count_filters, known = await self._lookup_total(search, db_filter_field, count_mode)
+        rows, total_records = await self.repo.get_keyset(
+            search,
+            db_filter_field,
+            db_sort_column,
+            db_sort_dir,
+            limit,
+            cursor_values,
+            direction,
+            include_count=known is None,
+            fields=fields
+        )
+        return self._cursor_page(
+            rows, limit, db_sort_column, direction, cursor_values,
+            self._store_total(count_filters, known, total_records)
+        )
+
+    async def get_colleges_snapshot(self):
+        return await self.snapshots.get_async("colleges", self.repo.get_all)
+
+    async def get_college(self, college_code, fields=None):
+        try:
+            fields = self.repo.queries.fields(fields)
+        except InvalidFields as e:
+            return {"error": str(e)}, 400
+
+        return self._found(await self.repo.get_by_code(college_code, fields))
+
+    async def create_college(self, data):
+        try:
+            new_college = await self.repo.create(data)
+        except UniqueViolation:
+            return {"error": "College Code already exists. Please use a different Code."}, 409
+
+        return self._created(new_college)
+
+    async def update_college(self, current_code, data):
+        if await self.recodes.busy(current_code, data["college_code"]):
+            return {"error": "College is being renamed. Try again when the rename finishes."}, 409
+
+        try:
+            updated_college = await self.repo.update(current_code, data)
+        except UniqueViolation:
+            return {"error": "College Code already exists. Please use a different Code."}, 409
+
+        return self._updated(current_code, data, updated_college)
+
+    async def delete_college(self, college_code):
+        if await self.recodes.busy(college_code):
+            return {"error": "College is being renamed. Try again when the rename finishes."}, 409
+
+        try:
+            deleted_college = await self.repo.delete(college_code)
+        except ForeignKeyViolation:
+            return {"error": "College still has programs"}, 409
+
+        return self._deleted(college_code, deleted_college)
@@ -0,0 +1,24 @@
+from services.image_service import ImageService
+from utils.tracing import trace_methods
+import asyncio
+
+@trace_methods("service")
+class AsyncImageService(ImageService):
+    async def store(self, data):
+        # Hashing, header checks and the storage write all block.
+        return await asyncio.to_thread(super().store, data)
+
+    async def get_image(self, image_hash, size=None, extension=""):
+        key, content_type = self._locate(image_hash, size, extension)
+        if key is None:
+            return {"error": "Image not found"}, 404
+
+        if size is not None and not await asyncio.to_thread(self.storage.exists, key):
+            original_key = await asyncio.to_thread(self._original_key, image_hash)
+            if original_key is None:
+                return {"error": "Image not found"}, 404
+            try:
+                await asyncio.wrap_future(self._schedule(image_hash, original_key))
+            except Exception:
+                return {"error": "Image could not be processed"}, 500
+        return await asyncio.to_thread(self._served, key, content_type)
@@ -0,0 +1,138 @@
+from psycopg.errors import LockNotAvailable, UniqueViolation
+from repository.async_recode_repo import AsyncRecodeRepository
+from services.recode_service import (
+    RECODE_BATCH_PAUSE_MS,
+    RECODE_LOCK_TIMEOUT_MS,
+    RECODE_MAX_RETRIES,
+    RECODE_RETRY_DELAY_MS,
+    RecodeAborted,
+    RecodeService,
+)
+from utils.tracing import trace_methods
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+@trace_methods("service")
+class AsyncRecodeService(RecodeService):
+    repository_class = AsyncRecodeRepository
+
+    def __init__(self, queries, batch_size, on_change):
+        super().__init__(queries, batch_size, on_change)
+        # Strong references keep running tasks from being garbage collected.
+        self._tasks = set()
+
+    async def preview(self, code, new_code):
+        invalid = self._validate(code, new_code)
+        if invalid:
+            return invalid
+
+        exists, target_taken, dependents = await self.repo.preview(code, new_code)
+        if not exists:
+            return {"error": f"{self.entity.capitalize()} not found"}, 404
+        return self._preview(code, new_code, target_taken, dependents, await self.repo.running_for(code))
+
+    async def busy(self, *codes):
+        for code in codes:
+            if await self.repo.running_for(code):
+                return True
+        return False
+
+    async def start(self, code, new_code):
+        invalid = self._validate(code, new_code)
+        if invalid:
+            return invalid
+
+        running = await self.repo.running_for(code) or await self.repo.running_for(new_code)
+        if running:
+            conflict = self._conflict(code, new_code, running)
+            if conflict:
+                return conflict
+            if self._stale(running):
+                self._launch(running)
+                return {"message": "Rename resumed", "job": self._job(running)}, 202
+            return {"message": "Rename already in progress", "job": self._job(running)}, 202
+
+        exists, target_taken, dependents = await self.repo.preview(code, new_code)
+        if not exists:
+            return {"error": f"{self.entity.capitalize()} not found"}, 404
+        if target_taken:
+            return {"error": f"{new_code} already exists"}, 409
+
+        try:
+            job = await self.repo.start(code, new_code, next(iter(dependents.values())))
+        except UniqueViolation:
+            return {"error": f"{new_code} already exists or is being renamed"}, 409
+        if job is None:
+            return {"error": f"{self.entity.capitalize()} not found"}, 404
+
+        self.on_change(code, new_code)
+        self._launch(job)
+        return {"message": "Rename started", "job": self._job(job)}, 202
+
+    async def get_job(self, job_id):
+        job = await self.repo.get_job(job_id)
+        if not job:
+            return {"error": "Rename job not found"}, 404
+        return self._job(job), 200
+
+    def _launch(self, job):
+        if job["id"] in self._active:
+            return
+        self._active.add(job["id"])
+        task = asyncio.create_task(self._run(job), name=f"recode-{job['id']}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _retry(self, job_id, attempt):
+        await self.repo.record_retry(job_id)
+        if attempt > RECODE_MAX_RETRIES:
+            raise RecodeAborted(f"Gave up after {RECODE_MAX_RETRIES} lock timeouts in a row")
+        await asyncio.sleep(RECODE_RETRY_DELAY_MS * attempt / 1000)
+
+    async def _drain(self, job_id, from_code, to_code, reverting=False):
+        attempt = 0
+        while True:
+            try:
+                moved = await self.repo.move_batch(job_id, from_code, to_code, self.batch_size, RECODE_LOCK_TIMEOUT_MS, reverting)
+            except LockNotAvailable:
+                attempt += 1
+                await self._retry(job_id, attempt)
+                continue
+
+            if moved:
+                attempt = 0
+            elif not await self.repo.has_dependents(from_code):
+                return
+            else:
+                attempt += 1
+                await self._retry(job_id, attempt)
+                continue
+            if RECODE_BATCH_PAUSE_MS:
+                await asyncio.sleep(RECODE_BATCH_PAUSE_MS / 1000)
+
+    async def _close(self, job_id, from_code, to_code, state, error):
+        attempt = 0
+        while True:
+            try:
+                return await self.repo.close(job_id, from_code, to_code, state, error, RECODE_LOCK_TIMEOUT_MS)
+            except LockNotAvailable:
+                attempt += 1
+                await self._retry(job_id, attempt)
+
+    async def _run(self, job):
+        job_id, old_code, new_code = job["id"], job["old_code"], job["new_code"]
+        try:
+            await self._drain(job_id, old_code, new_code)
+            await self._close(job_id, old_code, new_code, "done", None)
+        except Exception as e:
+            logger.exception("Renaming %s %s to %s failed; reverting", self.entity, old_code, new_code)
+            try:
+                await self._drain(job_id, new_code, old_code, reverting=True)
+                await self._close(job_id, new_code, old_code, "failed", str(e))
+            except Exception:
+                logger.exception("Reverting %s rename job %s failed; it will resume when restarted", self.entity, job_id)
+        finally:
+            self._active.discard(job_id)
+            self.on_change(old_code, new_code)
@@ -0,0 +1,13 @@
+from repository.async_stats_repo import AsyncStatsRepository
+from services.stats_service import ENROLLMENT_SNAPSHOT, StatsService
+from utils.tracing import trace_methods
+
+@trace_methods("service")
+class AsyncStatsService(StatsService):
+    repository_class = AsyncStatsRepository
+
+    async def get_enrollment_stats(self):
+        async def load():
+            return self._enrollment(await self.repo.get_enrollment_rollup())
+
+        return await self.snapshots.get_async(ENROLLMENT_SNAPSHOT, load)
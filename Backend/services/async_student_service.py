@@ -0,0 +1,202 @@
+from psycopg.errors import DataError, ForeignKeyViolation, UniqueViolation
+from queries.builder import InvalidFields
+from repository.async_student_repo import AsyncStudentRepository
+from services.student_service import EXPORT_BATCH_SIZE, EXPORT_COLUMNS, StudentService
+from utils.bulk_io import MalformedUpload, aiter_chunks, athread_batches
+from utils.pagination import InvalidCursor, decode_cursor
+from utils.tracing import trace_methods
+
+@trace_methods("service")
+class AsyncStudentService(StudentService):
+    repository_class = AsyncStudentRepository
+
+    async def get_all_students(self, page, limit, search, filter_by, sort_by, sort_desc, program_filter, year_filter, gender_filter, college_filter, cursor=None, pagination_mode="offset", count_mode="exact", fields=None):
+        try:
+            fields = self.repo.queries.fields(fields)
+        except InvalidFields as e:
+            return {"error": str(e)}, 400
+
+        db_filter_field, db_sort_column, db_sort_dir = self._resolve_listing(search, filter_by, sort_by, sort_desc)
+
+        if pagination_mode == "cursor" or cursor:
+            if db_sort_column == 'relevance':
+                return {"error": "Relevance sorting is not available with cursor pagination"}, 400
+            return await self._get_students_by_cursor(
+                limit, search, db_filter_field, db_sort_column, db_sort_dir, cursor, program_filter, year_filter, gender_filter, college_filter, count_mode, fields
+            )
+
+        offset = (page - 1) * limit
+        count_filters, known = await self._lookup_total(search, db_filter_field, program_filter, year_filter, gender_filter, college_filter, count_mode)
+
+        students, total_records = await self.repo.get_paginated(
+            search,
+            db_filter_field,
+            db_sort_column,
+            db_sort_dir,
+            limit,
+            offset,
+            program_filter,
+            year_filter,
+            gender_filter,
+            college_filter,
+            include_count=known is None,
+            fields=fields
+        )
+        return self._offset_page(students, self._store_total(count_filters, known, total_records), page, limit)
+
+    async def _lookup_total(self, search, db_filter_field, program_filter, year_filter, gender_filter, college_filter, count_mode):
+        count_filters = self._count_filters(search, db_filter_field, program_filter, year_filter, gender_filter, college_filter)
+        known = await self.counts.lookup_async(
+            "students", count_filters, count_mode,
+            lambda: self.repo.estimate_count(search, db_filter_field, program_filter, year_filter, gender_filter, college_filter)
+        )
+        return count_filters, known
+
+    async def _get_students_by_cursor(self, limit, search, db_filter_field, db_sort_column, db_sort_dir, cursor, program_filter, year_filter, gender_filter, college_filter, count_mode, fields):
+        cursor_values = None
+        direction = "next"
+        if cursor:
+            try:
+                cursor_values, direction = decode_cursor(cursor, db_sort_column, *self.repo.queries.cursor_kinds(db_sort_column))
+            except InvalidCursor as e:
+                return {"error": str(e)}, 400
+
+        count_filters, known = await self._lookup_total(search, db_filter_field, program_filter, year_filter, gender_filter, college_filter, count_mode)
+        rows, total_records = await self.repo.get_keyset(
+            search,
+            db_filter_field,
+            db_sort_column,
+            db_sort_dir,
+            limit,
+            cursor_values,
+            direction,
+            program_filter,
+            year_filter,
+            gender_filter,
+            college_filter,
+            include_count=known is None,
+            fields=fields
+        )
+        return self._cursor_page(
+            rows, limit, db_sort_column, direction, cursor_values,
+            self._store_total(count_filters, known, total_records)
+        )
+
+    async def get_student_facets(self, search, filter_by, program_filter, year_filter, gender_filter, college_filter):
+        if year_filter and not year_filter.isdigit():
+            return {"error": "year must be a number"}, 400
+
+        rows = await self.repo.get_facet_counts(
+            search,
+            self.COLUMN_MAP.get(filter_by, 'all'),
+            program_filter,
+            year_filter,
+            gender_filter,
+            college_filter
+        )
+        return self._facet_counts(rows)
+
+    async def export_students(self, fmt, search, filter_by, sort_by, sort_desc, program_filter, year_filter, gender_filter, college_filter):
+        db_filter_field, db_sort_column, db_sort_dir = self._resolve_listing(search, filter_by, sort_by, sort_desc)
+
+        batches = self.repo.iter_filtered(
+            search,
+            db_filter_field,
+            db_sort_column,
+            db_sort_dir,
+            program_filter,
+            year_filter,
+            gender_filter,
+            college_filter,
+            batch_size=EXPORT_BATCH_SIZE
+        )
+        return aiter_chunks(fmt, batches, EXPORT_COLUMNS), 200
+
+    async def get_student(self, student_id, fields=None):
+        try:
+            fields = self.repo.queries.fields(fields)
+        except InvalidFields as e:
+            return {"error": str(e)}, 400
+
+        return self._found(await self.repo.get_by_id(student_id, fields))
+
+    async def create_student(self, data):
+        try:
+            new_student = await self.repo.create(data)
+        except UniqueViolation:
+            return {"error": "Student ID already exists. Please use a different ID."}, 409
+        except ForeignKeyViolation:
+            return {"error": "Program code does not exist"}, 400
+
+        return self._created(new_student)
+
+    async def import_students(self, stream, fmt, mode, required_fields):
+        errors = []
+        progress = {"total_rows": 0}
+
+        try:
+            inserted, conflicts = await self.repo.bulk_import(
+                athread_batches(self._valid_import_rows(stream, fmt, required_fields, errors, progress)),
+                lambda conflicts: mode == "skip" or not (errors or conflicts)
+            )
+        except (MalformedUpload, UnicodeDecodeError) as e:
+            return {"error": f"Could not parse upload: {e}"}, 400
+        except DataError as e:
+            return {"error": f"Import rejected; no students were added: {e.diag.message_primary}"}, 400
+
+        return self._import_report(mode, progress["total_rows"], inserted, conflicts, errors)
+
+    async def update_student(self, current_id, data):
+        try:
+            updated_student = await self.repo.update(current_id, data)
+        except UniqueViolation:
+            return {"error": "Student ID already exists. Please use a different ID."}, 409
+        except ForeignKeyViolation:
+            return {"error": "Program code does not exist"}, 400
+
+        return self._updated(current_id, data, updated_student)
+
+    async def delete_student(self, student_id):
+        return self._deleted(student_id, await self.repo.delete(student_id))
+
+    async def update_student_image(self, student_id, image_url):
+        return self._image_changed(
+            student_id, await self.repo.update_image(student_id, image_url), "Student image updated successfully"
+        )
+
+    async def remove_student_image(self, student_id):
+        return self._image_changed(
+            student_id, await self.repo.update_image(student_id, None), "Student image removed successfully"
+        )
+
+    async def promote_students(self, payload):
+        selection, error = self._batch_selection(payload)
+        if error:
+            return error
+        step, error = self._batch_step(payload)
+        if error:
+            return error
+
+        return self._batch_done("promoted", await self.repo.batch_promote(step, **selection))
+
+    async def reassign_students(self, payload):
+        selection, error = self._batch_selection(payload)
+        if error:
+            return error
+        program_code = payload.get("program_code")
+        if not program_code or not isinstance(program_code, str):
+            return {"error": "program_code is required"}, 400
+
+        try:
+            affected = await self.repo.batch_reassign(program_code, **selection)
+        except ForeignKeyViolation:
+            return {"error": "Program code does not exist"}, 400
+
+        return self._batch_done("reassigned", affected)
+
+    async def delete_students(self, payload):
+        selection, error = self._batch_selection(payload)
+        if error:
+            return error
+
+        return self._batch_done("deleted", await self.repo.batch_delete(**selection))
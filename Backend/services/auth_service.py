@@ -1,33 +1,61 @@
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_jwt_extended import create_access_token
 from repository.auth_repo import UserRepository
+from utils.login_throttle import get_login_throttle
+from utils.password_hasher import get_password_hasher
+from utils.tracing import trace_methods
 
+@trace_methods("service")
 class AuthService:
+    user_repository_class = UserRepository
+
     def __init__(self):
-        self.user_repo = UserRepository()
+        self.user_repo = self.user_repository_class()
+        self.hasher = get_password_hasher()
+        self.throttle = get_login_throttle()
+
+    def _register_keys(self, client_ip):
+        return [("register", client_ip)] if client_ip else []
+
+    def _login_keys(self, username, client_ip):
+        keys = [("user", username.lower())]
+        if client_ip:
+            keys.append(("ip", client_ip))
+        return keys
+
+    def register_user(self, username, password, client_ip=None):
+        # 1. Refuse addresses creating accounts in bulk before doing any hashing
+        keys = self._register_keys(client_ip)
+        self.throttle.check(keys)
+        self.throttle.record(keys)
 
-    def register_user(self, username, password):
-        # 1. Check if user already exists
-        existing_user = self.user_repo.get_by_username(username)
-        if existing_user:
+        # 2. Check if user already exists, so taken names cost no hashing
+        if self.user_repo.get_by_username(username):
             return {"error": "Username already exists"}, 400
 
-        # 2. Hash password
-        hashed_pw = generate_password_hash(password)
+        # 3. Hash password in the worker pool
+        hashed_pw = self.hasher.hash(password)
 
-        # 3. Save to DB
+        # 4. Save to DB; the unique username index rejects concurrent duplicates
         user_id = self.user_repo.create(username, hashed_pw)
+        if user_id is None:
+            return {"error": "Username already exists"}, 400
         
         return {"message": "Account created", "user_id": user_id}, 201
 
-    def login_user(self, username, password):
-        # 1. Get user from DB
+    def login_user(self, username, password, client_ip=None):
+        # 1. Refuse accounts and addresses with too many recent failures
+        keys = self._login_keys(username, client_ip)
+        self.throttle.check(keys)
+
+        # 2. Get user from DB
         user_row = self.user_repo.get_by_username(username)
         
-        # 2. Validate password
-        if user_row and check_password_hash(user_row[1], password):
+        # 3. Validate password in the worker pool
+        if user_row and self.hasher.verify(user_row[1], password):
+            self.throttle.reset(keys[0])
             user_id = user_row[0]
             access_token = create_access_token(identity=str(user_id))
             return {"access_token": access_token}, 200
-            
-        return {"error": "Invalid username or password"}, 401
\ No newline at end of file
+
+        self.throttle.record(keys)
+        return {"error": "Invalid username or password"}, 401
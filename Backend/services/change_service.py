@@ -0,0 +1,56 @@
+from repository.change_repo import ChangeRepository
+from utils.tracing import trace_methods
+import os
+
+CHANGE_ENTITIES = ("student", "program", "college")
+CHANGE_FEED_LIMIT = int(os.getenv("CHANGE_FEED_LIMIT", "500"))
+CHANGE_FEED_MAX_LIMIT = int(os.getenv("CHANGE_FEED_MAX_LIMIT", "5000"))
+
+@trace_methods("service")
+class ChangeService:
+    repository_class = ChangeRepository
+
+    def __init__(self):
+        self.repo = self.repository_class()
+
+    def _validate(self, since, limit, entities):
+        if since < 0:
+            return None, ({"error": "since must not be negative"}, 400)
+        if not 0 <= limit <= CHANGE_FEED_MAX_LIMIT:
+            return None, ({"error": f"limit must be between 0 and {CHANGE_FEED_MAX_LIMIT}"}, 400)
+
+        selected = [e.strip() for e in entities.split(",") if e.strip()] if entities else list(CHANGE_ENTITIES)
+        unknown = sorted(set(selected) - set(CHANGE_ENTITIES))
+        if unknown:
+            return None, ({"error": f"Unknown entity: {', '.join(unknown)}. Allowed: {', '.join(CHANGE_ENTITIES)}"}, 400)
+        return selected, None
+
+    def _page(self, rows, bounds, since, limit):
+        latest = bounds["latest"]
+        # Changes before the oldest retained one were pruned, so a client
+        # that far behind has to reload everything.
+        if since < bounds["oldest"] - 1:
+            return {"error": "since is older than the retained change log; reload the full dataset", "latest": latest}, 410
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if has_more:
+            next_since = rows[-1]["seq"] if rows else since
+        else:
+            # Resuming from latest is safe even when the entity filter left
+            # nothing to return: no change at or below it can still appear.
+            next_since = max(since, latest)
+        return {
+            "changes": rows,
+            "next_since": next_since,
+            "has_more": has_more,
+            "latest": latest
+        }, 200
+
+    def get_changes(self, since, limit, entities):
+        selected, invalid = self._validate(since, limit, entities)
+        if invalid:
+            return invalid
+
+        rows, bounds = self.repo.get_since(since, selected, limit + 1)
+        return self._page(rows, bounds, since, limit)
@@ -1,70 +1,230 @@
+from psycopg.errors import ForeignKeyViolation, UniqueViolation
+from queries.builder import InvalidFields
+from queries.college_queries import CollegeQueries
 from repository.college_repo import CollegeRepository
+from services.recode_service import RECODE_COLLEGE_BATCH_SIZE, RecodeService
+from services.stats_service import ENROLLMENT_SNAPSHOT
+from utils.count_cache import get_count_cache, normalize_filters
+from utils.pagination import InvalidCursor, build_cursor_page, decode_cursor
+from utils.response_cache import get_response_cache
+from utils.snapshot_cache import get_snapshot_cache
+from utils.tracing import trace_methods
 import math
 
+REQUIRED_FIELDS = ["college_code", "college_name"]
+
+@trace_methods("service")
 class CollegeService:
+    repository_class = CollegeRepository
+    recode_service_class = RecodeService
+
     def __init__(self):
-        self.repo = CollegeRepository()
+        self.repo = self.repository_class()
+        self.counts = get_count_cache()
+        self.responses = get_response_cache()
+        self.snapshots = get_snapshot_cache()
+        self.recodes = self.recode_service_class(CollegeQueries.RECODE, RECODE_COLLEGE_BATCH_SIZE, self._code_changed)
         self.COLUMN_MAP = {
             'College Code': 'college_code',
             'College Name': 'college_name',
             'All': 'all'
         }
 
-    def get_all_colleges(self, page, limit, search, filter_by, sort_by, sort_desc):
+    def _resolve_listing(self, search, filter_by, sort_by, sort_desc):
         db_filter_field = self.COLUMN_MAP.get(filter_by, 'all')
         db_sort_column = self.COLUMN_MAP.get(sort_by, 'college_code')
         db_sort_dir = "DESC" if sort_desc == 'true' else "ASC"
 
+        if sort_by == 'Relevance' and search:
+            db_sort_column = 'relevance'
+
+        return db_filter_field, db_sort_column, db_sort_dir
+
+    def get_all_colleges(self, page, limit, search, filter_by, sort_by, sort_desc, cursor=None, pagination_mode="offset", count_mode="exact", fields=None):
+        try:
+            fields = self.repo.queries.fields(fields)
+        except InvalidFields as e:
+            return {"error": str(e)}, 400
+
+        db_filter_field, db_sort_column, db_sort_dir = self._resolve_listing(search, filter_by, sort_by, sort_desc)
+
+        if pagination_mode == "cursor" or cursor:
+            if db_sort_column == 'relevance':
+                return {"error": "Relevance sorting is not available with cursor pagination"}, 400
+            return self._get_colleges_by_cursor(
+                limit, search, db_filter_field, db_sort_column, db_sort_dir, cursor, count_mode, fields
+            )
+
         offset = (page - 1) * limit
+        count_filters, known = self._lookup_total(search, db_filter_field, count_mode)
 
         colleges, total_records = self.repo.get_paginated(
-            search, 
-            db_filter_field, 
-            db_sort_column, 
-            db_sort_dir, 
-            limit, 
-            offset
+            search,
+            db_filter_field,
+            db_sort_column,
+            db_sort_dir,
+            limit,
+            offset,
+            include_count=known is None,
+            fields=fields
         )
+        return self._offset_page(colleges, self._store_total(count_filters, known, total_records), page, limit)
 
+    def _offset_page(self, colleges, total, page, limit):
+        total_records, total_exact = total
         total_pages = math.ceil(total_records / limit) if limit > 0 else 1
-        
+
         return {
             "data": colleges,
             "pagination": {
                 "total_records": total_records,
+                "total_exact": total_exact,
                 "total_pages": total_pages,
                 "current_page": page,
                 "limit": limit
             }
         }, 200
 
-    def get_college(self, college_code):
-        college = self.repo.get_by_code(college_code)
+    def _count_filters(self, search, db_filter_field):
+        return normalize_filters(
+            search=search, field=db_filter_field if search else None
+        )
+
+    def _lookup_total(self, search, db_filter_field, count_mode):
+        count_filters = self._count_filters(search, db_filter_field)
+        known = self.counts.lookup(
+            "colleges", count_filters, count_mode,
+            lambda: self.repo.estimate_count(search, db_filter_field)
+        )
+        return count_filters, known
+
+    def _store_total(self, count_filters, known, counted):
+        if known is not None:
+            return known
+        self.counts.set("colleges", count_filters, counted)
+        return counted, True
+
+    def _get_colleges_by_cursor(self, limit, search, db_filter_field, db_sort_column, db_sort_dir, cursor, count_mode, fields):
+        cursor_values = None
+        direction = "next"
+        if cursor:
+            try:
+                cursor_values, direction = decode_cursor(cursor, db_sort_column, *self.repo.queries.cursor_kinds(db_sort_column))
+            except InvalidCursor as e:
+                return {"error": str(e)}, 400
+
+        count_filters, known = self._lookup_total(search, db_filter_field, count_mode)
+        rows, total_records = self.repo.get_keyset(
+            search,
+            db_filter_field,
+            db_sort_column,
+            db_sort_dir,
+            limit,
+            cursor_values,
+            direction,
+            include_count=known is None,
+            fields=fields
+        )
+        return self._cursor_page(
+            rows, limit, db_sort_column, direction, cursor_values,
+            self._store_total(count_filters, known, total_records)
+        )
+
+    def _cursor_page(self, rows, limit, db_sort_column, direction, cursor_values, total):
+        colleges, pagination = build_cursor_page(
+            rows, limit, db_sort_column, "college_code", direction, cursor_values is not None
+        )
+        pagination["total_records"], pagination["total_exact"] = total
+
+        return {
+            "data": colleges,
+            "pagination": pagination
+        }, 200
+
+    def get_colleges_snapshot(self):
+        return self.snapshots.get("colleges", self.repo.get_all)
+
+    def get_college(self, college_code, fields=None):
+        try:
+            fields = self.repo.queries.fields(fields)
+        except InvalidFields as e:
+            return {"error": str(e)}, 400
+
+        return self._found(self.repo.get_by_code(college_code, fields))
+
+    def _found(self, college):
         if not college:
             return {"error": "College not found"}, 404
         return college, 200
 
     def create_college(self, data):
-        if self.repo.exists(data["college_code"]):
+        try:
+            new_college = self.repo.create(data)
+        except UniqueViolation:
             return {"error": "College Code already exists. Please use a different Code."}, 409
-        
-        new_college = self.repo.create(data)
+
+        return self._created(new_college)
+
+    def _created(self, new_college):
+        self.counts.invalidate("colleges")
+        self.responses.invalidate("colleges")
+        self.snapshots.invalidate("colleges")
         return {"message": "College created successfully", "college": new_college}, 201
 
     def update_college(self, current_code, data):
-        if not self.repo.exists(current_code):
-            return {"error": "College not found"}, 404
+        if self.recodes.busy(current_code, data["college_code"]):
+            return {"error": "College is being renamed. Try again when the rename finishes."}, 409
+
+        try:
+            updated_college = self.repo.update(current_code, data)
+        except UniqueViolation:
+            return {"error": "College Code already exists. Please use a different Code."}, 409
+
+        return self._updated(current_code, data, updated_college)
 
-        if data["college_code"] != current_code:
-            if self.repo.exists(data["college_code"]):
-                return {"error": "College Code already exists. Please use a different Code."}, 409
+    def _updated(self, current_code, data, updated_college):
+        if not updated_college:
+            return {"error": "College not found"}, 404
 
-        updated_college = self.repo.update(current_code, data)
+        self._code_changed(current_code, data["college_code"])
         return {"message": "College updated successfully", "college": updated_college}, 200
 
+    def _code_changed(self, current_code, new_code):
+        self.counts.invalidate("colleges", "programs", "students")
+        self.responses.invalidate(
+            "colleges",
+            f"college:{current_code}",
+            f"college:{new_code}",
+            "programs",
+            "program-details",
+            "students",
+            "student-details"
+        )
+        self.snapshots.invalidate("colleges", "programs", ENROLLMENT_SNAPSHOT)
+
     def delete_college(self, college_code):
-        if not self.repo.exists(college_code):
+        if self.recodes.busy(college_code):
+            return {"error": "College is being renamed. Try again when the rename finishes."}, 409
+
+        try:
+            deleted_college = self.repo.delete(college_code)
+        except ForeignKeyViolation:
+            return {"error": "College still has programs"}, 409
+
+        return self._deleted(college_code, deleted_college)
+
+    def _deleted(self, college_code, deleted_college):
+        if not deleted_college:
             return {"error": "College not found"}, 404
-            
-        deleted_college = self.repo.delete(college_code)
-        return {"message": "College deleted successfully", "college": deleted_college}, 200
\ No newline at end of file
+
+        self.counts.invalidate("colleges", "programs", "students")
+        self.responses.invalidate(
+            "colleges",
+            f"college:{college_code}",
+            "programs",
+            "program-details",
+            "students",
+            "student-details"
+        )
+        self.snapshots.invalidate("colleges", "programs", ENROLLMENT_SNAPSHOT)
+        return {"message": "College deleted successfully", "college": deleted_college}, 200
@@ -0,0 +1,144 @@
+from concurrent.futures import ThreadPoolExecutor
+from utils.image_storage import get_image_storage
+from utils.images import (
+    IMAGE_FORMATS,
+    IMAGE_HASH,
+    IMAGE_THUMBNAIL_SIZES,
+    THUMBNAIL_EXTENSION,
+    THUMBNAIL_TYPE,
+    UnsupportedImage,
+    image_url,
+    inspect_image,
+    render_thumbnails,
+)
+from utils.tracing import trace_methods
+import hashlib
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+IMAGE_MAX_BYTES = int(os.getenv("IMAGE_MAX_BYTES", str(5 * 1024 * 1024)))
+# Pillow releases the GIL while decoding, resizing and encoding, so threads
+# are enough to keep thumbnails off the request threads.
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", str(min(4, os.cpu_count() or 1))))
+ORIGINAL_TYPES = {extension: content_type for extension, content_type in IMAGE_FORMATS.values()}
+
+
+@trace_methods("service")
+class ImageService:
+    def __init__(self):
+        self.storage = get_image_storage()
+        self._executor = None
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(IMAGE_WORKERS, thread_name_prefix="thumbnails")
+        return self._executor
+
+    def _thumbnail_keys(self, image_hash):
+        return {size: f"{image_hash}/{size}.{THUMBNAIL_EXTENSION}" for size in IMAGE_THUMBNAIL_SIZES}
+
+    def _original_key(self, image_hash):
+        for extension in ORIGINAL_TYPES:
+            key = f"{image_hash}/original.{extension}"
+            if self.storage.exists(key):
+                return key
+        return None
+
+    def _described(self, image_hash, extension, width, height):
+        return {
+            "hash": image_hash,
+            "url": image_url(image_hash, extension),
+            "width": width,
+            "height": height,
+            "thumbnails": {str(size): image_url(image_hash, THUMBNAIL_EXTENSION, size) for size in IMAGE_THUMBNAIL_SIZES}
+        }
+
+    def store(self, data):
+        if not data:
+            return {"error": "file is required"}, 400
+        if len(data) > IMAGE_MAX_BYTES:
+            return {"error": f"Images must be at most {IMAGE_MAX_BYTES} bytes"}, 413
+        try:
+            image_format, width, height = inspect_image(data)
+        except UnsupportedImage as e:
+            return {"error": str(e)}, 400
+
+        # Identical uploads share one stored copy and one set of thumbnails.
+        image_hash = hashlib.sha256(data).hexdigest()
+        extension = IMAGE_FORMATS[image_format][0]
+        key = f"{image_hash}/original.{extension}"
+        created = not self.storage.exists(key)
+        if created:
+            self.storage.write(key, data)
+
+        if not all(self.storage.exists(k) for k in self._thumbnail_keys(image_hash).values()):
+            self._schedule(image_hash, key, data)
+        return self._described(image_hash, extension, width, height), 201 if created else 200
+
+    def _schedule(self, image_hash, original_key, data=None):
+        with self._lock:
+            future = self._pending.get(image_hash)
+            if future is not None:
+                return future
+            future = self._get_executor().submit(self._render, image_hash, original_key, data)
+            self._pending[image_hash] = future
+        future.add_done_callback(lambda done: self._rendered(image_hash, done))
+        return future
+
+    def _render(self, image_hash, original_key, data):
+        if data is None:
+            data = self.storage.read(original_key)
+        keys = self._thumbnail_keys(image_hash)
+        for size, body in render_thumbnails(data).items():
+            self.storage.write(keys[size], body)
+
+    def _rendered(self, image_hash, future):
+        with self._lock:
+            self._pending.pop(image_hash, None)
+        if future.exception() is not None:
+            logger.error("Rendering thumbnails for image %s failed", image_hash, exc_info=future.exception())
+
+    def _locate(self, image_hash, size, extension):
+        if not IMAGE_HASH.fullmatch(image_hash):
+            return None, None
+        if size is None:
+            if extension not in ORIGINAL_TYPES:
+                return None, None
+            return f"{image_hash}/original.{extension}", ORIGINAL_TYPES[extension]
+        if size not in IMAGE_THUMBNAIL_SIZES or extension != THUMBNAIL_EXTENSION:
+            return None, None
+        return f"{image_hash}/{size}.{extension}", THUMBNAIL_TYPE
+
+    def _served(self, key, content_type):
+        path = self.storage.local_path(key)
+        if path is None and not self.storage.exists(key):
+            return {"error": "Image not found"}, 404
+        return {
+            "path": path,
+            "data": None if path else self.storage.read(key),
+            "content_type": content_type,
+            # Content never changes under a key, so the key is the validator.
+            "etag": key.replace("/", "-")
+        }, 200
+
+    def get_image(self, image_hash, size=None, extension=""):
+        key, content_type = self._locate(image_hash, size, extension)
+        if key is None:
+            return {"error": "Image not found"}, 404
+
+        if size is not None and not self.storage.exists(key):
+            # Still rendering, or rendered by a worker that went away: wait
+            # for (or start) the job rather than failing the request.
+            original_key = self._original_key(image_hash)
+            if original_key is None:
+                return {"error": "Image not found"}, 404
+            try:
+                self._schedule(image_hash, original_key).result()
+            except Exception:
+                return {"error": "Image could not be processed"}, 500
+        return self._served(key, content_type)
@@ -1,10 +1,30 @@
+from psycopg.errors import ForeignKeyViolation, UniqueViolation
+from queries.builder import InvalidFields
+from queries.program_queries import ProgramQueries
 from repository.program_repo import ProgramRepository
+from services.recode_service import RECODE_BATCH_SIZE, RecodeService
+from services.stats_service import ENROLLMENT_SNAPSHOT
+from utils.count_cache import get_count_cache, normalize_filters
+from utils.pagination import InvalidCursor, build_cursor_page, decode_cursor
+from utils.response_cache import get_response_cache
+from utils.snapshot_cache import get_snapshot_cache
+from utils.tracing import trace_methods
 import math
 
+REQUIRED_FIELDS = ["program_code", "program_name", "college_code"]
+
+@trace_methods("service")
 class ProgramService:
+    repository_class = ProgramRepository
+    recode_service_class = RecodeService
+
     def __init__(self):
-        self.repo = ProgramRepository()
-        
+        self.repo = self.repository_class()
+        self.counts = get_count_cache()
+        self.responses = get_response_cache()
+        self.snapshots = get_snapshot_cache()
+        self.recodes = self.recode_service_class(ProgramQueries.RECODE, RECODE_BATCH_SIZE, self._code_changed)
+
         self.COLUMN_MAP = {
             'Program Code': 'program_code',
             'Program Name': 'program_name',
@@ -12,61 +32,201 @@ class ProgramService:
             'All': 'all'
         }
 
-    def get_all_programs(self, page, limit, search, filter_by, sort_by, sort_desc):
+    def _resolve_listing(self, search, filter_by, sort_by, sort_desc):
         db_filter_field = self.COLUMN_MAP.get(filter_by, 'all')
         db_sort_column = self.COLUMN_MAP.get(sort_by, 'program_code')
         db_sort_dir = "DESC" if sort_desc == 'true' else "ASC"
 
+        if sort_by == 'Relevance' and search:
+            db_sort_column = 'relevance'
+
+        return db_filter_field, db_sort_column, db_sort_dir
+
+    def get_all_programs(self, page, limit, search, filter_by, sort_by, sort_desc, cursor=None, pagination_mode="offset", count_mode="exact", fields=None):
+        try:
+            fields = self.repo.queries.fields(fields)
+        except InvalidFields as e:
+            return {"error": str(e)}, 400
+
+        db_filter_field, db_sort_column, db_sort_dir = self._resolve_listing(search, filter_by, sort_by, sort_desc)
+
+        if pagination_mode == "cursor" or cursor:
+            if db_sort_column == 'relevance':
+                return {"error": "Relevance sorting is not available with cursor pagination"}, 400
+            return self._get_programs_by_cursor(
+                limit, search, db_filter_field, db_sort_column, db_sort_dir, cursor, count_mode, fields
+            )
+
         offset = (page - 1) * limit
+        count_filters, known = self._lookup_total(search, db_filter_field, count_mode)
 
         programs, total_records = self.repo.get_paginated(
-            search, 
-            db_filter_field, 
-            db_sort_column, 
-            db_sort_dir, 
-            limit, 
-            offset
+            search,
+            db_filter_field,
+            db_sort_column,
+            db_sort_dir,
+            limit,
+            offset,
+            include_count=known is None,
+            fields=fields
         )
+        return self._offset_page(programs, self._store_total(count_filters, known, total_records), page, limit)
 
+    def _offset_page(self, programs, total, page, limit):
+        total_records, total_exact = total
         total_pages = math.ceil(total_records / limit) if limit > 0 else 1
-        
+
         return {
             "data": programs,
             "pagination": {
                 "total_records": total_records,
+                "total_exact": total_exact,
                 "total_pages": total_pages,
                 "current_page": page,
                 "limit": limit
             }
         }, 200
 
-    def get_program(self, program_code):
-        program = self.repo.get_by_code(program_code)
+    def _count_filters(self, search, db_filter_field):
+        return normalize_filters(
+            search=search, field=db_filter_field if search else None
+        )
+
+    def _lookup_total(self, search, db_filter_field, count_mode):
+        count_filters = self._count_filters(search, db_filter_field)
+        known = self.counts.lookup(
+            "programs", count_filters, count_mode,
+            lambda: self.repo.estimate_count(search, db_filter_field)
+        )
+        return count_filters, known
+
+    def _store_total(self, count_filters, known, counted):
+        if known is not None:
+            return known
+        self.counts.set("programs", count_filters, counted)
+        return counted, True
+
+    def _get_programs_by_cursor(self, limit, search, db_filter_field, db_sort_column, db_sort_dir, cursor, count_mode, fields):
+        cursor_values = None
+        direction = "next"
+        if cursor:
+            try:
+                cursor_values, direction = decode_cursor(cursor, db_sort_column, *self.repo.queries.cursor_kinds(db_sort_column))
+            except InvalidCursor as e:
+                return {"error": str(e)}, 400
+
+        count_filters, known = self._lookup_total(search, db_filter_field, count_mode)
+        rows, total_records = self.repo.get_keyset(
+            search,
+            db_filter_field,
+            db_sort_column,
+            db_sort_dir,
+            limit,
+            cursor_values,
+            direction,
+            include_count=known is None,
+            fields=fields
+        )
+        return self._cursor_page(
+            rows, limit, db_sort_column, direction, cursor_values,
+            self._store_total(count_filters, known, total_records)
+        )
+
+    def _cursor_page(self, rows, limit, db_sort_column, direction, cursor_values, total):
+        programs, pagination = build_cursor_page(
+            rows, limit, db_sort_column, "program_code", direction, cursor_values is not None
+        )
+        pagination["total_records"], pagination["total_exact"] = total
+
+        return {
+            "data": programs,
+            "pagination": pagination
+        }, 200
+
+    def get_programs_snapshot(self):
+        return self.snapshots.get("programs", self.repo.get_all)
+
+    def get_program(self, program_code, fields=None):
+        try:
+            fields = self.repo.queries.fields(fields)
+        except InvalidFields as e:
+            return {"error": str(e)}, 400
+
+        return self._found(self.repo.get_by_code(program_code, fields))
+
+    def _found(self, program):
         if not program:
             return {"error": "Program not found"}, 404
         return program, 200
 
     def create_program(self, data):
-        if self.repo.exists(data["program_code"]):
+        try:
+            new_program = self.repo.create(data)
+        except UniqueViolation:
             return {"error": "Program Code already exists. Please use a different Code."}, 409
-        
-        new_program = self.repo.create(data)
+        except ForeignKeyViolation:
+            return {"error": "College code does not exist"}, 400
+
+        return self._created(new_program)
+
+    def _created(self, new_program):
+        self.counts.invalidate("programs")
+        self.responses.invalidate("programs")
+        self.snapshots.invalidate("programs")
         return {"message": "Program created successfully", "program": new_program}, 201
 
     def update_program(self, current_code, data):
-        if not self.repo.exists(current_code):
-            return {"error": "Program not found"}, 404
+        if self.recodes.busy(current_code, data["program_code"]):
+            return {"error": "Program is being renamed. Try again when the rename finishes."}, 409
+
+        try:
+            updated_program = self.repo.update(current_code, data)
+        except UniqueViolation:
+            return {"error": "Program Code already exists. Please use a different Code."}, 409
+        except ForeignKeyViolation:
+            return {"error": "College code does not exist"}, 400
+
+        return self._updated(current_code, data, updated_program)
 
-        if data["program_code"] != current_code:
-            if self.repo.exists(data["program_code"]):
-                return {"error": "Program Code already exists. Please use a different Code."}, 409
+    def _updated(self, current_code, data, updated_program):
+        if not updated_program:
+            return {"error": "Program not found"}, 404
 
-        updated_program = self.repo.update(current_code, data)
+        self._code_changed(current_code, data["program_code"])
         return {"message": "Program updated successfully", "program": updated_program}, 200
 
+    def _code_changed(self, current_code, new_code):
+        self.counts.invalidate("programs", "students")
+        self.responses.invalidate(
+            "programs",
+            f"program:{current_code}",
+            f"program:{new_code}",
+            "students",
+            "student-details"
+        )
+        self.snapshots.invalidate("programs", ENROLLMENT_SNAPSHOT)
+
     def delete_program(self, program_code):
-        if not self.repo.exists(program_code):
+        if self.recodes.busy(program_code):
+            return {"error": "Program is being renamed. Try again when the rename finishes."}, 409
+
+        try:
+            deleted_program = self.repo.delete(program_code)
+        except ForeignKeyViolation:
+            return {"error": "Program is still assigned to students"}, 409
+
+        return self._deleted(program_code, deleted_program)
+
+    def _deleted(self, program_code, deleted_program):
+        if not deleted_program:
             return {"error": "Program not found"}, 404
-            
-        deleted_program = self.repo.delete(program_code)
-        return {"message": "Program deleted successfully", "program": deleted_program}, 200
\ No newline at end of file
+
+        self.counts.invalidate("programs", "students")
+        self.responses.invalidate(
+            "programs",
+            f"program:{program_code}",
+            "students",
+            "student-details"
+        )
+        self.snapshots.invalidate("programs", ENROLLMENT_SNAPSHOT)
+        return {"message": "Program deleted successfully", "program": deleted_program}, 200
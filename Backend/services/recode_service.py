@@ -0,0 +1,190 @@
+from datetime import datetime, timezone
+from psycopg.errors import LockNotAvailable, UniqueViolation
+from repository.recode_repo import RecodeRepository
+from utils.tracing import trace_methods
+import logging
+import math
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Dependents moved per transaction. College renames move programs, and each
+# program drags its students' search documents along, so they go slower.
+RECODE_BATCH_SIZE = int(os.getenv("RECODE_BATCH_SIZE", "500"))
+RECODE_COLLEGE_BATCH_SIZE = int(os.getenv("RECODE_COLLEGE_BATCH_SIZE", "5"))
+RECODE_LOCK_TIMEOUT_MS = int(os.getenv("RECODE_LOCK_TIMEOUT_MS", "2000"))
+# Consecutive lock timeouts tolerated before the rename is rolled back.
+RECODE_MAX_RETRIES = int(os.getenv("RECODE_MAX_RETRIES", "10"))
+RECODE_RETRY_DELAY_MS = int(os.getenv("RECODE_RETRY_DELAY_MS", "200"))
+# Optional breather between batches for concurrent writers.
+RECODE_BATCH_PAUSE_MS = int(os.getenv("RECODE_BATCH_PAUSE_MS", "0"))
+# A running job that has not progressed for this long has lost its worker
+# and may be resumed by starting the same rename again.
+RECODE_STALE_SECONDS = int(os.getenv("RECODE_STALE_SECONDS", "120"))
+
+
+class RecodeAborted(Exception):
+    pass
+
+
+@trace_methods("service")
+class RecodeService:
+    repository_class = RecodeRepository
+
+    def __init__(self, queries, batch_size, on_change):
+        self.repo = self.repository_class(queries)
+        self.entity = queries.entity
+        self.batch_size = batch_size
+        # Called with (old_code, new_code) whenever the visible data changes.
+        self.on_change = on_change
+        self._active = set()
+        self._lock = threading.Lock()
+
+    def _validate(self, code, new_code):
+        if not new_code:
+            return {"error": "new_code is required"}, 400
+        if new_code == code:
+            return {"error": "new_code must differ from the current code"}, 400
+        return None
+
+    def _job(self, job):
+        job["percent"] = round(100 * job["moved"] / job["total"], 1) if job["total"] else 100.0
+        return job
+
+    def _stale(self, job):
+        age = (datetime.now(timezone.utc) - job["updated_at"]).total_seconds()
+        return job["id"] not in self._active and age >= RECODE_STALE_SECONDS
+
+    def _preview(self, code, new_code, target_taken, dependents, running):
+        total = next(iter(dependents.values()))
+        return {
+            "entity": self.entity,
+            "current_code": code,
+            "new_code": new_code,
+            "dependents": dependents,
+            "batch_size": self.batch_size,
+            "batches": math.ceil(total / self.batch_size),
+            "target_available": not target_taken,
+            "running_job": self._job(running) if running else None
+        }, 200
+
+    def preview(self, code, new_code):
+        invalid = self._validate(code, new_code)
+        if invalid:
+            return invalid
+
+        exists, target_taken, dependents = self.repo.preview(code, new_code)
+        if not exists:
+            return {"error": f"{self.entity.capitalize()} not found"}, 404
+        return self._preview(code, new_code, target_taken, dependents, self.repo.running_for(code))
+
+    def busy(self, *codes):
+        return any(self.repo.running_for(code) for code in codes)
+
+    def _conflict(self, code, new_code, running):
+        if running["old_code"] != code or running["new_code"] != new_code:
+            return {"error": f"{running['old_code']} is already being renamed to {running['new_code']}"}, 409
+        return None
+
+    def start(self, code, new_code):
+        invalid = self._validate(code, new_code)
+        if invalid:
+            return invalid
+
+        running = self.repo.running_for(code) or self.repo.running_for(new_code)
+        if running:
+            conflict = self._conflict(code, new_code, running)
+            if conflict:
+                return conflict
+            # Starting the same rename again reports on it, or resumes it
+            # if its worker went away.
+            if self._stale(running):
+                self._launch(running)
+                return {"message": "Rename resumed", "job": self._job(running)}, 202
+            return {"message": "Rename already in progress", "job": self._job(running)}, 202
+
+        exists, target_taken, dependents = self.repo.preview(code, new_code)
+        if not exists:
+            return {"error": f"{self.entity.capitalize()} not found"}, 404
+        if target_taken:
+            return {"error": f"{new_code} already exists"}, 409
+
+        try:
+            job = self.repo.start(code, new_code, next(iter(dependents.values())))
+        except UniqueViolation:
+            return {"error": f"{new_code} already exists or is being renamed"}, 409
+        if job is None:
+            return {"error": f"{self.entity.capitalize()} not found"}, 404
+
+        self.on_change(code, new_code)
+        self._launch(job)
+        return {"message": "Rename started", "job": self._job(job)}, 202
+
+    def get_job(self, job_id):
+        job = self.repo.get_job(job_id)
+        if not job:
+            return {"error": "Rename job not found"}, 404
+        return self._job(job), 200
+
+    def _launch(self, job):
+        with self._lock:
+            if job["id"] in self._active:
+                return
+            self._active.add(job["id"])
+        threading.Thread(target=self._run, args=(job,), name=f"recode-{job['id']}", daemon=True).start()
+
+    def _retry(self, job_id, attempt):
+        self.repo.record_retry(job_id)
+        if attempt > RECODE_MAX_RETRIES:
+            raise RecodeAborted(f"Gave up after {RECODE_MAX_RETRIES} lock timeouts in a row")
+        time.sleep(RECODE_RETRY_DELAY_MS * attempt / 1000)
+
+    def _drain(self, job_id, from_code, to_code, reverting=False):
+        attempt = 0
+        while True:
+            try:
+                moved = self.repo.move_batch(job_id, from_code, to_code, self.batch_size, RECODE_LOCK_TIMEOUT_MS, reverting)
+            except LockNotAvailable:
+                attempt += 1
+                self._retry(job_id, attempt)
+                continue
+
+            if moved:
+                attempt = 0
+            elif not self.repo.has_dependents(from_code):
+                return
+            else:
+                # Everything left is locked by concurrent edits; wait them out.
+                attempt += 1
+                self._retry(job_id, attempt)
+                continue
+            if RECODE_BATCH_PAUSE_MS:
+                time.sleep(RECODE_BATCH_PAUSE_MS / 1000)
+
+    def _close(self, job_id, from_code, to_code, state, error):
+        attempt = 0
+        while True:
+            try:
+                return self.repo.close(job_id, from_code, to_code, state, error, RECODE_LOCK_TIMEOUT_MS)
+            except LockNotAvailable:
+                attempt += 1
+                self._retry(job_id, attempt)
+
+    def _run(self, job):
+        job_id, old_code, new_code = job["id"], job["old_code"], job["new_code"]
+        try:
+            self._drain(job_id, old_code, new_code)
+            self._close(job_id, old_code, new_code, "done", None)
+        except Exception as e:
+            logger.exception("Renaming %s %s to %s failed; reverting", self.entity, old_code, new_code)
+            try:
+                self._drain(job_id, new_code, old_code, reverting=True)
+                self._close(job_id, new_code, old_code, "failed", str(e))
+            except Exception:
+                logger.exception("Reverting %s rename job %s failed; it will resume when restarted", self.entity, job_id)
+        finally:
+            with self._lock:
+                self._active.discard(job_id)
+            self.on_change(old_code, new_code)
@@ -0,0 +1,39 @@
+from repository.stats_repo import StatsRepository
+from utils.snapshot_cache import get_snapshot_cache
+from utils.tracing import trace_methods
+
+ENROLLMENT_SNAPSHOT = "enrollment-stats"
+
+# dimension -> (response key, columns identifying a bucket)
+ENROLLMENT_DIMENSIONS = {
+    "college": ("by_college", ["college_code"]),
+    "program": ("by_program", ["program_code", "college_code"]),
+    "year": ("by_year", ["year_level"]),
+    "gender": ("by_gender", ["gender"]),
+}
+
+@trace_methods("service")
+class StatsService:
+    repository_class = StatsRepository
+
+    def __init__(self):
+        self.repo = self.repository_class()
+        self.snapshots = get_snapshot_cache()
+
+    def get_enrollment_stats(self):
+        return self.snapshots.get(
+            ENROLLMENT_SNAPSHOT, lambda: self._enrollment(self.repo.get_enrollment_rollup())
+        )
+
+    def _enrollment(self, rows):
+        stats = {key: [] for key, _ in ENROLLMENT_DIMENSIONS.values()}
+        stats["total"] = 0
+
+        for row in rows:
+            if row["dimension"] == "total":
+                stats["total"] = row["count"]
+                continue
+            key, columns = ENROLLMENT_DIMENSIONS[row["dimension"]]
+            stats[key].append({**{c: row[c] for c in columns}, "count": row["count"]})
+
+        return stats
@@ -1,9 +1,45 @@
+from psycopg.errors import DataError, ForeignKeyViolation, UniqueViolation
+from queries.builder import TOTAL_FACET, InvalidFields
 from repository.student_repo import StudentRepository
+from services.stats_service import ENROLLMENT_SNAPSHOT
+from utils.bulk_io import RECORD_READERS, MalformedUpload, iter_chunks
+from utils.count_cache import get_count_cache, normalize_filters
+from utils.images import with_thumbnail
+from utils.pagination import InvalidCursor, build_cursor_page, decode_cursor
+from utils.response_cache import get_response_cache
+from utils.snapshot_cache import get_snapshot_cache
+from utils.tracing import trace_methods
 import math
+import os
 
+MAX_REPORTED_IMPORT_ERRORS = 1000
+BATCH_MAX_IDS = int(os.getenv("BATCH_MAX_IDS", "10000"))
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+EXPORT_COLUMNS = [
+    "student_id", "first_name", "last_name", "year_level",
+    "gender", "program_code", "college_code", "image_url"
+]
+REQUIRED_FIELDS = ["student_id", "first_name", "last_name", "year_level", "gender", "program_code"]
+IMPORT_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson"
+}
+IMPORT_MODES = ("atomic", "skip")
+EXPORT_MIMETYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson"
+}
+
+@trace_methods("service")
 class StudentService:
+    repository_class = StudentRepository
+
     def __init__(self):
-        self.repo = StudentRepository()
+        self.repo = self.repository_class()
+        self.counts = get_count_cache()
+        self.responses = get_response_cache()
+        self.snapshots = get_snapshot_cache()
         self.COLUMN_MAP = {
             'ID': 'student_id',
             'First Name': 'first_name',
@@ -11,83 +47,414 @@ class StudentService:
             'Year': 'year_level',
             'Gender': 'gender',
             'Program': 'program_code',
-            'All': 'all' 
+            'All': 'all'
         }
 
-    def get_all_students(self, page, limit, search, filter_by, sort_by, sort_desc, program_filter, year_filter, gender_filter, college_filter):
+    def _resolve_listing(self, search, filter_by, sort_by, sort_desc):
         db_filter_field = self.COLUMN_MAP.get(filter_by, 'all')
         db_sort_column = self.COLUMN_MAP.get(sort_by, 'student_id')
         db_sort_dir = "DESC" if sort_desc == 'true' else "ASC"
 
+        if sort_by == 'Relevance' and search:
+            db_sort_column = 'relevance'
+
+        return db_filter_field, db_sort_column, db_sort_dir
+
+    def get_all_students(self, page, limit, search, filter_by, sort_by, sort_desc, program_filter, year_filter, gender_filter, college_filter, cursor=None, pagination_mode="offset", count_mode="exact", fields=None):
+        try:
+            fields = self.repo.queries.fields(fields)
+        except InvalidFields as e:
+            return {"error": str(e)}, 400
+
+        db_filter_field, db_sort_column, db_sort_dir = self._resolve_listing(search, filter_by, sort_by, sort_desc)
+
+        if pagination_mode == "cursor" or cursor:
+            if db_sort_column == 'relevance':
+                return {"error": "Relevance sorting is not available with cursor pagination"}, 400
+            return self._get_students_by_cursor(
+                limit, search, db_filter_field, db_sort_column, db_sort_dir, cursor, program_filter, year_filter, gender_filter, college_filter, count_mode, fields
+            )
+
         offset = (page - 1) * limit
+        count_filters, known = self._lookup_total(search, db_filter_field, program_filter, year_filter, gender_filter, college_filter, count_mode)
 
         students, total_records = self.repo.get_paginated(
-            search, 
-            db_filter_field, 
-            db_sort_column, 
-            db_sort_dir, 
-            limit, 
+            search,
+            db_filter_field,
+            db_sort_column,
+            db_sort_dir,
+            limit,
             offset,
             program_filter,
-            year_filter,   
+            year_filter,
             gender_filter,
-            college_filter  
+            college_filter,
+            include_count=known is None,
+            fields=fields
         )
+        return self._offset_page(students, self._store_total(count_filters, known, total_records), page, limit)
 
+    def _offset_page(self, students, total, page, limit):
+        total_records, total_exact = total
         total_pages = math.ceil(total_records / limit) if limit > 0 else 1
-        
+
         return {
-            "data": students,
+            "data": [with_thumbnail(student) for student in students],
             "pagination": {
                 "total_records": total_records,
+                "total_exact": total_exact,
                 "total_pages": total_pages,
                 "current_page": page,
                 "limit": limit
             }
         }, 200
 
-    def get_student(self, student_id):
-        student = self.repo.get_by_id(student_id)
+    def _count_filters(self, search, db_filter_field, program_filter, year_filter, gender_filter, college_filter):
+        return normalize_filters(
+            search=search, field=db_filter_field if search else None,
+            program=program_filter, year=year_filter, gender=gender_filter, college=college_filter
+        )
+
+    def _lookup_total(self, search, db_filter_field, program_filter, year_filter, gender_filter, college_filter, count_mode):
+        count_filters = self._count_filters(search, db_filter_field, program_filter, year_filter, gender_filter, college_filter)
+        known = self.counts.lookup(
+            "students", count_filters, count_mode,
+            lambda: self.repo.estimate_count(search, db_filter_field, program_filter, year_filter, gender_filter, college_filter)
+        )
+        return count_filters, known
+
+    def _store_total(self, count_filters, known, counted):
+        if known is not None:
+            return known
+        self.counts.set("students", count_filters, counted)
+        return counted, True
+
+    def _get_students_by_cursor(self, limit, search, db_filter_field, db_sort_column, db_sort_dir, cursor, program_filter, year_filter, gender_filter, college_filter, count_mode, fields):
+        cursor_values = None
+        direction = "next"
+        if cursor:
+            try:
+                cursor_values, direction = decode_cursor(cursor, db_sort_column, *self.repo.queries.cursor_kinds(db_sort_column))
+            except InvalidCursor as e:
+                return {"error": str(e)}, 400
+
+        count_filters, known = self._lookup_total(search, db_filter_field, program_filter, year_filter, gender_filter, college_filter, count_mode)
+        rows, total_records = self.repo.get_keyset(
+            search,
+            db_filter_field,
+            db_sort_column,
+            db_sort_dir,
+            limit,
+            cursor_values,
+            direction,
+            program_filter,
+            year_filter,
+            gender_filter,
+            college_filter,
+            include_count=known is None,
+            fields=fields
+        )
+        return self._cursor_page(
+            rows, limit, db_sort_column, direction, cursor_values,
+            self._store_total(count_filters, known, total_records)
+        )
+
+    def _cursor_page(self, rows, limit, db_sort_column, direction, cursor_values, total):
+        students, pagination = build_cursor_page(
+            rows, limit, db_sort_column, "student_id", direction, cursor_values is not None
+        )
+        pagination["total_records"], pagination["total_exact"] = total
+
+        return {
+            "data": [with_thumbnail(student) for student in students],
+            "pagination": pagination
+        }, 200
+
+    def get_student_facets(self, search, filter_by, program_filter, year_filter, gender_filter, college_filter):
+        if year_filter and not year_filter.isdigit():
+            return {"error": "year must be a number"}, 400
+
+        rows = self.repo.get_facet_counts(
+            search,
+            self.COLUMN_MAP.get(filter_by, 'all'),
+            program_filter,
+            year_filter,
+            gender_filter,
+            college_filter
+        )
+        return self._facet_counts(rows)
+
+    def _facet_counts(self, rows):
+        facets = {name: [] for name in self.repo.queries.spec.filter_columns}
+        total = 0
+        for row in rows:
+            if row["facet"] == TOTAL_FACET:
+                total = row["count"]
+            else:
+                facets[row["facet"]].append({"value": row["value"], "count": row["count"]})
+
+        return {"facets": facets, "total": total}, 200
+
+    def export_students(self, fmt, search, filter_by, sort_by, sort_desc, program_filter, year_filter, gender_filter, college_filter):
+        db_filter_field, db_sort_column, db_sort_dir = self._resolve_listing(search, filter_by, sort_by, sort_desc)
+
+        batches = self.repo.iter_filtered(
+            search,
+            db_filter_field,
+            db_sort_column,
+            db_sort_dir,
+            program_filter,
+            year_filter,
+            gender_filter,
+            college_filter,
+            batch_size=EXPORT_BATCH_SIZE
+        )
+        return iter_chunks(fmt, batches, EXPORT_COLUMNS), 200
+
+    def get_student(self, student_id, fields=None):
+        try:
+            fields = self.repo.queries.fields(fields)
+        except InvalidFields as e:
+            return {"error": str(e)}, 400
+
+        return self._found(self.repo.get_by_id(student_id, fields))
+
+    def _found(self, student):
         if not student:
             return {"error": "Student not found"}, 404
-        return student, 200
+        return with_thumbnail(student), 200
 
     def create_student(self, data):
-        if self.repo.exists(data["student_id"]):
+        try:
+            new_student = self.repo.create(data)
+        except UniqueViolation:
             return {"error": "Student ID already exists. Please use a different ID."}, 409
-        
-        new_student = self.repo.create(data)
+        except ForeignKeyViolation:
+            return {"error": "Program code does not exist"}, 400
+
+        return self._created(new_student)
+
+    def _created(self, new_student):
+        self.counts.invalidate("students")
+        self.snapshots.invalidate(ENROLLMENT_SNAPSHOT)
+        self.responses.invalidate("students")
         return {"message": "Student created successfully", "student": new_student}, 201
 
+    def import_students(self, stream, fmt, mode, required_fields):
+        errors = []
+        progress = {"total_rows": 0}
+
+        try:
+            inserted, conflicts = self.repo.bulk_import(
+                self._valid_import_rows(stream, fmt, required_fields, errors, progress),
+                lambda conflicts: mode == "skip" or not (errors or conflicts)
+            )
+        except (MalformedUpload, UnicodeDecodeError) as e:
+            return {"error": f"Could not parse upload: {e}"}, 400
+        except DataError as e:
+            # Values the database rejects (e.g. over-long IDs) abort the whole merge.
+            return {"error": f"Import rejected; no students were added: {e.diag.message_primary}"}, 400
+
+        return self._import_report(mode, progress["total_rows"], inserted, conflicts, errors)
+
+    def _valid_import_rows(self, stream, fmt, required_fields, errors, progress):
+        for row_number, record, error in RECORD_READERS[fmt](stream):
+            progress["total_rows"] = row_number
+            if error is None:
+                row, row_errors = self._validate_import_record(record, required_fields)
+            else:
+                row, row_errors = None, [error]
+
+            if row_errors:
+                errors.append({"row": row_number, "errors": row_errors})
+                continue
+            yield (row_number,) + row
+
+    def _import_report(self, mode, total_rows, inserted, conflicts, errors):
+        for conflict in conflicts:
+            errors.append({"row": conflict["row_number"], "errors": self._describe_conflict(conflict)})
+        errors.sort(key=lambda e: e["row"])
+
+        report = {
+            "mode": mode,
+            "total_rows": total_rows,
+            "inserted": inserted,
+            "rejected": len(errors),
+            "errors": errors[:MAX_REPORTED_IMPORT_ERRORS],
+            "errors_truncated": len(errors) > MAX_REPORTED_IMPORT_ERRORS
+        }
+
+        if mode == "atomic" and errors:
+            return {"error": "Import rejected; no students were added", **report}, 400
+
+        if inserted:
+            self.counts.invalidate("students")
+            self.snapshots.invalidate(ENROLLMENT_SNAPSHOT)
+            self.responses.invalidate("students")
+        return {"message": "Import completed", **report}, 201 if inserted else 200
+
+    def _validate_import_record(self, record, required_fields):
+        values = {}
+        row_errors = []
+        for f in required_fields:
+            value = record.get(f)
+            value = value.strip() if isinstance(value, str) else value
+            if value in (None, ""):
+                row_errors.append(f"{f} is required")
+            values[f] = value
+
+        if values.get("year_level") not in (None, ""):
+            try:
+                values["year_level"] = int(values["year_level"])
+            except (TypeError, ValueError):
+                row_errors.append("year_level must be an integer")
+
+        if row_errors:
+            return None, row_errors
+
+        return (
+            str(values["student_id"]), str(values["first_name"]), str(values["last_name"]),
+            values["year_level"], str(values["gender"]), str(values["program_code"])
+        ), []
+
+    def _describe_conflict(self, conflict):
+        messages = []
+        if conflict["id_exists"]:
+            messages.append("Student ID already exists")
+        if conflict["duplicate"]:
+            messages.append("Student ID appears earlier in this upload")
+        if conflict["missing_program"]:
+            messages.append(f"Program code '{conflict['program_code']}' does not exist")
+        return messages
+
     def update_student(self, current_id, data):
+        try:
+            updated_student = self.repo.update(current_id, data)
+        except UniqueViolation:
+            return {"error": "Student ID already exists. Please use a different ID."}, 409
+        except ForeignKeyViolation:
+            return {"error": "Program code does not exist"}, 400
 
-        if not self.repo.exists(current_id):
-            return {"error": "Student not found"}, 404
+        return self._updated(current_id, data, updated_student)
 
-        if data["student_id"] != current_id:
-            if self.repo.exists(data["student_id"]):
-                return {"error": "Student ID already exists. Please use a different ID."}, 409
+    def _updated(self, current_id, data, updated_student):
+        if not updated_student:
+            return {"error": "Student not found"}, 404
 
-        updated_student = self.repo.update(current_id, data)
+        self.counts.invalidate("students")
+        self.snapshots.invalidate(ENROLLMENT_SNAPSHOT)
+        self.responses.invalidate(
+            "students",
+            f"student:{current_id}",
+            f"student:{data['student_id']}"
+        )
         return {"message": "Student updated successfully", "student": updated_student}, 200
 
     def delete_student(self, student_id):
-        if not self.repo.exists(student_id):
+        return self._deleted(student_id, self.repo.delete(student_id))
+
+    def _deleted(self, student_id, deleted_student):
+        if not deleted_student:
             return {"error": "Student not found"}, 404
-            
-        deleted_student = self.repo.delete(student_id)
+
+        self.counts.invalidate("students")
+        self.snapshots.invalidate(ENROLLMENT_SNAPSHOT)
+        self.responses.invalidate("students", f"student:{student_id}")
         return {"message": "Student deleted successfully", "student": deleted_student}, 200
 
     def update_student_image(self, student_id, image_url):
-        if not self.repo.exists(student_id):
-            return {"error": "Student not found"}, 404
-            
-        updated_student = self.repo.update_image(student_id, image_url)
-        return {"message": "Student image updated successfully", "student": updated_student}, 200
-    
+        return self._image_changed(
+            student_id, self.repo.update_image(student_id, image_url), "Student image updated successfully"
+        )
+
     def remove_student_image(self, student_id):
-        if not self.repo.exists(student_id):
+        return self._image_changed(
+            student_id, self.repo.update_image(student_id, None), "Student image removed successfully"
+        )
+
+    def _image_changed(self, student_id, updated_student, message):
+        if not updated_student:
             return {"error": "Student not found"}, 404
-            
-        updated_student = self.repo.update_image(student_id, None)
-        return {"message": "Student image removed successfully", "student": updated_student}, 200
\ No newline at end of file
+
+        self.responses.invalidate("students", f"student:{student_id}")
+        return {"message": message, "student": with_thumbnail(updated_student)}, 200
+
+    def _batch_selection(self, payload):
+        ids = payload.get("ids")
+        selector = payload.get("filter")
+        if (ids is None) == (selector is None):
+            return None, ({"error": "Provide either ids or filter"}, 400)
+
+        if ids is not None:
+            if not isinstance(ids, list) or not ids or not all(isinstance(i, str) and i for i in ids):
+                return None, ({"error": "ids must be a non-empty list of student IDs"}, 400)
+            if len(ids) > BATCH_MAX_IDS:
+                return None, ({"error": f"At most {BATCH_MAX_IDS} ids can be sent per batch; use filter instead"}, 400)
+            return {"ids": list(dict.fromkeys(ids))}, None
+
+        if not isinstance(selector, dict):
+            return None, ({"error": "filter must be an object"}, 400)
+
+        search = str(selector.get("query") or "").strip()
+        filters = {
+            "program": str(selector.get("program") or "").strip(),
+            "year": str(selector.get("year") or "").strip(),
+            "gender": str(selector.get("gender") or "").strip(),
+            "college": str(selector.get("college") or "").strip(),
+        }
+        if filters["year"] and not filters["year"].isdigit():
+            return None, ({"error": "filter.year must be a number"}, 400)
+        # An empty filter would rewrite every student; make that explicit via ids.
+        if not search and not any(filters.values()):
+            return None, ({"error": "filter must include query, program, year, gender or college"}, 400)
+
+        return {
+            "search_term": search,
+            "filter_field": self.COLUMN_MAP.get(selector.get("filterBy", "All"), 'all'),
+            "filters": filters,
+        }, None
+
+    def _batch_step(self, payload):
+        step = payload.get("step", 1)
+        if not isinstance(step, int) or isinstance(step, bool) or step == 0:
+            return None, ({"error": "step must be a non-zero integer"}, 400)
+        return step, None
+
+    def _batch_done(self, verb, affected):
+        if affected:
+            self.counts.invalidate("students")
+            self.snapshots.invalidate(ENROLLMENT_SNAPSHOT)
+            self.responses.invalidate("students", "student-details")
+        return {"message": f"{affected} students {verb}", "affected": affected}, 200
+
+    def promote_students(self, payload):
+        selection, error = self._batch_selection(payload)
+        if error:
+            return error
+        step, error = self._batch_step(payload)
+        if error:
+            return error
+
+        return self._batch_done("promoted", self.repo.batch_promote(step, **selection))
+
+    def reassign_students(self, payload):
+        selection, error = self._batch_selection(payload)
+        if error:
+            return error
+        program_code = payload.get("program_code")
+        if not program_code or not isinstance(program_code, str):
+            return {"error": "program_code is required"}, 400
+
+        try:
+            affected = self.repo.batch_reassign(program_code, **selection)
+        except ForeignKeyViolation:
+            return {"error": "Program code does not exist"}, 400
+
+        return self._batch_done("reassigned", affected)
+
+    def delete_students(self, payload):
+        selection, error = self._batch_selection(payload)
+        if error:
+            return error
+
+        return self._batch_done("deleted", self.repo.batch_delete(**selection))
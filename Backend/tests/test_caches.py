@@ -0,0 +1,143 @@
+import types
+
+import pytest
+from flask import Flask, request
+
+import utils.count_cache
+import utils.response_cache
+import utils.snapshot_cache
+from utils.count_cache import CountCache, normalize_filters
+from utils.response_cache import ResponseCache
+from utils.snapshot_cache import SnapshotCache, snapshot_response
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    fake_time = types.SimpleNamespace(monotonic=clock.monotonic)
+    for module in (utils.response_cache, utils.count_cache, utils.snapshot_cache):
+        monkeypatch.setattr(module, "time", fake_time)
+    return clock
+
+
+def ok(body):
+    return lambda: ({"body": body}, 200)
+
+
+def test_response_cache_serves_hits_until_ttl(clock):
+    cache = ResponseCache(ttl=30)
+    assert cache.get_or_load("k", ("students",), ok(1)) == ({"body": 1}, 200)
+    assert cache.get_or_load("k", ("students",), ok(2)) == ({"body": 1}, 200)
+
+    clock.now += 31
+    assert cache.get_or_load("k", ("students",), ok(3)) == ({"body": 3}, 200)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 2, 1)
+
+
+def test_response_cache_evicts_least_recently_used(clock):
+    cache = ResponseCache(max_entries=2)
+    cache.get_or_load("a", (), ok("a"))
+    cache.get_or_load("b", (), ok("b"))
+    cache.get_or_load("a", (), ok("a2"))
+    cache.get_or_load("c", (), ok("c"))
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.get_or_load("a", (), ok("a3")) == ({"body": "a"}, 200)
+    assert cache.get_or_load("b", (), ok("b2")) == ({"body": "b2"}, 200)
+
+
+def test_response_cache_keeps_only_200s(clock):
+    cache = ResponseCache()
+    assert cache.get_or_load("k", (), lambda: ({"error": "Not found"}, 404))[1] == 404
+    assert cache.get_or_load("k", (), ok("found")) == ({"body": "found"}, 200)
+    assert cache.stats()["entries"] == 1
+
+
+def test_response_cache_drops_a_load_that_raced_a_write(clock):
+    cache = ResponseCache()
+
+    def load_during_write():
+        cache.invalidate("students")
+        return {"body": "stale"}, 200
+
+    # The caller still gets its result, but it is not kept for others.
+    assert cache.get_or_load("k", ("students",), load_during_write) == ({"body": "stale"}, 200)
+    assert cache.get_or_load("k", ("students",), ok("fresh")) == ({"body": "fresh"}, 200)
+
+
+def test_response_cache_invalidates_exactly_the_tagged_entries(clock):
+    cache = ResponseCache()
+    cache.get_or_load("list", ("students",), ok("list"))
+    cache.get_or_load("detail", ("student-details", "student:1"), ok("detail"))
+    cache.get_or_load("programs", ("programs",), ok("programs"))
+
+    cache.invalidate("students", "student:1")
+
+    assert cache.stats()["invalidations"] == 2
+    assert cache.get_or_load("programs", ("programs",), ok("new")) == ({"body": "programs"}, 200)
+    assert cache.get_or_load("list", ("students",), ok("new")) == ({"body": "new"}, 200)
+    assert cache.get_or_load("detail", ("student-details", "student:1"), ok("new")) == ({"body": "new"}, 200)
+
+
+def test_count_filters_lowercase_only_the_search_term():
+    assert normalize_filters(search="Ann", program="P1") == normalize_filters(program="P1", search="aNN")
+    assert normalize_filters(program="P1") != normalize_filters(program="p1")
+    assert normalize_filters(program=" P1") != normalize_filters(program="P1")
+    # Unset filters do not split the key.
+    assert normalize_filters(search="", program=None, year=2) == (("year", "2"),)
+
+
+def test_count_cache_expires_and_invalidates_by_resource(clock):
+    cache = CountCache(ttl=60)
+    filters = normalize_filters(program="P1")
+    cache.set("students", filters, 10)
+    cache.set("programs", (), 3)
+    assert cache.get("students", filters) == (10, True)
+
+    cache.set("students", (), 5, exact=False)
+    assert cache.get("students", (), exact_only=True) is None
+
+    cache.invalidate("students")
+    assert cache.get("students", filters) is None
+    assert cache.get("programs", ()) == (3, True)
+
+    clock.now += 61
+    assert cache.get("programs", ()) is None
+
+
+def test_snapshot_version_follows_content_and_ttl(clock):
+    cache = SnapshotCache(ttl=30)
+    rows = [{"code": "C1"}]
+    first = cache.get("colleges", lambda: rows)
+    assert cache.get("colleges", lambda: [{"code": "C2"}]) is first
+
+    clock.now += 31
+    assert cache.get("colleges", lambda: list(rows)).version == first.version
+    cache.invalidate("colleges")
+    assert cache.get("colleges", lambda: [{"code": "C2"}]).version != first.version
+
+
+@pytest.mark.parametrize("if_none_match, status", [
+    ('"{v}"', 304),
+    # Compression marks the served ETag weak, and clients echo it back.
+    ('W/"{v}"', 304),
+    ('"other", W/"{v}"', 304),
+    ('"other"', 200),
+])
+def test_snapshot_response_compares_etags_weakly(if_none_match, status):
+    snapshot = SnapshotCache().get("colleges", lambda: [{"code": "C1"}])
+    app = Flask(__name__)
+    headers = {"If-None-Match": if_none_match.format(v=snapshot.version)}
+    with app.test_request_context(headers=headers):
+        response = snapshot_response(snapshot, request)
+    assert response.status_code == status
+    assert response.headers["ETag"] == f'"{snapshot.version}"'
@@ -0,0 +1,112 @@
+import gzip
+import zlib
+
+import pytest
+from flask import Flask, Response, jsonify, request
+from werkzeug.datastructures import Headers
+
+import utils.compression
+from utils.compression import COMPRESS_MIN_BYTES, compress_response, negotiate
+
+ROWS = [{"student_id": f"2000-{i:04d}", "first_name": "Ann", "last_name": "Lee"} for i in range(200)]
+
+
+def export_chunks():
+    yield "student_id,first_name,last_name\n"
+    for row in ROWS:
+        yield f"{row['student_id']},{row['first_name']},{row['last_name']}\n"
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+
+    @app.get("/small")
+    def small():
+        return jsonify({"ok": True})
+
+    @app.get("/large")
+    def large():
+        response = jsonify(ROWS)
+        response.set_etag("v1")
+        return response
+
+    @app.get("/export")
+    def export():
+        return Response(export_chunks(), mimetype="text/csv")
+
+    @app.after_request
+    def compress(response):
+        return compress_response(response, request.accept_encodings)
+
+    return app.test_client()
+
+
+def get(client, path, accept_encoding):
+    return client.get(path, headers={"Accept-Encoding": accept_encoding})
+
+
+def test_small_body_is_left_uncompressed(client):
+    response = get(client, "/small", "gzip")
+    assert len(response.data) < COMPRESS_MIN_BYTES
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.get_json() == {"ok": True}
+
+
+def test_small_body_is_encoded_when_identity_is_refused(client):
+    response = get(client, "/small", "gzip, identity;q=0")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data) == b'{"ok":true}\n'
+
+
+def test_large_body_gets_a_weak_etag(client):
+    response = get(client, "/large", "gzip")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["ETag"] == 'W/"v1"'
+    assert int(response.headers["Content-Length"]) == len(response.data)
+
+
+@pytest.mark.parametrize("accept_encoding, encoded", [
+    ("gzip;q=0.5", True),
+    ("gzip;q=0.5, identity;q=1", False),
+    ("identity;q=0.5, gzip;q=1", True),
+    ("gzip;q=0, *", False),
+    ("*;q=0.3", True),
+    ("br", False),
+    ("", False),
+])
+def test_q_values_pick_between_gzip_and_identity(client, accept_encoding, encoded):
+    response = get(client, "/large", accept_encoding)
+    assert ("Content-Encoding" in response.headers) is encoded
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, br, zstd", "zstd"),
+    ("gzip;q=1, br;q=0.8, zstd;q=0.5", "gzip"),
+    ("br;q=0.9, *;q=0.5", "br"),
+    ("zstd;q=0, *", "br"),
+    ("gzip;q=0.5, identity", None),
+])
+def test_negotiate_prefers_higher_q_then_server_order(monkeypatch, accept_encoding, expected):
+    monkeypatch.setattr(utils.compression, "available_encodings", lambda: ["zstd", "br", "gzip"])
+    app = Flask(__name__)
+    with app.test_request_context(headers=Headers({"Accept-Encoding": accept_encoding})):
+        assert negotiate(request.accept_encodings) == expected
+
+
+def test_streamed_export_decompresses_to_the_original_bytes(client):
+    response = get(client, "/export", "gzip")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert gzip.decompress(response.data) == "".join(export_chunks()).encode()
+
+
+def test_streamed_chunks_decode_as_they_arrive(client):
+    response = client.get("/export", headers={"Accept-Encoding": "gzip"}, buffered=False)
+    decoder = zlib.decompressobj(31)
+    chunks = iter(response.response)
+    # The header row is readable before the rest of the export is sent.
+    assert decoder.decompress(next(chunks)) == b"student_id,first_name,last_name\n"
+    response.close()
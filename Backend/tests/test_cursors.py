@@ -0,0 +1,53 @@
+import base64
+import json
+
+import pytest
+
+from queries.builder import CompiledQueryCache, ListQueryBuilder
+from queries.student_queries import StudentQueries
+from utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+def token(**payload):
+    cursor = {"c": "year_level", "v": 2, "k": "2000-0001", "d": "next", **payload}
+    return base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode().rstrip("=")
+
+
+def decode(cursor, sort_column="year_level"):
+    builder = ListQueryBuilder(StudentQueries.LIST, CompiledQueryCache())
+    return decode_cursor(cursor, sort_column, *builder.cursor_kinds(sort_column))
+
+
+def test_round_trips_an_encoded_cursor():
+    assert decode(encode_cursor("year_level", 2, "2000-0001", "prev")) == ((2, "2000-0001"), "prev")
+    assert decode(encode_cursor("program_code", None, "2000-0001", "next"), "program_code") == ((None, "2000-0001"), "next")
+
+
+@pytest.mark.parametrize("payload", [
+    {"v": {"$gt": 1}},
+    {"v": [1, 2]},
+    {"v": "2"},
+    {"v": 2.5},
+    {"v": True},
+    {"v": None},
+    {"k": None},
+    {"k": {}},
+    {"k": ["2000-0001"]},
+    {"k": 20000001},
+    {"d": "sideways"},
+])
+def test_rejects_values_that_do_not_fit_the_columns(payload):
+    with pytest.raises(InvalidCursor):
+        decode(token(**payload))
+
+
+def test_rejects_a_number_for_a_text_column():
+    with pytest.raises(InvalidCursor):
+        decode(token(c="last_name", v=7), "last_name")
+
+
+def test_rejects_garbage_and_other_sort_orders():
+    with pytest.raises(InvalidCursor):
+        decode("not a cursor!")
+    with pytest.raises(InvalidCursor, match="sort order"):
+        decode(token(), "last_name")
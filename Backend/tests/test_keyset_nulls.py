@@ -0,0 +1,91 @@
+import os
+
+import psycopg
+import pytest
+from psycopg.rows import dict_row
+
+pytestmark = pytest.mark.skipif(not os.getenv("DATABASE_URL"), reason="DATABASE_URL is not set")
+
+# Two NULL program codes straddle the boundary between the first and second
+# page of two rows when sorted ascending, and between the first and second
+# page descending.
+ROWS = [
+    ("s1", "A"),
+    ("s2", None),
+    ("s3", "B"),
+    ("s4", None),
+    ("s5", "A"),
+]
+
+
+@pytest.fixture
+def conn():
+    with psycopg.connect(os.environ["DATABASE_URL"]) as conn:
+        conn.execute("CREATE TEMP TABLE keyset_students (student_id TEXT PRIMARY KEY, program_code TEXT)")
+        with conn.cursor() as cur:
+            cur.executemany("INSERT INTO keyset_students VALUES (%s, %s)", ROWS)
+        yield conn
+        conn.rollback()
+
+
+@pytest.fixture
+def builder():
+    from queries.builder import CompiledQueryCache, ListQueryBuilder, ListQuerySpec
+
+    spec = ListQuerySpec(
+        name="keyset_students",
+        table="keyset_students",
+        columns={"student_id": "student_id", "program_code": "program_code"},
+        key_column="student_id",
+        sort_columns={"student_id": "student_id", "program_code": "program_code"},
+        nullable_columns={"program_code"},
+        search_columns={},
+        search_document="student_id",
+    )
+    return ListQueryBuilder(spec, CompiledQueryCache())
+
+
+def walk(conn, builder, sort_dir, direction="next", start=None):
+    from utils.pagination import build_cursor_page, decode_cursor
+
+    pages = []
+    cursor = start
+    while True:
+        values = decode_cursor(cursor, "program_code", nullable=True) if cursor else (None, direction)
+        query = builder.keyset(None, "all", "program_code", sort_dir, 2, values[0] if cursor else None, direction, include_count=False)
+        with conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(query.sql, query.params)
+            rows = cur.fetchall()
+        rows, pagination = build_cursor_page(rows, 2, "program_code", "student_id", direction, cursor is not None)
+        pages.append([row["student_id"] for row in rows])
+        cursor = pagination["next_cursor"] if direction == "next" else pagination["prev_cursor"]
+        if cursor is None:
+            return pages, pagination
+
+
+def expected(conn, sort_dir):
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT student_id FROM keyset_students ORDER BY program_code {sort_dir}, student_id {sort_dir}")
+        return [row[0] for row in cur.fetchall()]
+
+
+@pytest.mark.parametrize("sort_dir", ["ASC", "DESC"])
+def test_forward_pages_cross_null_sort_values(conn, builder, sort_dir):
+    pages, _ = walk(conn, builder, sort_dir)
+
+    assert all(pages)
+    assert [key for page in pages for key in page] == expected(conn, sort_dir)
+
+
+@pytest.mark.parametrize("sort_dir", ["ASC", "DESC"])
+def test_backward_pages_cross_null_sort_values(conn, builder, sort_dir):
+    from utils.pagination import encode_cursor
+
+    order = expected(conn, sort_dir)
+    last = dict(ROWS)[order[-1]]
+    # Start from a cursor just past the last row and walk back to the top.
+    start = encode_cursor("program_code", last, order[-1], "prev")
+    pages, _ = walk(conn, builder, sort_dir, "prev", start)
+
+    assert all(pages)
+    assert [key for page in reversed(pages) for key in page] == order[:-1]
@@ -0,0 +1,135 @@
+import os
+
+import pytest
+
+from utils.login_throttle import LoginThrottle, Throttled
+
+LIMITS = {"user": 2, "ip": 3, "register": 1}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def throttle(clock):
+    return LoginThrottle(window=60, limits=LIMITS, clock=clock)
+
+
+def fail(throttle, username, ip):
+    keys = [("user", username), ("ip", ip)]
+    throttle.check(keys)
+    throttle.record(keys)
+
+
+def test_username_limit_holds_across_addresses(throttle):
+    fail(throttle, "ann", "10.0.0.1")
+    fail(throttle, "ann", "10.0.0.2")
+    with pytest.raises(Throttled):
+        fail(throttle, "ann", "10.0.0.3")
+    fail(throttle, "bob", "10.0.0.3")
+
+
+def test_address_limit_holds_across_usernames(throttle):
+    for username in ("ann", "bob", "cid"):
+        fail(throttle, username, "10.0.0.1")
+    with pytest.raises(Throttled):
+        fail(throttle, "dee", "10.0.0.1")
+    fail(throttle, "dee", "10.0.0.2")
+    assert throttle.stats()["rejected"] == 1
+
+
+def test_retry_after_counts_down_to_the_oldest_failure(throttle, clock):
+    fail(throttle, "ann", "10.0.0.1")
+    clock.now += 20.5
+    fail(throttle, "ann", "10.0.0.1")
+
+    with pytest.raises(Throttled) as excinfo:
+        throttle.check([("user", "ann")])
+    assert excinfo.value.retry_after == 40
+
+    clock.now += 39
+    with pytest.raises(Throttled) as excinfo:
+        throttle.check([("user", "ann")])
+    assert excinfo.value.retry_after == 1
+
+    clock.now += 0.5
+    throttle.check([("user", "ann")])
+
+
+def test_reset_clears_only_the_given_key(throttle):
+    fail(throttle, "ann", "10.0.0.1")
+    fail(throttle, "ann", "10.0.0.1")
+    throttle.reset(("user", "ann"))
+
+    fail(throttle, "ann", "10.0.0.1")
+    with pytest.raises(Throttled):
+        fail(throttle, "bob", "10.0.0.1")
+
+
+def test_least_recently_failing_keys_are_forgotten(clock):
+    throttle = LoginThrottle(window=60, limits=LIMITS, max_keys=2, clock=clock)
+    throttle.record([("user", "ann")])
+    throttle.record([("user", "bob")])
+    throttle.record([("user", "ann")])
+    throttle.record([("user", "cid")])
+    assert throttle.stats()["tracked_keys"] == 2
+    with pytest.raises(Throttled):
+        throttle.check([("user", "ann")])
+
+
+class Users:
+    def get_by_username(self, username):
+        return (1, "right") if username == "ann" else None
+
+
+class Hasher:
+    def verify(self, pwhash, password):
+        return pwhash == password
+
+
+@pytest.fixture
+def client(monkeypatch, throttle):
+    if not os.getenv("DATABASE_URL"):
+        pytest.skip("DATABASE_URL is not set")
+    from app import app
+    from controllers import auth_controller
+
+    service = auth_controller.auth_service
+    monkeypatch.setattr(service, "user_repo", Users())
+    monkeypatch.setattr(service, "hasher", Hasher())
+    monkeypatch.setattr(service, "throttle", throttle)
+    return app.test_client()
+
+
+def login(client, password, username="ann"):
+    return client.post("/api/auth/login", json={"username": username, "password": password})
+
+
+def test_login_answers_429_with_retry_after(client, clock):
+    assert login(client, "wrong").status_code == 401
+    clock.now += 15
+    assert login(client, "wrong").status_code == 401
+
+    response = login(client, "right")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "45"
+
+    clock.now += 45
+    assert login(client, "right").status_code == 200
+
+
+def test_successful_login_clears_the_username_count(client):
+    assert login(client, "wrong").status_code == 401
+    assert login(client, "right").status_code == 200
+    assert login(client, "wrong").status_code == 401
+    assert login(client, "right").status_code == 200
@@ -0,0 +1,30 @@
+import os
+import signal
+
+import pytest
+
+from utils.password_hasher import HasherBusy, PasswordHasher
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(workers=1, max_queue=1)
+    yield hasher
+    if hasher._executor is not None:
+        hasher._executor.shutdown(cancel_futures=True)
+
+
+def test_dead_worker_is_reported_busy_then_replaced(hasher):
+    pwhash = hasher.hash("secret")
+    broken = hasher._executor
+    for pid in list(broken._processes):
+        os.kill(pid, signal.SIGKILL)
+
+    # Whichever call first sees the broken pool answers busy instead of failing.
+    with pytest.raises(HasherBusy):
+        for _ in range(10):
+            hasher.verify(pwhash, "secret")
+
+    assert hasher.verify(pwhash, "secret")
+    assert hasher._executor is not broken
+    assert hasher.stats()["in_flight"] == 0
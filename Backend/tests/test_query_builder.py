@@ -0,0 +1,105 @@
+import pytest
+from psycopg.types.numeric import Int8
+
+from queries.builder import CompiledQueryCache, InvalidFields, ListQueryBuilder
+from queries.student_queries import StudentQueries
+
+
+@pytest.fixture
+def cache():
+    return CompiledQueryCache()
+
+
+@pytest.fixture
+def builder(cache):
+    return ListQueryBuilder(StudentQueries.LIST, cache)
+
+
+def page(builder, search="", filter_field="all", sort="student_id", sort_dir="ASC", filters=None, fields=None, include_count=False):
+    return builder.page(search, filter_field, sort, sort_dir, 10, 0, filters=filters, include_count=include_count, fields=fields)
+
+
+def test_unknown_identifiers_are_rejected(builder):
+    with pytest.raises(ValueError, match="sort column"):
+        page(builder, sort="student_id; DROP TABLE students")
+    with pytest.raises(ValueError, match="search column"):
+        page(builder, search="x", filter_field="password_hash")
+    with pytest.raises(ValueError, match="sort direction"):
+        page(builder, sort_dir="ASC; --")
+    with pytest.raises(InvalidFields):
+        builder.fields("student_id,password_hash")
+
+
+def test_unknown_filters_never_reach_the_sql(builder):
+    query = page(builder, filters={"program": "P1", "1=1) OR (TRUE": "x"})
+    assert "1=1" not in query.sql
+    assert query.params[0] == "P1"
+
+
+def test_facets_keep_spec_order(builder):
+    forward = page(builder, filters={"gender": "Male", "program": "P1", "year": "2"})
+    backward = page(builder, filters={"year": "2", "program": "P1", "gender": "Male"})
+    assert forward.sql == backward.sql
+    assert forward.params == backward.params
+    where = forward.sql.split(" WHERE ", 1)[1]
+    assert where.index("s.program_code") < where.index("s.year_level") < where.index("s.gender")
+
+
+def test_int_search_column_needs_digits(builder):
+    assert " WHERE FALSE " in page(builder, search="two", filter_field="year_level").sql
+
+    query = page(builder, search=" 2 ", filter_field="year_level")
+    assert "s.year_level = %s" in query.sql
+    assert query.params[0] == 2
+
+
+def test_integers_are_bound_as_int8(builder):
+    query = page(builder, search="3", filter_field="year_level")
+    limit, offset = query.params[-2:]
+    assert all(type(p) is Int8 for p in (query.params[0], limit, offset))
+    # Booleans stay booleans even though they are ints.
+    assert builder.lookup(True, None).params == [True]
+
+
+def test_same_shape_compiles_once(builder, cache):
+    page(builder, search="ann")
+    page(builder, search="bob")
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = CompiledQueryCache(max_entries=2)
+    cache.get_or_compile("a", lambda: "A")
+    cache.get_or_compile("b", lambda: "B")
+    cache.get_or_compile("a", lambda: "A")
+    cache.get_or_compile("c", lambda: "C")
+    assert cache.get_or_compile("a", lambda: "A2") == "A"
+    assert cache.get_or_compile("b", lambda: "B2") == "B2"
+
+
+def test_null_cursor_is_part_of_the_shape(builder):
+    valued = builder.keyset("", "all", "program_code", "ASC", 10, ("P1", "2000-0001"), include_count=False)
+    null = builder.keyset("", "all", "program_code", "ASC", 10, (None, "2000-0001"), include_count=False)
+    assert valued.sql != null.sql
+    assert "IS NULL AND s.student_id > %s" in null.sql
+    assert null.params[0] == "2000-0001"
+    # A NULL-cursor query must not be served a cached valued-cursor text.
+    assert builder.keyset("", "all", "program_code", "ASC", 10, (None, "2000-0002"), include_count=False).sql == null.sql
+
+
+def test_join_only_when_alias_is_referenced(builder):
+    join = "LEFT JOIN programs p"
+    assert join not in page(builder, fields=("student_id", "last_name")).sql
+    assert join in page(builder).sql
+    assert join in page(builder, fields=("student_id", "college_code")).sql
+    assert join in page(builder, fields=("student_id",), filters={"college": "C1"}).sql
+    assert join not in page(builder, fields=("student_id",), filters={"program": "P1"}).sql
+    assert join not in builder.keys("", "all", {"gender": "Male"}).sql
+    assert join in builder.keys("", "all", {"college": "C1"}).sql
+
+
+def test_count_query_skips_unused_join(builder):
+    query = page(builder, fields=("student_id", "college_code"), include_count=True)
+    count_sql = query.sql.split("LEFT JOIN LATERAL", 1)[0]
+    assert "programs p" not in count_sql
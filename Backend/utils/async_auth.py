@@ -0,0 +1,34 @@
+from functools import wraps
+
+import jwt
+from quart import g, jsonify, request
+
+from utils.jwt_tokens import decode_access_token
+
+
+def jwt_required():
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            header = request.headers.get("Authorization")
+            if not header:
+                return jsonify({"msg": "Missing Authorization Header"}), 401
+
+            scheme, _, token = header.partition(" ")
+            if scheme != "Bearer" or not token:
+                return jsonify({"msg": "Missing 'Bearer' type in 'Authorization' header. Expected 'Authorization: Bearer <JWT>'"}), 422
+
+            try:
+                g.jwt_claims = decode_access_token(token)
+            except jwt.ExpiredSignatureError:
+                return jsonify({"msg": "Token has expired"}), 401
+            except jwt.InvalidTokenError as e:
+                return jsonify({"msg": str(e)}), 422
+
+            return await view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_jwt_identity():
+    return g.jwt_claims["sub"]
@@ -0,0 +1,28 @@
+from quart.wrappers.response import DataBody, IterableBody
+
+from utils.compression import (
+    choose_encoding,
+    compress,
+    compress_chunks_async,
+    mark_encoded,
+    worth_encoding,
+)
+
+
+def compress_response(response, accept_encodings):
+    encoding = choose_encoding(response, accept_encodings)
+    if encoding is None:
+        return response
+
+    body = response.response
+    if isinstance(body, IterableBody):
+        if worth_encoding(accept_encodings, None):
+            response.response = IterableBody(compress_chunks_async(encoding, body))
+            mark_encoded(response, encoding, streamed=True)
+        return response
+
+    # File bodies and anything else keep their own range handling.
+    if isinstance(body, DataBody) and worth_encoding(accept_encodings, len(body.data)):
+        response.set_data(compress(encoding, body.data))
+        mark_encoded(response, encoding)
+    return response
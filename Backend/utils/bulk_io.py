@@ -0,0 +1,104 @@
+import asyncio
+import csv
+import io
+import itertools
+import json
+import os
+
+# Rows parsed per worker-thread hop when an async caller reads an upload.
+IMPORT_PARSE_BATCH = int(os.getenv("IMPORT_PARSE_BATCH", "1000"))
+
+
+class MalformedUpload(ValueError):
+    pass
+
+
+def iter_csv_records(stream):
+    reader = csv.DictReader(stream)
+    row_number = 0
+    try:
+        for record in reader:
+            row_number += 1
+            yield row_number, record, None
+    except csv.Error as e:
+        raise MalformedUpload(f"Malformed CSV after row {row_number}: {e}")
+
+
+def iter_ndjson_records(stream):
+    row_number = 0
+    for line in stream:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield row_number, None, "Invalid JSON"
+            continue
+        if not isinstance(record, dict):
+            yield row_number, None, "Each line must be a JSON object"
+            continue
+        yield row_number, record, None
+
+
+RECORD_READERS = {
+    "csv": iter_csv_records,
+    "ndjson": iter_ndjson_records,
+}
+
+
+def csv_encoder(columns):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    header = buffer.getvalue()
+
+    def encode(rows):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        return buffer.getvalue()
+
+    return header, encode
+
+
+def ndjson_encoder(columns):
+    def encode(rows):
+        return "".join(
+            json.dumps({c: row[c] for c in columns}, default=str) + "\n" for row in rows
+        )
+
+    return None, encode
+
+
+CHUNK_ENCODERS = {
+    "csv": csv_encoder,
+    "ndjson": ndjson_encoder,
+}
+
+
+def iter_chunks(fmt, batches, columns):
+    header, encode = CHUNK_ENCODERS[fmt](columns)
+    if header is not None:
+        yield header
+    for rows in batches:
+        yield encode(rows)
+
+
+async def aiter_chunks(fmt, batches, columns):
+    header, encode = CHUNK_ENCODERS[fmt](columns)
+    if header is not None:
+        yield header
+    async for rows in batches:
+        yield encode(rows)
+
+
+async def athread_batches(rows, size=IMPORT_PARSE_BATCH):
+    # Reading, decoding and validating an upload is blocking work, so pull
+    # it through a worker thread a batch at a time, off the event loop.
+    rows = iter(rows)
+    while True:
+        batch = await asyncio.to_thread(lambda: list(itertools.islice(rows, size)))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,192 @@
+import os
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+# Bodies smaller than this go out as-is; the framing overhead and CPU are
+# not worth it below about one TCP packet.
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+COMPRESS_STREAMS = os.getenv("COMPRESS_STREAMS", "true").strip().lower() in ("1", "true", "yes", "on")
+COMPRESS_LEVELS = {
+    "zstd": int(os.getenv("COMPRESS_ZSTD_LEVEL", "3")),
+    "br": int(os.getenv("COMPRESS_BROTLI_LEVEL", "4")),
+    "gzip": int(os.getenv("COMPRESS_GZIP_LEVEL", "6")),
+}
+# Server preference when the client rates several encodings equally.
+COMPRESS_PREFERENCE = tuple(
+    name.strip() for name in os.getenv("COMPRESS_ENCODINGS", "zstd,br,gzip").split(",") if name.strip()
+)
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def available_encodings():
+    available = {"gzip"}
+    if brotli is not None:
+        available.add("br")
+    if zstandard is not None:
+        available.add("zstd")
+    return [name for name in COMPRESS_PREFERENCE if name in available]
+
+
+def _identity_quality(accept_encodings):
+    # Identity is always acceptable unless the client rates it, directly or
+    # through "*"; None means it did not, so identity does not compete.
+    named = {value.lower() for value, _ in accept_encodings}
+    if "identity" in named or "*" in named:
+        return accept_encodings.quality("identity")
+    return None
+
+
+def identity_refused(accept_encodings):
+    return _identity_quality(accept_encodings) == 0
+
+
+def negotiate(accept_encodings):
+    # Shared by the Flask and Quart hooks, which both hand over Werkzeug's
+    # parsed Accept-Encoding. The highest q-value wins, COMPRESS_PREFERENCE
+    # breaks ties, "*" rates the encodings the client did not name, and a
+    # q=0 rules an encoding out.
+    best, best_quality = None, 0
+    for name in available_encodings():
+        quality = accept_encodings.quality(name)
+        if quality > best_quality:
+            best, best_quality = name, quality
+    identity = _identity_quality(accept_encodings)
+    if best is not None and identity is not None and identity > best_quality:
+        return None
+    return best
+
+
+class _GzipStream:
+    def __init__(self, level):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        # A sync flush per chunk lets the client decode rows as they arrive.
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    def __init__(self, level):
+        self._obj = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._obj.process(data) + self._obj.flush()
+
+    def finish(self):
+        return self._obj.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._obj.flush()
+
+
+STREAMS = {"gzip": _GzipStream, "br": _BrotliStream, "zstd": _ZstdStream}
+
+
+def compress(encoding, data, level=None):
+    level = COMPRESS_LEVELS[encoding] if level is None else level
+    if encoding == "gzip":
+        stream = zlib.compressobj(level, zlib.DEFLATED, 31)
+        return stream.compress(data) + stream.flush()
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def _encode_chunk(stream, chunk):
+    if isinstance(chunk, str):
+        chunk = chunk.encode()
+    # Empty chunks would still emit a flush marker.
+    return stream.compress(chunk) if chunk else b""
+
+
+def compress_chunks(encoding, chunks):
+    stream = STREAMS[encoding](COMPRESS_LEVELS[encoding])
+    for chunk in chunks:
+        data = _encode_chunk(stream, chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+async def compress_chunks_async(encoding, body):
+    stream = STREAMS[encoding](COMPRESS_LEVELS[encoding])
+    async with body:
+        async for chunk in body:
+            data = _encode_chunk(stream, chunk)
+            if data:
+                yield data
+    yield stream.finish()
+
+
+def choose_encoding(response, accept_encodings):
+    # Returns the encoding to apply, or None to leave the response alone.
+    # Vary is set either way so shared caches key on Accept-Encoding.
+    if not COMPRESS_ENABLED or response.status_code < 200 or response.status_code in (204, 206, 304):
+        return None
+    if "Content-Encoding" in response.headers or not (response.mimetype or "").startswith(COMPRESSIBLE_TYPES):
+        return None
+
+    response.vary.add("Accept-Encoding")
+    if "no-transform" in response.headers.get("Cache-Control", ""):
+        return None
+    return negotiate(accept_encodings)
+
+
+def worth_encoding(accept_encodings, size):
+    # size is None for streamed bodies. A client that refuses identity gets
+    # an encoded body whatever its size.
+    if identity_refused(accept_encodings):
+        return True
+    if size is None:
+        return COMPRESS_STREAMS
+    return size >= COMPRESS_MIN_BYTES
+
+
+def mark_encoded(response, encoding, streamed=False):
+    response.headers["Content-Encoding"] = encoding
+    if streamed:
+        response.headers.pop("Content-Length", None)
+    # The encoded bytes are a different representation of the same content.
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def compress_response(response, accept_encodings):
+    encoding = choose_encoding(response, accept_encodings)
+    if encoding is None or response.direct_passthrough:
+        return response
+
+    if response.is_streamed:
+        if worth_encoding(accept_encodings, None):
+            response.response = compress_chunks(encoding, response.response)
+            mark_encoded(response, encoding, streamed=True)
+        return response
+
+    data = response.get_data()
+    if worth_encoding(accept_encodings, len(data)):
+        response.set_data(compress(encoding, data))
+        mark_encoded(response, encoding)
+    return response
@@ -0,0 +1,7 @@
+# Shared by the WSGI and ASGI entry points, which must not import each
+# other: importing app would build the Flask app and its sync database pool.
+ALLOWED_ORIGINS = [
+    "http://localhost:5173",
+    "http://127.0.0.1:5000",
+    "http://localhost:5000"
+]
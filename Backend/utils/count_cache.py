@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "60"))
+COUNT_CACHE_MAX_ENTRIES = int(os.getenv("COUNT_CACHE_MAX_ENTRIES", "1024"))
+
+# Estimated totals are only trusted above this size; below it the exact
+# count is cheap enough and users notice when small numbers are off.
+ESTIMATE_THRESHOLD = int(os.getenv("COUNT_ESTIMATE_THRESHOLD", "10000"))
+
+
+# Only the search term is matched with ILIKE; facets are compared exactly,
+# so their case (and whitespace) must stay part of the key.
+CASE_INSENSITIVE_FILTERS = ("search",)
+
+
+def normalize_filters(**filters):
+    normalized = []
+    for name in sorted(filters):
+        value = filters[name]
+        if value in (None, ""):
+            continue
+        value = str(value)
+        normalized.append((name, value.lower() if name in CASE_INSENSITIVE_FILTERS else value))
+    return tuple(normalized)
+
+
+class CountCache:
+    def __init__(self, ttl=COUNT_CACHE_TTL, max_entries=COUNT_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, resource, filters, exact_only=False):
+        key = (resource, filters)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            total, exact, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            if exact_only and not exact:
+                return None
+
+            self._entries.move_to_end(key)
+            return total, exact
+
+    def set(self, resource, filters, total, exact=True):
+        key = (resource, filters)
+        with self._lock:
+            self._entries[key] = (total, exact, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _accept_estimate(self, resource, filters, estimate):
+        if estimate is not None and estimate >= ESTIMATE_THRESHOLD:
+            self.set(resource, filters, estimate, exact=False)
+            return estimate, False
+        return None
+
+    def lookup(self, resource, filters, count_mode, estimate_fn):
+        cached = self.get(resource, filters, exact_only=count_mode != "estimated")
+        if cached is not None:
+            return cached
+
+        if count_mode == "estimated":
+            return self._accept_estimate(resource, filters, estimate_fn())
+        return None
+
+    async def lookup_async(self, resource, filters, count_mode, estimate_fn):
+        cached = self.get(resource, filters, exact_only=count_mode != "estimated")
+        if cached is not None:
+            return cached
+
+        if count_mode == "estimated":
+            return self._accept_estimate(resource, filters, await estimate_fn())
+        return None
+
+    def invalidate(self, *resources):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] in resources]:
+                del self._entries[key]
+
+
+count_cache = CountCache()
+
+
+def get_count_cache():
+    return count_cache
@@ -0,0 +1,76 @@
+import os
+import tempfile
+
+IMAGE_STORAGE = os.getenv("IMAGE_STORAGE", "local")
+IMAGE_STORAGE_DIR = os.getenv(
+    "IMAGE_STORAGE_DIR", os.path.join(os.path.abspath(os.path.dirname(os.path.dirname(__file__))), "media")
+)
+
+
+class ImageStorage:
+    # Keys are "<sha256>/<variant>". Content never changes under a key, so
+    # writers may skip keys that already exist.
+    def exists(self, key):
+        raise NotImplementedError
+
+    def read(self, key):
+        raise NotImplementedError
+
+    def write(self, key, data):
+        raise NotImplementedError
+
+    def local_path(self, key):
+        # Backends that keep files on local disk return their path so they
+        # can be streamed with range support instead of read into memory.
+        return None
+
+
+class LocalImageStorage(ImageStorage):
+    def __init__(self, root=IMAGE_STORAGE_DIR):
+        self.root = root
+
+    def _path(self, key):
+        # Fan out by hash prefix so no directory grows too large.
+        return os.path.join(self.root, key[:2], *key.split("/"))
+
+    def exists(self, key):
+        return os.path.exists(self._path(key))
+
+    def read(self, key):
+        with open(self._path(key), "rb") as f:
+            return f.read()
+
+    def write(self, key, data):
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file and rename it into place so readers
+        # never see a partial image.
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def local_path(self, key):
+        path = self._path(key)
+        return path if os.path.exists(path) else None
+
+
+STORAGE_BACKENDS = {
+    "local": LocalImageStorage,
+}
+
+image_storage = None
+
+
+def get_image_storage():
+    global image_storage
+    if image_storage is None:
+        if IMAGE_STORAGE not in STORAGE_BACKENDS:
+            raise ValueError(f"Unknown IMAGE_STORAGE {IMAGE_STORAGE!r}; expected one of {', '.join(STORAGE_BACKENDS)}")
+        image_storage = STORAGE_BACKENDS[IMAGE_STORAGE]()
+    return image_storage
@@ -0,0 +1,89 @@
+from io import BytesIO
+import os
+import re
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# Pillow format -> (extension, content type) of accepted uploads.
+IMAGE_FORMATS = {
+    "JPEG": ("jpg", "image/jpeg"),
+    "PNG": ("png", "image/png"),
+    "WEBP": ("webp", "image/webp"),
+    "GIF": ("gif", "image/gif"),
+}
+IMAGE_MAX_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", "40000000"))
+IMAGE_THUMBNAIL_SIZES = tuple(sorted(
+    int(size) for size in os.getenv("IMAGE_THUMBNAIL_SIZES", "64,160,320").split(",") if size.strip()
+))
+IMAGE_THUMBNAIL_FORMAT = os.getenv("IMAGE_THUMBNAIL_FORMAT", "WEBP").upper()
+IMAGE_THUMBNAIL_QUALITY = int(os.getenv("IMAGE_THUMBNAIL_QUALITY", "80"))
+THUMBNAIL_EXTENSION, THUMBNAIL_TYPE = IMAGE_FORMATS[IMAGE_THUMBNAIL_FORMAT]
+# The thumbnail the list APIs link to.
+IMAGE_LIST_THUMBNAIL = int(os.getenv("IMAGE_LIST_THUMBNAIL", str(IMAGE_THUMBNAIL_SIZES[0])))
+
+IMAGE_URL_PREFIX = "/api/images/"
+IMAGE_HASH = re.compile(r"[0-9a-f]{64}")
+STORED_IMAGE_URL = re.compile(re.escape(IMAGE_URL_PREFIX) + r"([0-9a-f]{64})\.[a-z]+")
+
+
+class UnsupportedImage(ValueError):
+    pass
+
+
+def inspect_image(data):
+    # Reads only the header, so it is cheap enough for the request thread.
+    try:
+        with Image.open(BytesIO(data)) as image:
+            image_format, (width, height) = image.format, image.size
+            image.verify()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError):
+        raise UnsupportedImage("File is not a readable image")
+
+    if image_format not in IMAGE_FORMATS:
+        raise UnsupportedImage(f"Unsupported image type; use {', '.join(sorted(IMAGE_FORMATS))}")
+    if width * height > IMAGE_MAX_PIXELS:
+        raise UnsupportedImage(f"Image is larger than {IMAGE_MAX_PIXELS} pixels")
+    return image_format, width, height
+
+
+def render_thumbnails(data, sizes=IMAGE_THUMBNAIL_SIZES):
+    thumbnails = {}
+    with Image.open(BytesIO(data)) as source:
+        # JPEGs can be decoded straight at a reduced scale, which is most of
+        # the saving for large camera photos.
+        source.draft("RGB", (max(sizes), max(sizes)))
+        image = ImageOps.exif_transpose(source)
+        alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        mode = "RGBA" if alpha and IMAGE_THUMBNAIL_FORMAT != "JPEG" else "RGB"
+        if image.mode != mode:
+            image = image.convert(mode)
+
+        # Shrink step by step from the largest size so each pass starts
+        # from the previous, smaller image.
+        for size in sorted(sizes, reverse=True):
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            out = BytesIO()
+            image.save(out, IMAGE_THUMBNAIL_FORMAT, quality=IMAGE_THUMBNAIL_QUALITY)
+            thumbnails[size] = out.getvalue()
+    return thumbnails
+
+
+def image_url(image_hash, extension, size=None):
+    if size is None:
+        return f"{IMAGE_URL_PREFIX}{image_hash}.{extension}"
+    return f"{IMAGE_URL_PREFIX}{image_hash}/{size}.{extension}"
+
+
+def thumbnail_url(url, size=IMAGE_LIST_THUMBNAIL):
+    # Images kept elsewhere (such as older Supabase uploads) have no
+    # thumbnails, so they are linked as they are.
+    match = STORED_IMAGE_URL.fullmatch(url or "")
+    if match is None:
+        return url
+    return image_url(match.group(1), THUMBNAIL_EXTENSION, size)
+
+
+def with_thumbnail(row):
+    if row and "image_url" in row:
+        row["thumbnail_url"] = thumbnail_url(row["image_url"])
+    return row
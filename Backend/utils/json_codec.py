@@ -0,0 +1,73 @@
+import dataclasses
+import decimal
+import json
+import os
+import uuid
+from datetime import date, time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Set to false to fall back to the standard-library encoder.
+JSON_FAST_ENCODER = os.getenv("JSON_FAST_ENCODER", "true").strip().lower() in ("1", "true", "yes", "on")
+
+
+def default(o):
+    # orjson handles dates, times and UUIDs natively; this covers the rest,
+    # and gives the standard-library path the same output for those types.
+    if isinstance(o, (date, time)):
+        return o.isoformat()
+
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+
+    if dataclasses.is_dataclass(o):
+        return dataclasses.asdict(o)
+
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(obj, sort_keys, indent):
+    if indent:
+        text = json.dumps(obj, default=default, sort_keys=sort_keys, ensure_ascii=False, indent=2)
+    else:
+        text = json.dumps(obj, default=default, sort_keys=sort_keys, ensure_ascii=False, separators=(",", ":"))
+    return text.encode()
+
+
+def dumps(obj, sort_keys=False, indent=False):
+    # Returns UTF-8 bytes, so a response body never takes a str round trip.
+    if orjson is None or not JSON_FAST_ENCODER:
+        return _stdlib_dumps(obj, sort_keys, indent)
+
+    option = 0
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    try:
+        return orjson.dumps(obj, default=default, option=option)
+    except orjson.JSONEncodeError:
+        # Non-string keys and integers beyond 64 bits are the stdlib's job.
+        return _stdlib_dumps(obj, sort_keys, indent)
+
+
+class FastJSONMixin:
+    default = staticmethod(default)
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, sort_keys=self.sort_keys).decode()
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = dumps(obj, sort_keys=self.sort_keys, indent=indent) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -0,0 +1,88 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+LOGIN_THROTTLE_WINDOW = float(os.getenv("LOGIN_THROTTLE_WINDOW", "300"))
+LOGIN_THROTTLE_MAX_KEYS = int(os.getenv("LOGIN_THROTTLE_MAX_KEYS", "10000"))
+# Failed attempts allowed per window before further attempts are refused.
+# Addresses get more room than accounts since many users can share one NAT.
+LOGIN_THROTTLE_LIMITS = {
+    "user": int(os.getenv("LOGIN_THROTTLE_USER_ATTEMPTS", "5")),
+    "ip": int(os.getenv("LOGIN_THROTTLE_IP_ATTEMPTS", "20")),
+    "register": int(os.getenv("REGISTER_THROTTLE_IP_ATTEMPTS", "10")),
+}
+
+
+class Throttled(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f"Too many attempts; retry in {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+class LoginThrottle:
+    def __init__(self, window=LOGIN_THROTTLE_WINDOW, limits=LOGIN_THROTTLE_LIMITS, max_keys=LOGIN_THROTTLE_MAX_KEYS, clock=time.monotonic):
+        self.window = window
+        self.limits = limits
+        self.max_keys = max_keys
+        self.clock = clock
+        self._attempts = OrderedDict()
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def _recent(self, key, now):
+        attempts = self._attempts.get(key)
+        if attempts is None:
+            return None
+        while attempts and attempts[0] <= now - self.window:
+            attempts.popleft()
+        if not attempts:
+            del self._attempts[key]
+            return None
+        return attempts
+
+    def check(self, keys):
+        now = self.clock()
+        retry_after = 0
+        with self._lock:
+            for key in keys:
+                attempts = self._recent(key, now)
+                if attempts is not None and len(attempts) >= self.limits[key[0]]:
+                    retry_after = max(retry_after, attempts[0] + self.window - now)
+            if retry_after:
+                self.rejected += 1
+                raise Throttled(max(1, math.ceil(retry_after)))
+
+    def record(self, keys):
+        now = self.clock()
+        with self._lock:
+            for key in keys:
+                attempts = self._attempts.setdefault(key, deque())
+                attempts.append(now)
+                self._attempts.move_to_end(key)
+            # Forget the least recently failing keys first.
+            while len(self._attempts) > self.max_keys:
+                self._attempts.popitem(last=False)
+
+    def reset(self, key):
+        with self._lock:
+            self._attempts.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "tracked_keys": len(self._attempts),
+                "max_keys": self.max_keys,
+                "window_seconds": self.window,
+                "limits": dict(self.limits),
+                "rejected": self.rejected,
+            }
+
+
+login_throttle = LoginThrottle()
+
+
+def get_login_throttle():
+    return login_throttle
@@ -0,0 +1,40 @@
+import bisect
+import itertools
+import threading
+
+
+DEFAULT_MS_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_MS_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            if value > self._max:
+                self._max = value
+
+    def snapshot(self):
+        with self._lock:
+            counts = list(self._counts)
+            total = sum(counts)
+            return {
+                "count": total,
+                "sum": round(self._sum, 3),
+                "max": round(self._max, 3),
+                "mean": round(self._sum / total, 3) if total else 0.0,
+                # Cumulative, as le ("less than or equal") buckets are read
+                # in Prometheus: each counts every value up to its bound.
+                "buckets": {
+                    **{f"le_{bound}": count for bound, count in zip(self.buckets, itertools.accumulate(counts))},
+                    "le_inf": total
+                }
+            }
@@ -0,0 +1,111 @@
+import base64
+import json
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# Python types a decoded cursor value must have for each column kind. Cursors
+# come back from the client, so anything else (objects, lists, a string for an
+# integer column) is refused here rather than failing as a 500 in the query.
+CURSOR_TYPES = {"text": str, "int": int}
+
+
+def _fits(value, kind):
+    # JSON true/false decode to bool, which is an int subclass.
+    return isinstance(value, CURSOR_TYPES[kind]) and not isinstance(value, bool)
+
+
+def encode_cursor(sort_column, sort_value, key_value, direction):
+    payload = {"c": sort_column, "v": sort_value, "k": key_value, "d": direction}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token, sort_column, sort_kind="text", key_kind="text", nullable=False):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        direction = payload["d"]
+        values = (payload["v"], payload["k"])
+        column = payload["c"]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor("Malformed cursor")
+
+    if direction not in ("next", "prev"):
+        raise InvalidCursor("Malformed cursor")
+    if column != sort_column:
+        raise InvalidCursor("Cursor does not match the requested sort order")
+
+    sort_value, key_value = values
+    if not (_fits(sort_value, sort_kind) or (nullable and sort_value is None)):
+        raise InvalidCursor("Malformed cursor")
+    if not _fits(key_value, key_kind):
+        raise InvalidCursor("Malformed cursor")
+
+    return values, direction
+
+
+def keyset_clause(sort_expr, key_expr, sort_dir, direction, nullable=False, null_cursor=False):
+    # Walking backwards flips both the comparison and the scan order; the
+    # caller reverses the fetched rows so the page still reads top-down.
+    ascending = (sort_dir == "ASC") == (direction == "next")
+    op = ">" if ascending else "<"
+    order_dir = "ASC" if ascending else "DESC"
+
+    if sort_expr == key_expr:
+        clause = f"{key_expr} {op} %s"
+        order_by = f"{key_expr} {order_dir}"
+    else:
+        clause = f"({sort_expr}, {key_expr}) {op} (%s, %s)"
+        order_by = f"{sort_expr} {order_dir}, {key_expr} {order_dir}"
+        if nullable:
+            # A row comparison against NULL is NULL, so NULL sort values need
+            # their own branches. Postgres sorts NULLs last ascending and
+            # first descending, i.e. above every value, in both scan orders.
+            if null_cursor and ascending:
+                clause = f"{sort_expr} IS NULL AND {key_expr} > %s"
+            elif null_cursor:
+                clause = f"({sort_expr} IS NOT NULL OR {key_expr} < %s)"
+            elif ascending:
+                clause = f"({clause} OR {sort_expr} IS NULL)"
+
+    return clause, order_by
+
+
+def keyset_params(sort_expr, key_expr, values, null_cursor=False):
+    if sort_expr == key_expr or null_cursor:
+        return [values[1]]
+    return list(values)
+
+
+def build_cursor_page(rows, limit, sort_column, key_column, cursor_direction, has_cursor):
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if cursor_direction == "prev":
+        rows.reverse()
+        has_next = has_cursor
+        has_prev = has_more
+    else:
+        has_next = has_more
+        has_prev = has_cursor
+
+    next_cursor = None
+    prev_cursor = None
+    if rows:
+        last, first = rows[-1], rows[0]
+        if has_next:
+            next_cursor = encode_cursor(sort_column, last[sort_column], last[key_column], "next")
+        if has_prev:
+            prev_cursor = encode_cursor(sort_column, first[sort_column], first[key_column], "prev")
+
+    return rows, {
+        "mode": "cursor",
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+        "has_next": has_next,
+        "has_prev": has_prev,
+    }
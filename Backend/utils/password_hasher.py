@@ -0,0 +1,160 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from utils.metrics import Histogram
+from utils.password_worker import check_password, hash_password, init_worker
+
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+# Jobs allowed to wait for a free worker; anything past this is rejected at once.
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", str(PASSWORD_HASH_WORKERS * 8)))
+PASSWORD_HASH_RETRY_AFTER = 1
+THROUGHPUT_WINDOW_SECONDS = 60
+
+
+class HasherBusy(Exception):
+    pass
+
+
+def _start_context():
+    # Forking a process that already runs pool and request threads can copy
+    # held locks into the child, so workers come from the fork server (which
+    # has only preloaded the worker module) or, failing that, are spawned.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["utils.password_worker"])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+class PasswordHasher:
+    def __init__(self, workers=PASSWORD_HASH_WORKERS, max_queue=PASSWORD_HASH_MAX_QUEUE):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = deque()
+        self.submitted = 0
+        self.rejected = 0
+        self.failed = 0
+        self.hash_ms = Histogram()
+        self.queue_ms = Histogram()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=_start_context(), initializer=init_worker)
+        return self._executor
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HasherBusy()
+            self._in_flight += 1
+            self.submitted += 1
+            executor = self._get_executor()
+
+        submitted_at = time.perf_counter()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._release()
+            self._discard(executor)
+            raise HasherBusy()
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda f: self._finished(f, submitted_at))
+        return future, executor
+
+    def _discard(self, executor):
+        # A worker that dies (OOM kill, crash) breaks the whole pool for
+        # good; drop it so the next call starts a fresh one.
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _result(self, fn, *args):
+        future, executor = self._submit(fn, *args)
+        try:
+            return future.result()[0]
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise HasherBusy()
+
+    async def _result_async(self, fn, *args):
+        future, executor = self._submit(fn, *args)
+        try:
+            result, _ = await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise HasherBusy()
+        return result
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def _finished(self, future, submitted_at):
+        total_ms = (time.perf_counter() - submitted_at) * 1000
+        with self._lock:
+            self._in_flight -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+                return
+            self._completed.append(time.monotonic())
+
+        _, run_ms = future.result()
+        self.hash_ms.observe(run_ms)
+        self.queue_ms.observe(max(0.0, total_ms - run_ms))
+
+    def hash(self, password):
+        return self._result(hash_password, password)
+
+    def verify(self, pwhash, password):
+        return self._result(check_password, pwhash, password)
+
+    async def hash_async(self, password):
+        return await self._result_async(hash_password, password)
+
+    async def verify_async(self, pwhash, password):
+        return await self._result_async(check_password, pwhash, password)
+
+    def stats(self):
+        with self._lock:
+            cutoff = time.monotonic() - THROUGHPUT_WINDOW_SECONDS
+            while self._completed and self._completed[0] < cutoff:
+                self._completed.popleft()
+            in_flight = self._in_flight
+            recent = len(self._completed)
+            counters = {
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "failed": self.failed,
+            }
+
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": in_flight,
+            "queue_depth": max(0, in_flight - self.workers),
+            **counters,
+            "per_second": round(recent / THROUGHPUT_WINDOW_SECONDS, 3),
+            "hash_ms": self.hash_ms.snapshot(),
+            "queue_ms": self.queue_ms.snapshot(),
+        }
+
+
+password_hasher = PasswordHasher()
+
+
+def get_password_hasher():
+    return password_hasher
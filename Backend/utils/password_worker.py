@@ -0,0 +1,28 @@
+# Code that runs inside the password hashing processes. Workers start from
+# a fresh interpreter rather than a fork of the (threaded) web process, so
+# this module only imports what hashing needs: nothing here may pull in the
+# database pool or either app.
+import signal
+import time
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+def init_worker():
+    # Ctrl+C reaches the whole process group; let the parent shut the pool
+    # down instead of every worker dying mid-hash with a traceback.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def hash_password(password):
+    return _timed(generate_password_hash, password)
+
+
+def check_password(pwhash, password):
+    return _timed(check_password_hash, pwhash, password)
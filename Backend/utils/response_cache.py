@@ -0,0 +1,101 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+
+
+class ResponseCache:
+    def __init__(self, ttl=RESPONSE_CACHE_TTL, max_entries=RESPONSE_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def _begin(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, _, expires_at = entry
+                if expires_at >= time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return value, None
+                self._remove(key)
+                self._counters["expirations"] += 1
+            self._counters["misses"] += 1
+            return None, self._generation
+
+    def _finish(self, key, tags, value, generation):
+        response, status = value
+        if status != 200:
+            return value
+
+        with self._lock:
+            # Skip the store if a write invalidated anything while we loaded.
+            if generation == self._generation:
+                self._store(key, tags, value)
+        return value
+
+    def get_or_load(self, key, tags, loader):
+        cached, generation = self._begin(key)
+        if cached is not None:
+            return cached
+        return self._finish(key, tags, loader(), generation)
+
+    async def get_or_load_async(self, key, tags, loader):
+        cached, generation = self._begin(key)
+        if cached is not None:
+            return cached
+        return self._finish(key, tags, await loader(), generation)
+
+    def invalidate(self, *tags):
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+                    self._counters["invalidations"] += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+            }
+
+    def _store(self, key, tags, value):
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, tags, time.monotonic() + self.ttl)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._counters["evictions"] += 1
+
+    def _remove(self, key):
+        _, tags, _ = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+response_cache = ResponseCache()
+
+
+def get_response_cache():
+    return response_cache
@@ -0,0 +1,86 @@
+import hashlib
+import os
+import threading
+import time
+
+from flask import Response, request
+
+from utils.json_codec import dumps
+
+# Invalidation only reaches the process that made the write, so other
+# workers fall back to reloading once their copy is this old.
+SNAPSHOT_CACHE_TTL = float(os.getenv("SNAPSHOT_CACHE_TTL", "30"))
+
+
+class Snapshot:
+    def __init__(self, data, version, body, expires_at):
+        self.data = data
+        self.version = version
+        self.body = body
+        self.expires_at = expires_at
+
+
+class SnapshotCache:
+    def __init__(self, ttl=SNAPSHOT_CACHE_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def _peek(self, name):
+        with self._lock:
+            snapshot = self._entries.get(name)
+            if snapshot is not None and snapshot.expires_at < time.monotonic():
+                del self._entries[name]
+                snapshot = None
+            return snapshot, self._generations.get(name, 0)
+
+    def _store(self, name, data, generation):
+        canonical = dumps(data, sort_keys=True)
+        # Hashing the content (not a per-process counter) keeps the version
+        # identical across workers serving the same data.
+        version = hashlib.sha256(canonical).hexdigest()[:16]
+        body = dumps({"version": version, "data": data})
+        snapshot = Snapshot(data, version, body, time.monotonic() + self.ttl)
+
+        with self._lock:
+            # A write that landed while we were loading makes this copy stale.
+            if self._generations.get(name, 0) == generation:
+                self._entries[name] = snapshot
+        return snapshot
+
+    def get(self, name, loader):
+        snapshot, generation = self._peek(name)
+        if snapshot is not None:
+            return snapshot
+        return self._store(name, loader(), generation)
+
+    async def get_async(self, name, loader):
+        snapshot, generation = self._peek(name)
+        if snapshot is not None:
+            return snapshot
+        return self._store(name, await loader(), generation)
+
+    def invalidate(self, *names):
+        with self._lock:
+            for name in names:
+                self._entries.pop(name, None)
+                self._generations[name] = self._generations.get(name, 0) + 1
+
+
+snapshot_cache = SnapshotCache()
+
+
+def get_snapshot_cache():
+    return snapshot_cache
+
+
+def snapshot_response(snapshot, req=request, response_class=Response):
+    etag = f'"{snapshot.version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    # Weak comparison, since compression marks the served ETag weak.
+    if req.if_none_match.contains_weak(snapshot.version):
+        return response_class(status=304, headers=headers)
+
+    return response_class(snapshot.body, status=200, mimetype="application/json", headers=headers)
@@ -0,0 +1,137 @@
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+logger = logging.getLogger(__name__)
+
+# Vite names bundled files <name>-<content hash>.<ext>, so a changed file is
+# always a new URL and the old one can be cached forever.
+HASHED_ASSET = re.compile(r"(^|/)assets/.+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml", "application/manifest+json")
+MIN_COMPRESS_BYTES = 1024
+# Larger files (big images, fonts) are left on disk and read per request.
+STATIC_MAX_INLINE_BYTES = int(os.getenv("STATIC_MAX_INLINE_BYTES", str(2 * 1024 * 1024)))
+
+# Content-Encoding -> suffix of a precompressed sibling file, best first.
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+class Asset:
+    def __init__(self, path, content_type, etag, cache_control, body, variants):
+        self.path = path
+        self.content_type = content_type
+        self.etag = etag
+        self.cache_control = cache_control
+        self.body = body
+        # encoding -> compressed bytes
+        self.variants = variants
+
+    def read(self):
+        if self.body is not None:
+            return self.body
+        with open(self.path, "rb") as f:
+            return f.read()
+
+
+def _compressible(content_type):
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def _compress(encoding, data):
+    if encoding == "br":
+        return brotli.compress(data, quality=11) if brotli is not None else None
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _load_asset(full_path, relative):
+    content_type = mimetypes.guess_type(relative)[0] or "application/octet-stream"
+    if content_type.startswith("text/") or content_type == "application/javascript":
+        content_type += "; charset=utf-8"
+
+    size = os.path.getsize(full_path)
+    digest = hashlib.sha256()
+    with open(full_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    etag = digest.hexdigest()[:32]
+
+    inline = size <= STATIC_MAX_INLINE_BYTES
+    body = None
+    if inline:
+        with open(full_path, "rb") as f:
+            body = f.read()
+
+    variants = {}
+    if inline and size >= MIN_COMPRESS_BYTES and _compressible(content_type):
+        for encoding, suffix in ENCODINGS:
+            # Prefer variants written by the frontend build; otherwise
+            # compress once here instead of on every request.
+            if os.path.isfile(full_path + suffix):
+                with open(full_path + suffix, "rb") as f:
+                    compressed = f.read()
+            else:
+                compressed = _compress(encoding, body)
+            if compressed is not None and len(compressed) < size:
+                variants[encoding] = compressed
+
+    cache_control = IMMUTABLE_CACHE_CONTROL if HASHED_ASSET.search(relative) else REVALIDATE_CACHE_CONTROL
+    return Asset(full_path, content_type, etag, cache_control, body, variants)
+
+
+class AssetManifest:
+    def __init__(self, dist_dir):
+        self.dist_dir = dist_dir
+        self.assets = {}
+        self.index = None
+
+        if not os.path.isdir(dist_dir):
+            logger.warning("Frontend build not found at %s; only the API will be served", dist_dir)
+            return
+
+        for root, _, files in os.walk(dist_dir):
+            for name in files:
+                if name.endswith(tuple(suffix for _, suffix in ENCODINGS)):
+                    continue
+                full_path = os.path.join(root, name)
+                relative = os.path.relpath(full_path, dist_dir).replace(os.sep, "/")
+                self.assets[relative] = _load_asset(full_path, relative)
+
+        self.index = self.assets.get("index.html")
+
+    def get(self, path):
+        return self.assets.get(path)
+
+    def response(self, asset, accept_encodings, if_none_match):
+        # Returns (body, status, headers) for the framework to wrap.
+        encoding = None
+        for candidate, _ in ENCODINGS:
+            if candidate in asset.variants and accept_encodings.quality(candidate) > 0:
+                encoding = candidate
+                break
+
+        # Each representation needs its own strong validator.
+        etag = f'"{asset.etag}-{encoding}"' if encoding else f'"{asset.etag}"'
+        headers = {"ETag": etag, "Cache-Control": asset.cache_control}
+        if asset.variants:
+            headers["Vary"] = "Accept-Encoding"
+
+        if if_none_match.contains(etag.strip('"')):
+            return b"", 304, headers
+
+        headers["Content-Type"] = asset.content_type
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            return asset.variants[encoding], 200, headers
+        return asset.read(), 200, headers
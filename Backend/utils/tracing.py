@@ -0,0 +1,153 @@
+import contextvars
+import functools
+import inspect
+import logging
+import os
+import random
+import re
+import time
+from contextlib import contextmanager
+
+
+logger = logging.getLogger(__name__)
+
+# Fraction of requests that collect a per-layer breakdown and return it as a
+# Server-Timing header. Untraced requests skip all span bookkeeping.
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.1"))
+# Every statement is timed against this threshold whether or not its request
+# is sampled; a negative value disables the slow-query log.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "500"))
+# Bound values include password hashes and student records, so they are
+# only logged when turned on for debugging.
+SLOW_QUERY_LOG_PARAMS = os.getenv("SLOW_QUERY_LOG_PARAMS", "false").strip().lower() in ("1", "true", "yes", "on")
+SLOW_QUERY_MAX_PARAM_CHARS = 80
+
+# Layers in the order they appear in the header.
+SPAN_ORDER = ("controller", "service", "repo", "pool", "sql", "json", "compress")
+
+_current = contextvars.ContextVar("trace", default=None)
+_whitespace = re.compile(r"\s+")
+
+
+class Trace:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.spans = {}
+        self.open = set()
+
+    def add(self, name, ms):
+        total, count = self.spans.get(name, (0.0, 0))
+        self.spans[name] = (total + ms, count + 1)
+
+    def server_timing(self):
+        entries = []
+        for name in SPAN_ORDER + tuple(n for n in self.spans if n not in SPAN_ORDER):
+            if name in self.spans:
+                total, count = self.spans[name]
+                entries.append(f'{name};dur={total:.2f};desc="{count}x"')
+        entries.append(f"total;dur={(time.perf_counter() - self.start) * 1000:.2f}")
+        return ", ".join(entries)
+
+
+def start_trace(sample_rate=TRACE_SAMPLE_RATE):
+    if sample_rate <= 0 or random.random() >= sample_rate:
+        return None
+    return _current.set(Trace())
+
+
+def finish_trace(token):
+    trace = _current.get()
+    _current.reset(token)
+    return trace
+
+
+def record(name, ms):
+    trace = _current.get()
+    if trace is not None:
+        trace.add(name, ms)
+
+
+@contextmanager
+def span(name):
+    trace = _current.get()
+    # A layer calling back into itself (a public service method using
+    # another) is timed once, from the outermost call.
+    if trace is None or name in trace.open:
+        yield
+        return
+
+    trace.open.add(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.open.discard(name)
+        trace.add(name, (time.perf_counter() - start) * 1000)
+
+
+def traced(name):
+    def decorate(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if _current.get() is None:
+                    return await fn(*args, **kwargs)
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return fn(*args, **kwargs)
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def trace_methods(name):
+    # Times every public method a class defines itself. Generators are left
+    # alone since their work happens after the call returns.
+    def decorate(cls):
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("_") or not inspect.isfunction(value):
+                continue
+            if inspect.isgeneratorfunction(value) or inspect.isasyncgenfunction(value):
+                continue
+            setattr(cls, attr, traced(name)(value))
+        return cls
+    return decorate
+
+
+class TracedJSONMixin:
+    def dumps(self, obj, **kwargs):
+        with span("json"):
+            return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        with span("json"):
+            return super().response(*args, **kwargs)
+
+
+def _describe_params(params):
+    if not params:
+        return "[]"
+    if not SLOW_QUERY_LOG_PARAMS:
+        return f"<{len(params)} params>"
+
+    values = params.values() if isinstance(params, dict) else params
+    described = []
+    for value in values:
+        text = repr(value)
+        if len(text) > SLOW_QUERY_MAX_PARAM_CHARS:
+            text = text[:SLOW_QUERY_MAX_PARAM_CHARS] + "..."
+        described.append(text)
+    return f"[{', '.join(described)}]"
+
+
+def record_query(query, params, ms):
+    record("sql", ms)
+    if 0 <= SLOW_QUERY_MS <= ms:
+        shape = _whitespace.sub(" ", query if isinstance(query, str) else repr(query)).strip()
+        logger.warning("Slow query (%.1f ms): %s params=%s", ms, shape, _describe_params(params))
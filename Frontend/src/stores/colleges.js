@@ -44,10 +44,9 @@ export const useCollegesStore = defineStore('colleges', {
 
     async fetchAllColleges() {
       try {
-        const params = { page: 1, limit: 1000, sort_by: 'college_name' }
-        const config = { params: params, headers: this.getAuthHeader() }
-        
-        const res = await axios.get('/api/colleges', config)
+        // Snapshot responses carry an ETag, so the browser revalidates and
+        // reuses its cached copy until a college actually changes.
+        const res = await axios.get('/api/colleges/snapshot', { headers: this.getAuthHeader() })
         this.allColleges = res.data.data
       } catch (error) {
         console.error('Fetch all colleges error:', error)
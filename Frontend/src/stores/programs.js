@@ -46,10 +46,9 @@ export const useProgramsStore = defineStore('programs', {
 
     async fetchAllPrograms() {
       try {
-        const params = { page: 1, limit: 1000, sort_by: 'program_name' }
-        const config = { params: params, headers: this.getAuthHeader() }
-        
-        const res = await axios.get('/api/programs/', config)
+        // Snapshot responses carry an ETag, so the browser revalidates and
+        // reuses its cached copy until a program actually changes.
+        const res = await axios.get('/api/programs/snapshot', { headers: this.getAuthHeader() })
         this.allPrograms = res.data.data
       } catch (error) {
         console.error('Fetch all programs error:', error)
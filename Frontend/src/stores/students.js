@@ -103,25 +103,17 @@ export const useStudentsStore = defineStore('students', {
         const currentStudent = this.students.find(s => s.student_id === studentId)
         const oldUrl = currentStudent?.image_url
 
-        const fileExt = file.name.split('.').pop()
-        const fileName = `students/${studentId}-${Date.now()}.${fileExt}`
+        const upload = new FormData()
+        upload.append('file', file)
+        const { data: image } = await axios.post('/api/images', upload, this.getAuthConfig())
 
-        const { error: uploadError } = await supabase.storage
-          .from('student-avatars')
-          .upload(fileName, file, { cacheControl: '3600', upsert: true, contentType: file.type })
-
-        if (uploadError) throw new Error(uploadError.message)
-
-        const { data: urlData } = supabase.storage
-          .from('student-avatars')
-          .getPublicUrl(fileName)
-
-        if (!urlData?.publicUrl) throw new Error('Failed to get image URL')
-
-        const res = await axios.patch(`/api/students/${studentId}/image`, { image_url: urlData.publicUrl }, this.getAuthConfig())
+        const res = await axios.patch(`/api/students/${studentId}/image`, { image_url: image.url }, this.getAuthConfig())
 
         const index = this.students.findIndex(s => s.student_id === studentId)
-        if (index !== -1) this.students[index].image_url = res.data.student.image_url
+        if (index !== -1) {
+          this.students[index].image_url = res.data.student.image_url
+          this.students[index].thumbnail_url = res.data.student.thumbnail_url
+        }
 
         if (oldUrl) {
           await this.deleteFileFromSupabase(oldUrl)
@@ -147,6 +139,7 @@ export const useStudentsStore = defineStore('students', {
         const index = this.students.findIndex(s => s.student_id === studentId)
         if (index !== -1) {
           this.students[index].image_url = null
+          this.students[index].thumbnail_url = null
         }
 
         if (oldUrl) {